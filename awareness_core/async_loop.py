@@ -0,0 +1,260 @@
+"""Asyncio variant of the awareness loop with non-blocking tool calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Sequence, Set
+
+from .config import CoreConfig
+from .instrumentation import Instrumentation
+from .integration.text_input_adapter import TextInputAdapter
+from .loop import AwarenessLoop, PendingStep, _StreamProgress
+from .memory.episodic_memory import EpisodicMemory
+from .memory.frame_store import FrameStore
+from .proto_self import ProtoSelf
+from .question_generator import QuestionGenerator
+from .scheduler import Scheduler
+from .self_axes.text_axis import TextAxis
+from .self_model.autobiographical_graph import AutobiographicalGraph
+from .tools.async_tool import AsyncBaseTool, as_async_tool
+from .tools.base_tool import BaseTool, ToolResult
+from .world_model.world_model import WorldModel
+
+
+class AsyncAwarenessLoop(AwarenessLoop):
+    """Awareness loop whose tool calls run concurrently with input handling.
+
+    Ordering guarantees:
+
+    * Input-side work (adapter, external text update, proto-self sampling,
+      scheduling, question generation) runs synchronously inside
+      :meth:`submit`, in call order, before the tool call starts.
+    * Tool answers are applied to the text axis and appended to episodic
+      memory on the event-loop thread, one at a time. With ``ordered=True``
+      (default) they commit in submission order, so a fast answer waits for
+      slower earlier ones; with ``ordered=False`` they commit as they finish.
+      Each event's metadata carries its submission ``seq``.
+    * A call that fails, times out or is cancelled commits nothing; its slot
+      is released so later answers are not held back.
+    * With ``config.stream`` only the call that commits next (or the only
+      one in flight when unordered) applies its chunks to the text axis as
+      they arrive; the others buffer theirs. Chunks of a failed stream are
+      rolled back.
+
+    At most ``max_in_flight`` tool calls are outstanding; :meth:`submit`
+    waits for a free slot, which gives callers backpressure.
+    """
+
+    def __init__(
+        self,
+        config: CoreConfig,
+        tool: BaseTool | AsyncBaseTool,
+        memory: EpisodicMemory,
+        proto_self: Optional[ProtoSelf] = None,
+        text_axis: Optional[TextAxis] = None,
+        max_in_flight: int = 4,
+        timeout: Optional[float] = None,
+        ordered: bool = True,
+        instrumentation: Optional[Instrumentation] = None,
+        frame_store: Optional[FrameStore] = None,
+        world_model: Optional[WorldModel] = None,
+        scheduler: Optional[Scheduler] = None,
+        question_generator: Optional[QuestionGenerator] = None,
+        text_adapter: Optional[TextInputAdapter] = None,
+        autobiography: Optional[AutobiographicalGraph] = None,
+    ) -> None:
+        super().__init__(  # type: ignore[arg-type]
+            config=config,
+            tool=tool,
+            memory=memory,
+            proto_self=proto_self,
+            text_axis=text_axis,
+            instrumentation=instrumentation,
+            frame_store=frame_store,
+            world_model=world_model,
+            scheduler=scheduler,
+            question_generator=question_generator,
+            text_adapter=text_adapter,
+            autobiography=autobiography,
+        )
+        # After attach, so calls go through the instrumented tool.
+        self.async_tool = as_async_tool(self.tool, max_workers=max_in_flight)
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.ordered = ordered
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._tasks: Set[asyncio.Task] = set()
+        self._next_seq = 0
+        self._next_commit = 0
+        self._finished: Dict[int, Optional[ToolResult]] = {}
+        self._pending: Dict[int, PendingStep] = {}
+        self._waiters: Dict[int, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def submit(self, external_text: Optional[str]) -> Optional[asyncio.Future]:
+        """Handle one input now and start its tool call in the background.
+
+        Returns ``None`` when the scheduler stays idle or the tool budget is
+        spent without a remembered answer, otherwise a future
+        resolving to the :class:`ToolResult` once it has been committed.
+        Cancelling the future cancels the call.
+        """
+        pending = self._prepare(external_text)
+        if pending is None:
+            return None
+        internal = self._answer_internally(pending)
+        if internal is None and pending.meta.get("budget_exhausted"):
+            self._record_frame(pending.meta)
+            return None
+        if internal is None:
+            await self._slots.acquire()
+        seq = self._next_seq
+        self._next_seq += 1
+        pending.meta["seq"] = seq
+        self._pending[seq] = pending
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[seq] = waiter
+        if internal is not None:
+            # Answered from memory: commits in order without taking a slot.
+            self._finish(seq, internal, None)
+            return waiter
+        task = asyncio.create_task(self._run_call(seq, pending))
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._on_task_done(seq, done))
+        self.proto_self.observe("queue_depth", len(self._tasks))
+        waiter.add_done_callback(lambda fut: task.cancel() if fut.cancelled() else None)
+        return waiter
+
+    async def step(self, external_text: Optional[str]) -> Optional[ToolResult]:  # type: ignore[override]
+        """Submit one input and wait for its committed answer."""
+        waiter = await self.submit(external_text)
+        if waiter is None:
+            return None
+        return await waiter
+
+    async def step_many(  # type: ignore[override]
+        self, inputs: Sequence[Optional[str]], batch_size: int = 256
+    ) -> List[Optional[ToolResult]]:
+        """Submit every input in order, then wait for all answers.
+
+        Up to ``max_in_flight`` calls overlap instead of one tool batch per
+        ``batch_size`` inputs (which is ignored here); the first failure is raised.
+        """
+        waiters = [await self.submit(text) for text in inputs]
+        results = await asyncio.gather(*(waiter for waiter in waiters if waiter is not None))
+        answers = iter(results)
+        return [None if waiter is None else next(answers) for waiter in waiters]
+
+    async def put(
+        self,
+        external_text: Optional[str],
+        source: str = "text",
+        key: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Like :meth:`enqueue`, but waits up to ``timeout`` seconds while the queues are full."""
+        features = self.text_adapter.encode(external_text)
+        if features is None:
+            return False
+        return await self._input_queue().put(features.external_text, source, features.salience, key, timeout)
+
+    async def run_pending(  # type: ignore[override]
+        self, limit: Optional[int] = None, drives: Optional[Dict[str, float]] = None
+    ) -> List[Optional[ToolResult]]:
+        """Submit queued inputs, most urgent first, and wait for their answers.
+
+        An input is only taken off the queue once a call slot is free, so
+        inputs that arrive meanwhile still compete on priority.
+        """
+        queue = self._input_queue()
+        waiters: List[Optional[asyncio.Future]] = []
+        while limit is None or len(waiters) < limit:
+            if self._slots.locked():
+                await self._slots.acquire()
+                self._slots.release()
+            item = queue.pop(drives)
+            if item is None:
+                break
+            waiters.append(await self.submit(item.text))
+        return [await waiter if waiter is not None else None for waiter in waiters]
+
+    async def drain(self) -> None:
+        """Wait until every outstanding call has committed or failed."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Cancel outstanding calls, release the tool and :meth:`close` the loop."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        self.async_tool.close()
+        self.close()
+
+    async def _run_call(self, seq: int, pending: PendingStep) -> None:
+        result: Optional[ToolResult] = None
+        error: Optional[BaseException] = None
+        started = time.perf_counter()
+        try:
+            if self.config.stream is not None:
+                call = self._stream_call(seq, pending)
+            else:
+                call = self.async_tool.acall(pending.query)
+            result = await (asyncio.wait_for(call, self.timeout) if self.timeout is not None else call)
+            self.proto_self.observe("tool_latency", time.perf_counter() - started)
+        except asyncio.CancelledError as exc:
+            error = exc
+        except Exception as exc:  # noqa: BLE001 - surfaced through the waiter
+            error = exc
+        finally:
+            self._slots.release()
+            self._finish(seq, result, error)
+
+    async def _stream_call(self, seq: int, pending: PendingStep) -> ToolResult:
+        """Collect a streamed answer, applying chunks live while this call is next to commit."""
+        progress = _StreamProgress(self, pending)
+        try:
+            stream = await self.async_tool.astream(pending.query)
+            async for chunk in stream:
+                live = seq == self._next_commit if self.ordered else len(self._tasks) == 1
+                progress.feed(chunk, live=live)
+            return await stream.result()
+        except BaseException:
+            progress.abort()
+            raise
+
+    def _on_task_done(self, seq: int, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            # Cancelled before the coroutine started, so _run_call never ran.
+            self._slots.release()
+            self._finish(seq, None, asyncio.CancelledError())
+
+    def _finish(self, seq: int, result: Optional[ToolResult], error: Optional[BaseException]) -> None:
+        waiter = self._waiters[seq]
+        if error is not None and not waiter.done():
+            if isinstance(error, asyncio.CancelledError):
+                waiter.cancel()
+            else:
+                waiter.set_exception(error)
+        self._finished[seq] = result
+        if not self.ordered:
+            self._commit_seq(seq)
+            return
+        while self._next_commit in self._finished:
+            self._commit_seq(self._next_commit)
+            self._next_commit += 1
+
+    def _commit_seq(self, seq: int) -> None:
+        result = self._finished.pop(seq)
+        pending = self._pending.pop(seq)
+        waiter = self._waiters.pop(seq)
+        # A cancelled caller never sees its answer integrated.
+        if result is None or waiter.done():
+            return
+        self._commit(pending, result)
+        waiter.set_result(result)
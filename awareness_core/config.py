@@ -16,12 +16,164 @@ class AxisConfig:
     description: str | None = None
 
 
+@dataclass
+class WriterConfig:
+    """Group-commit settings for the buffered episodic writer.
+
+    ``durability`` is one of ``"none"`` (leave batches in the process buffer
+    until it fills or the writer is flushed), ``"flush"`` (hand every batch to
+    the OS), ``"fsync-every-N"`` (also fsync after ``fsync_every`` events) or
+    ``"fsync-interval"`` (also fsync at most every ``fsync_interval`` seconds).
+    """
+
+    durability: str = "flush"
+    flush_events: int = 64
+    flush_interval: float = 0.5
+    fsync_every: int = 256
+    fsync_interval: float = 1.0
+
+
+@dataclass
+class SegmentConfig:
+    """Rotation, compression and retention for the segmented episodic log.
+
+    The active log is sealed into a compressed segment once it holds
+    ``segment_events`` events or ``segment_bytes`` bytes. ``compression`` is
+    ``"gzip"``, ``"zstd"`` (falls back to gzip when ``compression.zstd`` is
+    unavailable) or ``"none"``. Sealed segments whose newest event is older
+    than ``max_age`` seconds are dropped.
+    """
+
+    segment_events: Optional[int] = 100_000
+    segment_bytes: Optional[int] = 64 << 20
+    compression: str = "gzip"
+    max_age: Optional[float] = None
+
+
 @dataclass
 class MemoryConfig:
-    """Paths and limits for memory backends."""
+    """Paths and limits for memory backends.
+
+    ``max_events`` enables segmentation and drops the oldest sealed segments
+    while the remaining ones still hold at least that many events.
+    """
 
     episodic_path: Path = Path("data/episodic_memory.jsonl")
     max_events: Optional[int] = None
+    segments: Optional[SegmentConfig] = None
+    writer: Optional[WriterConfig] = None
+    vector_dim: Optional[int] = None
+    vector_index: str = "exact"
+    # Binary per-step frame log written by the loop; None keeps frames in memory only.
+    frame_store_path: Optional[Path] = None
+
+
+@dataclass
+class WorldModelConfig:
+    """Online world model and the loop's tool-skipping policy.
+
+    The loop answers from memory instead of calling the tool once the model
+    has seen ``min_updates`` transitions and its smoothed relative error is
+    at most ``max_uncertainty``, provided a remembered event for the same
+    question lies within ``min_similarity`` (cosine) of the predicted
+    post-answer state. After ``max_consecutive_skips`` skips one real call is
+    made so the error estimate stays honest.
+    """
+
+    forgetting: float = 0.995
+    prior: float = 10.0
+    error_alpha: float = 0.1
+    min_updates: int = 32
+    max_uncertainty: float = 0.05
+    min_similarity: float = 0.95
+    max_consecutive_skips: int = 8
+
+
+@dataclass
+class AutobiographyConfig:
+    """Online phase clustering for :class:`AutobiographicalGraph`.
+
+    An episode joins the current phase while its state vector stays within
+    ``threshold`` (cosine) of the phase centroid; otherwise the closest
+    earlier phase above the threshold is re-entered or, below
+    ``max_phases``, a new phase starts (at the cap it joins the closest).
+    Only the newest ``max_timeline`` phase changes are kept in the timeline;
+    transition counts live on the edges.
+    """
+
+    threshold: float = 0.8
+    max_phases: int = 1024
+    max_timeline: int = 4096
+
+
+@dataclass
+class LimiterConfig:
+    """Adaptive concurrency and rate/cost budgets for one :class:`LimitedTool`.
+
+    The in-flight limit follows AIMD: it grows by one per ``limit``
+    successful calls while latency stays within ``latency_tolerance`` times
+    the lowest smoothed latency seen, and is multiplied by ``backoff`` after
+    an error or a slow call (at most once per smoothed latency). ``rate``
+    calls per second (bursts of ``burst``) and ``cost_budget`` cost units per
+    ``cost_window`` seconds are token buckets. A call costs ``cost_per_call``
+    plus ``cost_per_token`` per token, read from ``metadata["usage"]`` or
+    estimated at four characters per token; failed calls are not charged.
+    """
+
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 64
+    backoff: float = 0.7
+    latency_tolerance: float = 2.0
+    rate: Optional[float] = None
+    burst: Optional[float] = None
+    cost_budget: Optional[float] = None
+    cost_window: float = 60.0
+    cost_per_call: float = 1.0
+    cost_per_token: float = 0.0
+    # Longest wait for a slot or rate token before the call is refused.
+    acquire_timeout: Optional[float] = 30.0
+
+
+@dataclass
+class QueueConfig:
+    """Bounded input queues for :class:`PriorityScheduler`.
+
+    Queued inputs are served by ``salience + age_weight * seconds_waited``
+    plus ``drive_weight * drives[source_drives[source]]``, so a drive such as
+    ``curiosity`` can lift a whole source. Each source holds at most
+    ``source_capacity`` inputs and all sources together ``capacity``. The
+    scheduler is under load when the queues are ``load_watermark`` full or
+    the proto-self load reaches it: then a new input supersedes a queued one
+    with the same key whose salience is below ``shed_salience``. Once the
+    proto-self load reaches ``admit_load`` such low-salience inputs are not
+    admitted at all. Inputs older than ``max_age`` seconds are dropped
+    instead of served.
+    """
+
+    capacity: int = 256
+    source_capacity: int = 64
+    age_weight: float = 0.01
+    drive_weight: float = 0.5
+    source_drives: Dict[str, str] = field(default_factory=dict)
+    shed_salience: float = 0.3
+    load_watermark: float = 0.75
+    admit_load: float = 0.9
+    max_age: Optional[float] = 60.0
+
+
+@dataclass
+class StreamConfig:
+    """Streaming tool answers into the text axis as they arrive.
+
+    A partial frame is recorded for the first chunk and afterwards whenever
+    ``frame_interval`` seconds or ``frame_chars`` characters have passed
+    since the previous one (either may be None). The episodic event is only
+    written once the stream completes.
+    """
+
+    frame_interval: Optional[float] = 0.25
+    frame_chars: Optional[int] = None
 
 
 @dataclass
@@ -35,6 +187,17 @@ class CoreConfig:
     )
     internal_think_threshold: float = 0.5
     external_salience_threshold: float = 0.2
+    max_history: int = 50
+    # Seconds between /proc samples for the proto-self; None disables sampling.
+    proto_sample_interval: Optional[float] = None
+    # Enables the online world model and tool-call skipping in the loop.
+    world_model: Optional[WorldModelConfig] = None
+    # Queues inputs through a PriorityScheduler (see AwarenessLoop.enqueue).
+    input_queue: Optional[QueueConfig] = None
+    # Assigns every committed episode to an autobiographical phase.
+    autobiography: Optional[AutobiographyConfig] = None
+    # Consume tool answers through BaseTool.stream and emit partial frames.
+    stream: Optional[StreamConfig] = None
     memory: MemoryConfig = field(default_factory=MemoryConfig)
 
     def axis(self, name: str) -> AxisConfig:
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from collections import deque
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Deque, Dict, Iterable, List, Mapping, Sequence
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
 
-from .self_axes.base_axis import BaseAxis
+from .frame_history import FrameHistory, FrameWindow
+from .self_axes.base_axis import AxisSummary, BaseAxis
 
 
 @dataclass
@@ -31,13 +32,30 @@ class AwarenessFrame:
         }
 
 
+@dataclass
+class _AxisCache:
+    """Per-axis vector/summary cache valid for one axis version."""
+
+    version: int
+    vector: List[float]
+    summary: AxisSummary
+    summary_dict: Dict[str, Any]
+    recorded_version: int = -1
+    changed_step: int = 0
+
+
 class AwarenessState:
-    """Container managing multiple axes of the awareness vector s(t)."""
+    """Container managing multiple axes of the awareness vector s(t).
+
+    Axis vectors and summaries are cached until the axis ``version`` changes,
+    so repeated exports within a step only encode each axis once.
+    """
 
     def __init__(self, axes: Iterable[BaseAxis] | None = None, max_history: int = 50) -> None:
         self.axes: Dict[str, BaseAxis] = {}
         self.step: int = 0
-        self.history: Deque[AwarenessFrame] = deque(maxlen=max_history)
+        self.history = FrameHistory(max_history=max_history)
+        self._cache: Dict[str, _AxisCache] = {}
         if axes:
             for axis in axes:
                 self.register_axis(axis)
@@ -47,6 +65,7 @@ class AwarenessState:
         if axis.name in self.axes:
             raise ValueError(f"Axis {axis.name!r} already registered")
         self.axes[axis.name] = axis
+        self.history.add_axis(axis.name, axis.dim)
 
     def reset(self) -> None:
         """Reset all axes to their initial state."""
@@ -59,52 +78,129 @@ class AwarenessState:
             raise KeyError(f"Axis {name!r} not registered")
         self.axes[name].update_from_input(features)
 
+    def record(self, meta: Dict[str, Any] | None = None) -> int:
+        """Advance the step and append the current state to history.
+
+        Unlike :meth:`to_frame` no :class:`AwarenessFrame` is built; the
+        history keeps columnar copies and materializes frames on demand.
+        """
+        self.step += 1
+        self._mark_recorded()
+        self.history.append(
+            step=self.step,
+            timestamp=time.time(),
+            vectors=self._vectors(),
+            summaries=self._summaries(),
+            meta=meta,
+        )
+        return self.step
+
     def to_frame(self, meta: Dict[str, Any] | None = None, store: bool = True) -> AwarenessFrame:
         """Export the current state to an AwarenessFrame and optionally store it."""
+        if store:
+            self.record(meta)
+            return self.history[-1]
         self.step += 1
-        vectors = {name: axis.to_vector() for name, axis in self.axes.items()}
-        summaries = {
-            name: {
-                "name": axis_summary.name,
-                "dim": axis_summary.dim,
-                "extras": axis_summary.extras,
-            }
-            for name, axis_summary in self.summary().items()
-        }
-        frame = AwarenessFrame(
+        self._mark_recorded()
+        return AwarenessFrame(
+            timestamp=datetime.utcnow(),
+            step=self.step,
+            vectors={name: list(vector) for name, vector in self._vectors().items()},
+            summaries=self._summaries(),
+            meta=meta or {},
+        )
+
+    def delta_frame(self, since_step: int, meta: Dict[str, Any] | None = None) -> AwarenessFrame:
+        """Return a frame holding only axes that changed after ``since_step``.
+
+        Axes updated since the last recorded step count as changed as well.
+        The step counter and history are left untouched.
+        """
+        changed = [name for name in self.axes if self._changed_after(name, since_step)]
+        vectors = {name: list(self._axis_cache(name).vector) for name in changed}
+        summaries = {name: self._axis_cache(name).summary_dict for name in changed}
+        frame_meta = {"delta_since": since_step}
+        frame_meta.update(meta or {})
+        return AwarenessFrame(
             timestamp=datetime.utcnow(),
             step=self.step,
             vectors=vectors,
             summaries=summaries,
-            meta=meta or {},
+            meta=frame_meta,
         )
-        if store:
-            self.history.append(frame)
-        return frame
+
+    def axis_vector(self, name: str) -> List[float]:
+        """Return the cached vector of one axis (do not mutate)."""
+        return self._axis_cache(name).vector
+
+    def _axis_cache(self, name: str) -> _AxisCache:
+        axis = self.axes[name]
+        cache = self._cache.get(name)
+        if cache is None or cache.version != axis.version:
+            summary = axis.summary()
+            fresh = _AxisCache(
+                version=axis.version,
+                vector=axis.to_vector(),
+                summary=summary,
+                summary_dict={"name": summary.name, "dim": summary.dim, "extras": summary.extras},
+            )
+            if cache is not None:
+                fresh.recorded_version = cache.recorded_version
+                fresh.changed_step = cache.changed_step
+            self._cache[name] = cache = fresh
+        return cache
+
+    def _changed_after(self, name: str, since_step: int) -> bool:
+        cache = self._axis_cache(name)
+        return cache.changed_step > since_step or cache.version != cache.recorded_version
+
+    def _mark_recorded(self) -> None:
+        """Stamp axes whose version changed since the previous record."""
+        for name in self.axes:
+            cache = self._axis_cache(name)
+            if cache.version != cache.recorded_version:
+                cache.recorded_version = cache.version
+                cache.changed_step = self.step
+
+    def _vectors(self) -> Dict[str, List[float]]:
+        return {name: self._axis_cache(name).vector for name in self.axes}
+
+    def _summaries(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self._axis_cache(name).summary_dict for name in self.axes}
+
+    def vector(self) -> List[float]:
+        """Concatenate all axis vectors in registration order."""
+        flat: List[float] = []
+        for name in self.axes:
+            flat.extend(self._axis_cache(name).vector)
+        return flat
+
+    def axis_slices(self) -> Dict[str, slice]:
+        """Return where each axis lives inside :meth:`vector`."""
+        slices: Dict[str, slice] = {}
+        offset = 0
+        for name, axis in self.axes.items():
+            slices[name] = slice(offset, offset + axis.dim)
+            offset += axis.dim
+        return slices
 
     def summary(self) -> Dict[str, Any]:
         """Return a lightweight summary for logging."""
-        return {name: axis.summary() for name, axis in self.axes.items()}
+        return {name: self._axis_cache(name).summary for name in self.axes}
 
-    def recent_frames(self, limit: int = 5) -> List[AwarenessFrame]:
-        """Return the most recent frames (oldest-first within the slice)."""
-        if limit <= 0:
-            return []
-        return list(self.history)[-limit:]
+    def recent_frames(self, limit: int = 5) -> FrameWindow:
+        """Return the most recent frames (oldest-first within the slice).
+
+        The result is a lazy sequence of :class:`AwarenessFrame`; its
+        ``vectors(name)`` arrays are zero-copy views into the history.
+        """
+        return self.history.window(max(0, limit))
 
     def as_dict(self) -> Dict[str, Any]:
         """Serialize the current state without mutating history."""
-        vectors = {name: axis.to_vector() for name, axis in self.axes.items()}
-        summaries = {
-            name: {
-                "name": axis_summary.name,
-                "dim": axis_summary.dim,
-                "extras": axis_summary.extras,
-            }
-            for name, axis_summary in self.summary().items()
-        }
+        vectors = {name: list(vector) for name, vector in self._vectors().items()}
         return {
             "step": self.step,
             "vectors": vectors,
-            "summaries": summaries,
+            "summaries": self._summaries(),
         }
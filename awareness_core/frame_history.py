@@ -0,0 +1,232 @@
+"""Columnar ring-buffer history of awareness frames."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence as SequenceABC
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, overload
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .core_state import AwarenessFrame
+
+
+class FrameHistory:
+    """Preallocated float32 history with one ``[max_history, dim]`` block per axis.
+
+    Every row is written twice, at ``i`` and ``i + max_history`` of a buffer
+    twice the capacity, so the latest ``limit`` rows are always one contiguous
+    slice and windows are returned as zero-copy NumPy views. ``step`` and
+    ``timestamp`` columns live alongside the vectors; summaries and meta are
+    kept by reference. :class:`AwarenessFrame` objects are only built when a
+    caller indexes or iterates the history.
+    """
+
+    def __init__(self, max_history: int = 50) -> None:
+        if max_history <= 0:
+            raise ValueError("max_history must be positive")
+        self.max_history = max_history
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._steps = np.zeros(2 * max_history, dtype=np.int64)
+        self._timestamps = np.zeros(2 * max_history, dtype=np.float64)
+        self._summaries: List[Optional[Dict[str, Dict[str, Any]]]] = [None] * max_history
+        self._meta: List[Optional[Dict[str, Any]]] = [None] * max_history
+        self._head = 0
+        self._size = 0
+        # Deferred (summaries, meta) loader installed by ``adopt``.
+        self._side_loader: Optional[Callable[[], Tuple[List[Any], List[Any]]]] = None
+
+    @property
+    def maxlen(self) -> int:
+        return self.max_history
+
+    def add_axis(self, name: str, dim: int) -> None:
+        """Allocate storage for a newly registered axis."""
+        if name in self._vectors:
+            raise ValueError(f"Axis {name!r} already tracked")
+        self._vectors[name] = np.zeros((2 * self.max_history, dim), dtype=np.float32)
+
+    def axes(self) -> List[str]:
+        return list(self._vectors)
+
+    def export(self) -> Dict[str, Any]:
+        """Return the raw ring columns and position, e.g. for snapshots."""
+        self._load_side()
+        return {
+            "head": self._head,
+            "size": self._size,
+            "steps": self._steps,
+            "timestamps": self._timestamps,
+            "vectors": dict(self._vectors),
+            "summaries": self._summaries,
+            "meta": self._meta,
+        }
+
+    def adopt(
+        self,
+        head: int,
+        size: int,
+        steps: np.ndarray,
+        timestamps: np.ndarray,
+        vectors: Mapping[str, np.ndarray],
+        side_loader: Callable[[], Tuple[List[Any], List[Any]]],
+    ) -> None:
+        """Take over ring columns exported by a history of the same capacity.
+
+        The arrays are used as-is (they may be copy-on-write memory maps), and
+        summaries/meta are only produced by ``side_loader`` when first needed.
+        """
+        rows = 2 * self.max_history
+        if steps.shape[0] != rows or any(block.shape[0] != rows for block in vectors.values()):
+            raise ValueError("history capacity does not match")
+        for name, block in vectors.items():
+            if name in self._vectors and block.shape != self._vectors[name].shape:
+                raise ValueError(f"axis {name!r} dim does not match")
+        self._steps = steps
+        self._timestamps = timestamps
+        self._vectors.update(vectors)
+        self._head = head
+        self._size = size
+        self._side_loader = side_loader
+
+    def _load_side(self) -> None:
+        if self._side_loader is not None:
+            loader, self._side_loader = self._side_loader, None
+            self._summaries, self._meta = loader()
+
+    def append(
+        self,
+        step: int,
+        timestamp: float,
+        vectors: Mapping[str, Sequence[float]],
+        summaries: Dict[str, Dict[str, Any]],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Write one frame's columns into the ring."""
+        self._load_side()
+        slot = self._head
+        mirror = slot + self.max_history
+        for name, block in self._vectors.items():
+            row = vectors.get(name)
+            if row is None:
+                block[slot] = 0.0
+            else:
+                block[slot] = row
+            block[mirror] = block[slot]
+        self._steps[slot] = self._steps[mirror] = step
+        self._timestamps[slot] = self._timestamps[mirror] = timestamp
+        self._summaries[slot] = summaries
+        self._meta[slot] = meta or {}
+        self._head = (slot + 1) % self.max_history
+        self._size = min(self._size + 1, self.max_history)
+
+    def clear(self) -> None:
+        self._side_loader = None
+        self._head = 0
+        self._size = 0
+        self._summaries = [None] * self.max_history
+        self._meta = [None] * self.max_history
+
+    def __len__(self) -> int:
+        return self._size
+
+    def window(self, limit: Optional[int] = None) -> "FrameWindow":
+        """Return the newest ``limit`` frames (oldest first) as a lazy view."""
+        count = self._size if limit is None else max(0, min(limit, self._size))
+        # Rows [head + max - count, head + max) of the mirrored buffer.
+        stop = self._head + self.max_history
+        return FrameWindow(self, stop - count, stop)
+
+    def latest(self) -> Tuple[int, float, Dict[str, np.ndarray], Dict[str, Dict[str, Any]], Dict[str, Any]]:
+        """``(step, timestamp, vectors, summaries, meta)`` of the newest frame, without building it.
+
+        The vectors are views into the ring; copy them to keep them past the next append.
+        """
+        if not self._size:
+            raise IndexError("history is empty")
+        self._load_side()
+        row = self._head + self.max_history - 1
+        slot = row % self.max_history
+        vectors = {name: block[row] for name, block in self._vectors.items()}
+        summaries = self._summaries[slot] or {}
+        return int(self._steps[row]), float(self._timestamps[row]), vectors, summaries, self._meta[slot] or {}
+
+    def __iter__(self) -> Iterator["AwarenessFrame"]:
+        return iter(self.window())
+
+    @overload
+    def __getitem__(self, position: int) -> "AwarenessFrame": ...
+
+    @overload
+    def __getitem__(self, position: slice) -> "FrameWindow": ...
+
+    def __getitem__(self, position: int | slice) -> "AwarenessFrame | FrameWindow":
+        return self.window()[position]
+
+    def _frame(self, row: int) -> "AwarenessFrame":
+        from .core_state import AwarenessFrame
+
+        self._load_side()
+        slot = row % self.max_history
+        return AwarenessFrame(
+            timestamp=datetime.fromtimestamp(float(self._timestamps[row]), timezone.utc).replace(tzinfo=None),
+            step=int(self._steps[row]),
+            vectors={name: block[row].tolist() for name, block in self._vectors.items()},
+            summaries=self._summaries[slot] or {},
+            meta=self._meta[slot] or {},
+        )
+
+
+class FrameWindow(SequenceABC):
+    """Contiguous slice of a :class:`FrameHistory`, oldest frame first.
+
+    ``vectors(name)``, ``steps`` and ``timestamps`` are views into the ring
+    buffer. They stay valid for ``max_history - len(window)`` further
+    appends, so a window over a full history is overwritten by the very next
+    one; copy them to keep them longer.
+    """
+
+    def __init__(self, history: FrameHistory, start: int, stop: int) -> None:
+        self._history = history
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def vectors(self, name: str) -> np.ndarray:
+        return self._history._vectors[name][self._start : self._stop]
+
+    @property
+    def steps(self) -> np.ndarray:
+        return self._history._steps[self._start : self._stop]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._history._timestamps[self._start : self._stop]
+
+    def matrix(self) -> np.ndarray:
+        """Concatenate all axis blocks into a ``[len, sum(dim)]`` array (copies)."""
+        blocks = [self.vectors(name) for name in self._history.axes()]
+        if not blocks:
+            return np.zeros((len(self), 0), dtype=np.float32)
+        return np.concatenate(blocks, axis=1)
+
+    @overload
+    def __getitem__(self, position: int) -> "AwarenessFrame": ...
+
+    @overload
+    def __getitem__(self, position: slice) -> "FrameWindow": ...
+
+    def __getitem__(self, position: int | slice) -> "AwarenessFrame | FrameWindow":
+        if isinstance(position, slice):
+            start, stop, stride = position.indices(len(self))
+            if stride != 1:
+                raise ValueError("FrameWindow only supports contiguous slices")
+            return FrameWindow(self._history, self._start + start, self._start + max(start, stop))
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("frame index out of range")
+        return self._history._frame(self._start + position)
@@ -0,0 +1,382 @@
+"""Per-stage latency instrumentation and metrics export for the loop."""
+
+from __future__ import annotations
+
+import inspect
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Protocol, Tuple
+
+from .tools.async_tool import AsyncToolStream
+from .tools.base_tool import ToolStream
+from .tools.limited_tool import ToolLimiter, find_limiters
+
+_SUB_BITS = 5
+_SUB = 1 << _SUB_BITS
+_MAX_INDEX = 48 * _SUB
+# Prometheus bucket bounds in seconds (1-2-5 series from 1 us to 50 s).
+_PROM_BOUNDS = [m * 10.0**e for e in range(-6, 2) for m in (1, 2, 5)]
+# (metric suffix, type, help) exported for every ToolLimiter.
+_LIMITER_METRICS = [
+    ("limit", "gauge", "Adaptive in-flight limit."),
+    ("in_flight", "gauge", "Calls currently running."),
+    ("rate_tokens", "gauge", "Rate tokens available."),
+    ("budget_remaining", "gauge", "Cost budget left in the current window."),
+    ("cost_total", "counter", "Cost charged so far."),
+    ("throttled_total", "counter", "Calls refused after waiting for capacity."),
+    ("rejected_total", "counter", "Calls refused because the cost budget was spent."),
+    ("decreases_total", "counter", "Multiplicative decreases of the limit."),
+]
+
+# Tool methods timed as the ``tool_call`` stage; streams are timed until drained.
+_TOOL_METHODS = ("call", "acall", "stream", "astream")
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of nanosecond durations.
+
+    Values are bucketed by their top ``1 + 5`` significant bits, giving about
+    3% relative precision over the full range with O(1) recording and a
+    fixed-size count array.
+    """
+
+    def __init__(self) -> None:
+        self.counts = [0] * (_MAX_INDEX + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < 2 * _SUB:
+            return value
+        shift = value.bit_length() - _SUB_BITS - 1
+        return min(_MAX_INDEX, (shift + 1) * _SUB + (value >> shift) - _SUB)
+
+    @staticmethod
+    def _upper(index: int) -> int:
+        """Largest value that maps to ``index``."""
+        if index < 2 * _SUB:
+            return index
+        shift = index // _SUB - 1
+        return ((index % _SUB + _SUB + 1) << shift) - 1
+
+    def record(self, value_ns: int) -> None:
+        if value_ns < 0:
+            value_ns = 0
+        self.counts[self._index(value_ns)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        if self.min_ns is None or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def quantile(self, q: float) -> float:
+        """Return the ``q`` quantile in seconds (upper bucket bound)."""
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                return min(self._upper(index), self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def cumulative(self, bounds_s: List[float]) -> List[Tuple[float, int]]:
+        """Cumulative counts at each bound (seconds), for Prometheus export."""
+        result: List[Tuple[float, int]] = []
+        index = 0
+        seen = 0
+        for bound in bounds_s:
+            limit = int(bound * 1e9)
+            while index <= _MAX_INDEX and self._upper(index) <= limit:
+                seen += self.counts[index]
+                index += 1
+            result.append((bound, seen))
+        return result
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_s": self.total_ns / 1e9,
+            "min_s": (self.min_ns or 0) / 1e9,
+            "max_s": self.max_ns / 1e9,
+            "p50_s": self.quantile(0.5),
+            "p90_s": self.quantile(0.9),
+            "p99_s": self.quantile(0.99),
+        }
+
+
+class StageHook(Protocol):
+    """Tracer interface notified around every instrumented stage."""
+
+    def on_stage_start(self, stage: str) -> None: ...
+
+    def on_stage_end(self, stage: str, duration_s: float, error: Optional[BaseException]) -> None: ...
+
+
+class Instrumentation:
+    """Collects per-stage timings, scheduler-mode counts and tool counters.
+
+    Stages: ``text_adapter``, ``proto_self``, ``scheduler``, ``question``,
+    ``tool_call`` (``call``/``acall``, or a ``stream``/``astream`` until
+    drained), ``axis_update`` and ``memory_append``. The state of any
+    tool limiter found behind the loop's tool is exported as gauges.
+
+    :meth:`attach` swaps the loop's components for thin timing proxies, so a
+    loop built without instrumentation runs exactly the uninstrumented code.
+    """
+
+    def __init__(self, hooks: Optional[List[StageHook]] = None) -> None:
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.modes: Dict[str, int] = {}
+        self.tool_calls: Dict[str, int] = {}
+        self.tool_errors: Dict[str, int] = {}
+        self.hooks: List[StageHook] = list(hooks or [])
+        self.limiters: Dict[str, ToolLimiter] = {}
+
+    def add_hook(self, hook: StageHook) -> None:
+        self.hooks.append(hook)
+
+    def attach(self, loop: Any) -> None:
+        """Wrap the components a loop calls during ``step``."""
+        loop.text_adapter = _Proxy(loop.text_adapter, self, {"encode": "text_adapter"})
+        loop.proto_self = _Proxy(loop.proto_self, self, {"encode": "proto_self"})
+        loop.scheduler = _Proxy(loop.scheduler, self, {"decide": "scheduler"}, on_result=self._count_mode)
+        loop.question_generator = _Proxy(loop.question_generator, self, {"generate": "question"})
+        loop.state = _Proxy(loop.state, self, {"update_axis": "axis_update"})
+        loop.memory = _Proxy(loop.memory, self, {"append": "memory_append"})
+        loop.tool = _Proxy(loop.tool, self, dict.fromkeys(_TOOL_METHODS, "tool_call"), tool_name=loop.tool.name)
+        for limiter in find_limiters(loop.tool):
+            self.limiters[limiter.name] = limiter
+
+    def timed(self, stage: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func`` while timing it as ``stage``."""
+        start = self._start(stage)
+        error: Optional[BaseException] = None
+        try:
+            return func(*args, **kwargs)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self._end(stage, start, error)
+
+    async def timed_async(self, stage: str, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Await ``func`` while timing it as ``stage``."""
+        start = self._start(stage)
+        error: Optional[BaseException] = None
+        try:
+            return await func(*args, **kwargs)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self._end(stage, start, error)
+
+    def _start(self, stage: str) -> int:
+        for hook in self.hooks:
+            hook.on_stage_start(stage)
+        return time.perf_counter_ns()
+
+    def _end(self, stage: str, start: int, error: Optional[BaseException]) -> None:
+        elapsed = time.perf_counter_ns() - start
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = LatencyHistogram()
+        histogram.record(elapsed)
+        for hook in self.hooks:
+            hook.on_stage_end(stage, elapsed / 1e9, error)
+
+    def count_tool(self, name: str, error: bool) -> None:
+        self.tool_calls[name] = self.tool_calls.get(name, 0) + 1
+        if error:
+            self.tool_errors[name] = self.tool_errors.get(name, 0) + 1
+
+    def _count_mode(self, mode: str) -> None:
+        self.modes[mode] = self.modes.get(mode, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable view of every metric."""
+        return {
+            "stages": {name: hist.as_dict() for name, hist in self.stages.items()},
+            "modes": dict(self.modes),
+            "tool_calls": dict(self.tool_calls),
+            "tool_errors": dict(self.tool_errors),
+            "limiters": {name: limiter.metrics() for name, limiter in self.limiters.items()},
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+    def prometheus(self, prefix: str = "awareness") -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Latency of AwarenessLoop.step stages.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, hist in sorted(self.stages.items()):
+            for bound, count in hist.cumulative(_PROM_BOUNDS):
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound:g}"}} {count}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {hist.count}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {hist.total_ns / 1e9:.9f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {hist.count}')
+        lines += [f"# HELP {prefix}_steps_total Steps by scheduler mode.", f"# TYPE {prefix}_steps_total counter"]
+        for mode, count in sorted(self.modes.items()):
+            lines.append(f'{prefix}_steps_total{{mode="{mode}"}} {count}')
+        lines += [f"# HELP {prefix}_tool_calls_total Tool calls by tool.", f"# TYPE {prefix}_tool_calls_total counter"]
+        for name, count in sorted(self.tool_calls.items()):
+            lines.append(f'{prefix}_tool_calls_total{{tool="{name}"}} {count}')
+        lines += [f"# HELP {prefix}_tool_errors_total Failed tool calls by tool.", f"# TYPE {prefix}_tool_errors_total counter"]
+        for name, count in sorted(self.tool_errors.items()):
+            lines.append(f'{prefix}_tool_errors_total{{tool="{name}"}} {count}')
+        limiters = {name: limiter.metrics() for name, limiter in sorted(self.limiters.items())}
+        for key, kind, help_text in _LIMITER_METRICS:
+            lines += [f"# HELP {prefix}_tool_{key} {help_text}", f"# TYPE {prefix}_tool_{key} {kind}"]
+            for name, metrics in limiters.items():
+                value = metrics[key.removesuffix("_total")]
+                if value is not None:
+                    lines.append(f'{prefix}_tool_{key}{{tool="{name}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+
+class _Proxy:
+    """Forwards attribute access to ``target``, timing selected methods.
+
+    ``__class__`` reports the target's class so ``isinstance`` checks keep
+    working, and the container/context-manager protocols are forwarded.
+    Attribute writes go to the target.
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        instrumentation: Instrumentation,
+        stages: Dict[str, str],
+        on_result: Optional[Callable[[Any], None]] = None,
+        tool_name: Optional[str] = None,
+    ) -> None:
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_instrumentation", instrumentation)
+        object.__setattr__(self, "_stages", stages)
+        object.__setattr__(self, "_on_result", on_result)
+        object.__setattr__(self, "_tool_name", tool_name)
+
+    @property  # type: ignore[misc]
+    def __class__(self) -> type:
+        return type(self._target)
+
+    @property
+    def __wrapped__(self) -> Any:
+        return self._target
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._target, name, value)
+
+    def __len__(self) -> int:
+        return len(self._target)
+
+    def __iter__(self) -> Any:
+        return iter(self._target)
+
+    def __enter__(self) -> Any:
+        return self._target.__enter__()
+
+    def __exit__(self, *exc_info: Any) -> Any:
+        return self._target.__exit__(*exc_info)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        stage = self._stages.get(name)
+        if stage is None:
+            return attr
+
+        if name == "stream":
+            return self._timed_stream(stage, attr)
+        if name == "astream":
+            return self._timed_astream(stage, attr)
+        if inspect.iscoroutinefunction(attr):
+
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    result = await self._instrumentation.timed_async(stage, attr, *args, **kwargs)
+                except Exception:
+                    self._count(error=True)
+                    raise
+                self._count(error=False)
+                return result
+
+            return async_wrapper
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                result = self._instrumentation.timed(stage, attr, *args, **kwargs)
+            except Exception:
+                self._count(error=True)
+                raise
+            self._count(error=False)
+            if self._on_result is not None:
+                self._on_result(result)
+            return result
+
+        return wrapper
+
+    def _count(self, error: bool) -> None:
+        if self._tool_name is not None:
+            self._instrumentation.count_tool(self._tool_name, error=error)
+
+    def _timed_stream(self, stage: str, method: Callable[..., ToolStream]) -> Callable[..., ToolStream]:
+        instrumentation = self._instrumentation
+
+        def wrapper(*args: Any, **kwargs: Any) -> ToolStream:
+            start = instrumentation._start(stage)
+            try:
+                stream = method(*args, **kwargs)
+            except Exception as exc:
+                instrumentation._end(stage, start, exc)
+                self._count(error=True)
+                raise
+
+            def chunks() -> Iterator[str]:
+                try:
+                    yield from stream
+                except BaseException as exc:
+                    instrumentation._end(stage, start, exc)
+                    self._count(error=True)
+                    raise
+                instrumentation._end(stage, start, None)
+                self._count(error=False)
+
+            return ToolStream(chunks(), metadata=stream.metadata, raw=stream.raw)
+
+        return wrapper
+
+    def _timed_astream(self, stage: str, method: Callable[..., Awaitable[AsyncToolStream]]) -> Callable[..., Any]:
+        instrumentation = self._instrumentation
+
+        async def wrapper(*args: Any, **kwargs: Any) -> AsyncToolStream:
+            start = instrumentation._start(stage)
+            try:
+                stream = await method(*args, **kwargs)
+            except Exception as exc:
+                instrumentation._end(stage, start, exc)
+                self._count(error=True)
+                raise
+
+            async def chunks() -> AsyncIterator[str]:
+                try:
+                    async for chunk in stream:
+                        yield chunk
+                except BaseException as exc:
+                    instrumentation._end(stage, start, exc)
+                    self._count(error=True)
+                    raise
+                instrumentation._end(stage, start, None)
+                self._count(error=False)
+
+            return AsyncToolStream(chunks(), metadata=stream.metadata, raw=stream.raw)
+
+        return wrapper
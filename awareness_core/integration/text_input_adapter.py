@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
 
 
 @dataclass
@@ -26,3 +28,13 @@ class TextInputAdapter:
             return None
         salience = min(1.0, len(stripped) / 80.0)
         return TextFeatures(external_text=stripped, salience=salience, metadata={"length": str(len(stripped))})
+
+    def encode_batch(self, texts: Sequence[Optional[str]]) -> List[Optional[TextFeatures]]:
+        """:meth:`encode` for many texts, computing salience in one vectorized pass."""
+        stripped = [text.strip() if text is not None else "" for text in texts]
+        lengths = np.fromiter((len(text) for text in stripped), dtype=np.float64, count=len(stripped))
+        salience = np.minimum(1.0, lengths / 80.0)
+        return [
+            TextFeatures(external_text=text, salience=float(value), metadata={"length": str(len(text))}) if text else None
+            for text, value in zip(stripped, salience)
+        ]
@@ -2,21 +2,110 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
 
-from .config import CoreConfig
+import numpy as np
+
+from .config import CoreConfig, StreamConfig
 from .core_state import AwarenessState
+from .instrumentation import Instrumentation
 from .integration.text_input_adapter import TextInputAdapter
 from .memory.episodic_memory import EpisodicMemory
+from .memory.frame_store import FrameStore
 from .proto_self import ProtoSelf
-from .question_generator import QuestionGenerator
-from .scheduler import Scheduler
+from .question_generator import GeneratedQuestion, QuestionGenerator
+from .scheduler import PriorityScheduler, Scheduler
 from .self_axes.text_axis import TextAxis
+from .self_model.autobiographical_graph import AutobiographicalGraph
+from .snapshot import SnapshotInfo, read_snapshot, write_snapshot
+from .system_sampler import SystemSampler
 from .tools.base_tool import BaseTool, ToolQuery, ToolResult
+from .tools.limited_tool import find_limiters
+from .world_model.world_model import WorldModel
+
+
+@dataclass
+class PendingStep:
+    """Work decided by a step that still needs a tool answer."""
+
+    question: GeneratedQuestion
+    query: ToolQuery
+    meta: Dict[str, Any]
+    # State vector before the answer; set when a world model is attached.
+    vector: Optional[List[float]] = None
+    internal: bool = False
+
+
+def _curiosity(has_input: Any) -> Any:
+    """Curiosity drive for steps with and without external input (bool or bool array)."""
+    return np.where(has_input, 0.6, 0.8)
+
+
+class _StreamProgress:
+    """Feeds streamed answer chunks into the text axis and emits partial frames."""
+
+    def __init__(self, loop: "AwarenessLoop", pending: PendingStep) -> None:
+        self.loop = loop
+        self.pending = pending
+        self.config = loop.config.stream or StreamConfig()
+        # Internal text to restore on abort, taken when the first chunk is applied.
+        self.previous: Optional[str] = None
+        self.started = False
+        self.buffer: List[str] = []
+        self.chars = 0
+        self.frame_chars = 0
+        self.last_frame = float("-inf")
+
+    def feed(self, chunk: str, live: bool = True) -> None:
+        """Apply ``chunk`` now, or buffer it until a later live chunk when ``live`` is False."""
+        if chunk:
+            self.buffer.append(chunk)
+        if not live or not self.buffer:
+            return
+        text = "".join(self.buffer)
+        self.buffer.clear()
+        features: Dict[str, Any] = {"internal_chunk": text}
+        if not self.started:
+            # A new answer replaces the previous internal text.
+            features["internal_text"] = ""
+            self.previous = self.loop.text_axis.internal_text
+            self.started = True
+        self.loop.state.update_axis("text", features)
+        self.chars += len(text)
+        now = time.perf_counter()
+        interval, every = self.config.frame_interval, self.config.frame_chars
+        if (
+            self.last_frame == float("-inf")
+            or (interval is not None and now - self.last_frame >= interval)
+            or (every is not None and self.chars - self.frame_chars >= every)
+        ):
+            self.last_frame = now
+            self.frame_chars = self.chars
+            self.loop._record_frame({**self.pending.meta, "partial": True, "streamed_chars": self.chars})
+
+    def abort(self) -> None:
+        """Undo applied chunks after a failed stream."""
+        if self.started:
+            self.loop.state.update_axis("text", {"internal_text": self.previous or ""})
 
 
 class AwarenessLoop:
-    """Minimal runnable loop that processes text input and queries a tool."""
+    """Minimal runnable loop that processes text input and queries a tool.
+
+    With a :class:`WorldModel` (``config.world_model`` or ``world_model=``)
+    the loop learns the state transition caused by each answer. Once the
+    model is confident it predicts the post-answer state and, when memory
+    holds a matching answer to the same question near that prediction, uses
+    it instead of calling the tool; :meth:`savings` reports the effect.
+
+    With ``config.stream`` answers are read through :meth:`BaseTool.stream`:
+    chunks update the text axis as they arrive and partial frames (meta
+    ``partial=True``) are recorded at the configured cadence before the
+    final frame and episodic event.
+    """
 
     def __init__(
         self,
@@ -25,22 +114,217 @@ class AwarenessLoop:
         memory: EpisodicMemory,
         proto_self: Optional[ProtoSelf] = None,
         text_axis: Optional[TextAxis] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        frame_store: Optional[FrameStore] = None,
+        world_model: Optional[WorldModel] = None,
+        scheduler: Optional[Scheduler] = None,
+        question_generator: Optional[QuestionGenerator] = None,
+        text_adapter: Optional[TextInputAdapter] = None,
+        autobiography: Optional[AutobiographicalGraph] = None,
     ) -> None:
         self.config = config
         self.tool = tool
         self.memory = memory
-        self.proto_self = proto_self or ProtoSelf()
+        # Resources created here rather than passed in are released by close().
+        self._owned_store = False
+        if frame_store is None and config.memory.frame_store_path is not None:
+            frame_store = FrameStore(config.memory.frame_store_path, config.axes)
+            self._owned_store = True
+        self.frame_store = frame_store
+        self._owned_sampler: Optional[SystemSampler] = None
+        if proto_self is None:
+            if config.proto_sample_interval is not None:
+                self._owned_sampler = SystemSampler(interval=config.proto_sample_interval).start()
+            proto_self = ProtoSelf(sampler=self._owned_sampler)
+        self.proto_self = proto_self
         self.text_axis = text_axis or TextAxis(
             name=config.axis("text").name, dim=config.axis("text").dim
         )
 
-        self.state = AwarenessState(axes=[self.text_axis])
-        self.scheduler = Scheduler(config=config)
-        self.question_generator = QuestionGenerator()
-        self.text_adapter = TextInputAdapter()
+        self.state = AwarenessState(axes=[self.text_axis], max_history=config.max_history)
+        if scheduler is None:
+            limiters = find_limiters(tool)
+            if config.input_queue is not None:
+                scheduler = PriorityScheduler(config, proto_self=self.proto_self, limiters=limiters)
+            else:
+                scheduler = Scheduler(config=config, limiters=limiters)
+        # Stateless schedulers may be shared between loops (see SessionManager).
+        self.scheduler = scheduler
+        self.question_generator = question_generator or QuestionGenerator()
+        self.text_adapter = text_adapter or TextInputAdapter()
+        if world_model is None and config.world_model is not None:
+            dim = sum(axis.dim for axis in self.state.axes.values())
+            world_model = WorldModel(dim, config.world_model)
+        self.world_model = world_model
+        if autobiography is None and config.autobiography is not None:
+            dim = sum(axis.dim for axis in self.state.axes.values())
+            autobiography = AutobiographicalGraph(dim, config.autobiography)
+        self.autobiography = autobiography
+        self.tool_calls = 0
+        self.answered_internally = 0
+        self._skips_in_row = 0
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(self)
 
     def step(self, external_text: Optional[str]) -> Optional[ToolResult]:
         """Process one step given optional external text."""
+        pending = self._prepare(external_text)
+        if pending is None:
+            return None
+        result = self._answer_internally(pending)
+        if result is None and pending.meta.get("budget_exhausted"):
+            self._record_frame(pending.meta)
+            return None
+        if result is None:
+            started = time.perf_counter()
+            result = self._stream_answer(pending) if self.config.stream is not None else self.tool.call(pending.query)
+            self.proto_self.observe("tool_latency", time.perf_counter() - started)
+        self._commit(pending, result)
+        return result
+
+    def step_many(self, inputs: Sequence[Optional[str]], batch_size: int = 256) -> List[Optional[ToolResult]]:
+        """Process ``inputs`` exactly as repeated :meth:`step` calls would, in batches.
+
+        Per batch of ``batch_size`` inputs, salience and scheduler modes are
+        computed as arrays, the text encoder is primed with all inputs and
+        answers at once, the selected questions go to one
+        :meth:`BaseTool.call_batch` and episodic events are written with one
+        :meth:`EpisodicMemory.append_many`. Results, frames, events and axis
+        state match sequential stepping. Loops with a world model, tool
+        limiters, streaming, instrumentation or a system sampler need each
+        answer before the next decision and fall back to :meth:`step` per input. A tool error
+        fails its batch before anything from that batch is committed.
+        """
+        if not self._batchable():
+            return [self.step(text) for text in inputs]
+        results: List[Optional[ToolResult]] = []
+        for start in range(0, len(inputs), batch_size):
+            results.extend(self._step_batch(inputs[start : start + batch_size]))
+        return results
+
+    def enqueue(self, external_text: Optional[str], source: str = "text", key: Optional[str] = None) -> bool:
+        """Queue an input on the :class:`PriorityScheduler`; False if empty or not admitted."""
+        features = self.text_adapter.encode(external_text)
+        if features is None:
+            return False
+        return self._input_queue().offer(features.external_text, source, features.salience, key)
+
+    def run_pending(
+        self, limit: Optional[int] = None, drives: Optional[Dict[str, float]] = None
+    ) -> List[Optional[ToolResult]]:
+        """Step through queued inputs, most urgent first, until empty or ``limit`` steps."""
+        queue = self._input_queue()
+        results: List[Optional[ToolResult]] = []
+        while limit is None or len(results) < limit:
+            item = queue.pop(drives)
+            if item is None:
+                break
+            results.append(self.step(item.text))
+        return results
+
+    def close(self) -> None:
+        """Stop the system sampler and close the frame store if this loop created them.
+
+        Memory, tools and injected components belong to the caller.
+        """
+        if self._owned_sampler is not None:
+            self._owned_sampler.stop()
+            self._owned_sampler = None
+        if self._owned_store and self.frame_store is not None:
+            self.frame_store.close()
+            self.frame_store = None
+
+    def snapshot(self, path: Path) -> None:
+        """Write axis state, frame history, tool and world-model statistics to ``path``."""
+        write_snapshot(self, path)
+
+    def restore(self, path: Path) -> SnapshotInfo:
+        """Restore state written by :meth:`snapshot`; large parts load lazily."""
+        return read_snapshot(self, path)
+
+    def savings(self) -> Dict[str, Any]:
+        """Tool calls made versus answered by the world model."""
+        total = self.tool_calls + self.answered_internally
+        return {
+            "tool_calls": self.tool_calls,
+            "answered_internally": self.answered_internally,
+            "saved_fraction": self.answered_internally / total if total else 0.0,
+            "uncertainty": self.world_model.uncertainty if self.world_model is not None else None,
+        }
+
+    def _input_queue(self) -> PriorityScheduler:
+        if not isinstance(self.scheduler, PriorityScheduler):
+            raise TypeError("input queueing needs a PriorityScheduler (set config.input_queue)")
+        return self.scheduler
+
+    def _batchable(self) -> bool:
+        return (
+            self.world_model is None
+            and self.config.stream is None
+            and self.instrumentation is None
+            and not getattr(self.scheduler, "limiters", None)
+            and hasattr(self.scheduler, "decide_batch")
+            # A sampler would see every proto-self reading before any tool latency.
+            and getattr(self.proto_self, "sampler", None) is None
+        )
+
+    def _step_batch(self, texts: Sequence[Optional[str]]) -> List[Optional[ToolResult]]:
+        features = self.text_adapter.encode_batch(texts)
+        present = np.fromiter((f is not None for f in features), dtype=bool, count=len(features))
+        salience = np.array([f.salience if f is not None else 0.0 for f in features], dtype=np.float64)
+        modes = self.scheduler.decide_batch(salience, _curiosity(present))
+        encoder = self.text_axis.encoder
+        encoder.prime([f.external_text for f in features if f is not None])
+
+        # Questions only see the external text, so they can all be asked before any answer arrives;
+        # the text axis is rewound afterwards and replayed with the answers.
+        saved = self.text_axis.get_state()
+        pendings: List[Optional[PendingStep]] = []
+        for feature, mode, value in zip(features, modes, salience):
+            if feature is not None:
+                self.state.update_axis("text", {"external_text": feature.external_text})
+            proto_state = self.proto_self.encode()
+            if mode == "idle":
+                pendings.append(None)
+                continue
+            question = self.question_generator.generate(
+                state=self.state,
+                uncertainty=max(0.0, 1.0 - float(value)),
+                hint=feature.external_text if feature is not None else None,
+            )
+            meta = {"mode": mode, "external_salience": float(value), "proto_state": proto_state.vector}
+            pendings.append(PendingStep(question=question, query=ToolQuery(content=question.text), meta=meta))
+        self.text_axis.set_state(saved)
+
+        queries = [pending.query for pending in pendings if pending is not None]
+        answers: List[ToolResult] = []
+        if queries:
+            answers = self.tool.call_batch(queries)
+            if len(answers) != len(queries):
+                raise RuntimeError(f"{self.tool.name} returned {len(answers)} results for {len(queries)} queries")
+            self.tool_calls += len(queries)
+            self._skips_in_row = 0
+            encoder.prime([answer.content for answer in answers])
+
+        results: List[Optional[ToolResult]] = []
+        records: List[Dict[str, Any]] = []
+        answer_iter = iter(answers)
+        for feature, pending, value in zip(features, pendings, salience):
+            if feature is not None:
+                self.state.update_axis("text", {"external_text": feature.external_text})
+            if pending is None:
+                self._record_frame({"mode": "idle", "external_salience": float(value)})
+                results.append(None)
+                continue
+            result = next(answer_iter)
+            self._commit(pending, result, deferred=records)
+            results.append(result)
+        self.memory.append_many(records)
+        return results
+
+    def _prepare(self, external_text: Optional[str]) -> Optional[PendingStep]:
+        """Apply input-side updates and decide whether a tool call is needed."""
         features = self.text_adapter.encode(external_text)
         external_salience = features.salience if features else 0.0
 
@@ -48,24 +332,110 @@ class AwarenessLoop:
             self.state.update_axis("text", {"external_text": features.external_text})
 
         proto_state = self.proto_self.encode()
-        drives = {"curiosity": 0.6 if features else 0.8}
+        drives = {"curiosity": float(_curiosity(features is not None))}
 
         mode = self.scheduler.decide(external_salience=external_salience, drives=drives)
         if mode == "idle":
+            self._record_frame({"mode": mode, "external_salience": external_salience})
             return None
 
         uncertainty = max(0.0, 1.0 - external_salience)
         question = self.question_generator.generate(
             state=self.state, uncertainty=uncertainty, hint=features.external_text if features else None
         )
-
-        result = self.tool.call(ToolQuery(content=question.text))
-        self.state.update_axis("text", {"internal_text": result.content})
-
         meta = {
             "mode": mode,
             "external_salience": external_salience,
             "proto_state": proto_state.vector,
         }
-        self.memory.append(question=question.text, tool=self.tool.name, answer=result.content, metadata=meta)
-        return result
+        if self.scheduler.budget_exhausted():
+            # Only answers from memory are possible until the budget refills.
+            meta["budget_exhausted"] = True
+        pending = PendingStep(question=question, query=ToolQuery(content=question.text), meta=meta)
+        if self.world_model is not None:
+            pending.vector = self.state.vector()
+            meta["world_uncertainty"] = self.world_model.uncertainty
+        return pending
+
+    def _stream_answer(self, pending: PendingStep) -> ToolResult:
+        progress = _StreamProgress(self, pending)
+        stream = self.tool.stream(pending.query)
+        try:
+            for chunk in stream:
+                progress.feed(chunk)
+            return stream.result()
+        except BaseException:
+            progress.abort()
+            raise
+
+    def _answer_internally(self, pending: PendingStep) -> Optional[ToolResult]:
+        """Answer from memory when the world model predicts the outcome; counts tool calls."""
+        model = self.world_model
+        exhausted = bool(pending.meta.get("budget_exhausted"))
+        if (
+            model is not None
+            and pending.vector is not None
+            and self.memory.vectors is not None
+            and model.confident
+            and (exhausted or self._skips_in_row < model.config.max_consecutive_skips)
+        ):
+            predicted = model.predict(pending.vector)
+            for event, score in self.memory.recall(predicted, k=5):
+                if score >= model.config.min_similarity and event.question == pending.question.text:
+                    pending.internal = True
+                    self.answered_internally += 1
+                    self._skips_in_row += 1
+                    return ToolResult(
+                        content=event.answer,
+                        metadata={
+                            "teacher": "world_model",
+                            "source_tool": event.tool,
+                            "similarity": score,
+                            "uncertainty": model.uncertainty,
+                        },
+                    )
+        if not exhausted:
+            self.tool_calls += 1
+            self._skips_in_row = 0
+        return None
+
+    def _commit(
+        self, pending: PendingStep, result: ToolResult, deferred: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """Integrate a tool answer into the state and episodic memory.
+
+        With ``deferred`` the episodic record is collected there instead, for
+        one :meth:`EpisodicMemory.append_many` later.
+        """
+        self.state.update_axis("text", {"internal_text": result.content})
+        need_vector = self.memory.vectors is not None or self.world_model is not None or self.autobiography is not None
+        vector = self.state.vector() if need_vector else None
+        # Answers replayed from memory are not evidence about the world.
+        if self.world_model is not None and pending.vector is not None and not pending.internal:
+            self.world_model.update(pending.vector, vector)
+        tool = result.metadata.get("teacher", self.tool.name)
+        record = {
+            "question": pending.question.text,
+            "tool": tool,
+            "answer": result.content,
+            "metadata": pending.meta,
+            "vector": vector if self.memory.vectors is not None else None,
+        }
+        if deferred is None:
+            position = self.memory.next_position
+            self.memory.append(**record)
+        else:
+            position = self.memory.next_position + len(deferred)
+            deferred.append(record)
+        if self.autobiography is not None and vector is not None:
+            # The frame recorded below gets step + 1.
+            self.autobiography.observe(
+                vector, tool=tool, step=self.state.step + 1, position=position, timestamp=time.time()
+            )
+        self._record_frame(pending.meta)
+
+    def _record_frame(self, meta: Dict[str, Any]) -> None:
+        """Append the post-step state to history and the frame store."""
+        self.state.record(meta)
+        if self.frame_store is not None:
+            self.frame_store.append(*self.state.history.latest())
@@ -0,0 +1,222 @@
+"""Sidecar offset/timestamp index for the episodic JSONL log."""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Union
+
+TimeLike = Union[datetime, str, float, int]
+
+_MAGIC = b"AWIX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sI")
+# offset, length, timestamp (epoch seconds), crc32 of the tool name
+_RECORD = struct.Struct("<QIdI")
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """Location and key fields of one event inside the JSONL log."""
+
+    offset: int
+    length: int
+    timestamp: float
+    tool_key: int
+
+
+def tool_key(tool: str) -> int:
+    """Return the compact key stored in the index for a tool name."""
+    return zlib.crc32(tool.encode("utf-8"))
+
+
+def to_epoch(value: TimeLike) -> float:
+    """Convert timestamps used by episodic events to epoch seconds.
+
+    Naive datetimes and ISO strings are interpreted as UTC, matching
+    ``datetime.utcnow().isoformat()`` used when writing events.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class EpisodicIndex:
+    """Append-maintained binary index of (offset, length, timestamp, tool).
+
+    Records are fixed width so the tail and arbitrary positions can be read
+    with a single seek instead of scanning the log.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        # Append handle kept open between appends; see :meth:`close`.
+        self._handle: Optional[BinaryIO] = None
+
+    def __len__(self) -> int:
+        if not self.path.exists():
+            return 0
+        size = self.path.stat().st_size - _HEADER.size
+        return max(0, size // _RECORD.size)
+
+    def _valid_layout(self) -> bool:
+        if not self.path.exists():
+            return False
+        size = self.path.stat().st_size
+        if size < _HEADER.size or (size - _HEADER.size) % _RECORD.size:
+            return False
+        with self.path.open("rb") as f:
+            magic, version = _HEADER.unpack(f.read(_HEADER.size))
+        return magic == _MAGIC and version == _VERSION
+
+    def covered_bytes(self) -> int:
+        """Return the number of log bytes described by the index."""
+        count = len(self)
+        if count == 0:
+            return 0
+        last = self.entry(count - 1)
+        return last.offset + last.length
+
+    def sync(self, log_path: Path) -> None:
+        """Bring the index up to date with the log, rebuilding if stale.
+
+        A missing or malformed index, or one whose last entry does not match
+        a complete line of the log (the log was truncated or replaced), is
+        rebuilt from scratch; a log that only grew since the index was
+        written is indexed incrementally from the covered offset.
+        """
+        log_size = log_path.stat().st_size if log_path.exists() else 0
+        if not self._valid_layout() or not self._tail_matches(log_path, log_size):
+            self._reset()
+            start = 0
+        else:
+            start = self.covered_bytes()
+        if start < log_size:
+            self._index_from(log_path, start)
+
+    def _tail_matches(self, log_path: Path, log_size: int) -> bool:
+        """Whether the last entry still describes a whole line of the log, with the same timestamp."""
+        count = len(self)
+        if count == 0:
+            return True
+        last = self.entry(count - 1)
+        if last.offset + last.length > log_size:
+            return False
+        with log_path.open("rb") as f:
+            f.seek(max(0, last.offset - 1))
+            data = f.read(last.length + (1 if last.offset else 0))
+        if last.offset:
+            if data[:1] != b"\n":
+                return False
+            data = data[1:]
+        if not data.endswith(b"\n"):
+            return False
+        try:
+            timestamp = to_epoch(json.loads(data)["timestamp"])
+        except (ValueError, KeyError, TypeError):
+            # Unparsable lines carry the previous timestamp (see _index_from).
+            return True
+        return timestamp == last.timestamp
+
+    def _reset(self) -> None:
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION))
+
+    def _index_from(self, log_path: Path, start: int) -> None:
+        records = bytearray()
+        count = len(self)
+        previous = self.entry(count - 1).timestamp if count else 0.0
+        with log_path.open("rb") as log:
+            log.seek(start)
+            offset = start
+            for line in log:
+                if not line.endswith(b"\n"):
+                    # Partially written trailing line: index it on the next sync.
+                    break
+                length = len(line)
+                try:
+                    payload = json.loads(line)
+                    timestamp = to_epoch(payload["timestamp"])
+                    key = tool_key(str(payload.get("tool", "")))
+                except (ValueError, KeyError, TypeError):
+                    # Keep the offset chain contiguous for unparsable lines, and
+                    # timestamps non-decreasing for bisect_time.
+                    timestamp, key = previous, 0
+                previous = timestamp
+                records += _RECORD.pack(offset, length, timestamp, key)
+                offset += length
+        if records:
+            with self.path.open("ab") as f:
+                f.write(records)
+
+    def append(self, offset: int, length: int, timestamp: float, tool: str) -> None:
+        """Append a single entry; the caller guarantees log ordering."""
+        self.append_many([IndexEntry(offset, length, timestamp, tool_key(tool))])
+
+    def append_many(self, entries: List[IndexEntry]) -> None:
+        """Append several entries with one write."""
+        if not entries:
+            return
+        payload = b"".join(
+            _RECORD.pack(e.offset, e.length, e.timestamp, e.tool_key) for e in entries
+        )
+        if self._handle is None:
+            self._handle = self.path.open("ab")
+        self._handle.write(payload)
+        self._handle.flush()
+
+    def close(self) -> None:
+        """Release the append handle (before the index file is moved or replaced)."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def entry(self, position: int) -> IndexEntry:
+        """Return the entry at ``position`` (0-based)."""
+        return self.entries(position, position + 1)[0]
+
+    def entries(self, start: int, stop: Optional[int] = None) -> List[IndexEntry]:
+        """Return entries in ``[start, stop)`` with one seek and read."""
+        count = len(self)
+        stop = count if stop is None else min(stop, count)
+        start = max(0, start)
+        if start >= stop:
+            return []
+        with self.path.open("rb") as f:
+            f.seek(_HEADER.size + start * _RECORD.size)
+            data = f.read((stop - start) * _RECORD.size)
+        return [IndexEntry(*fields) for fields in _RECORD.iter_unpack(data)]
+
+    def iter_entries(self, chunk: int = 4096) -> Iterator[IndexEntry]:
+        """Stream all entries in fixed-size chunks."""
+        count = len(self)
+        for start in range(0, count, chunk):
+            yield from self.entries(start, start + chunk)
+
+    def bisect_time(self, timestamp: float) -> int:
+        """Return the first position whose timestamp is >= ``timestamp``.
+
+        Assumes timestamps are non-decreasing, which holds for appends made
+        with a monotonic wall clock.
+        """
+        lo, hi = 0, len(self)
+        with self.path.open("rb") as f:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                f.seek(_HEADER.size + mid * _RECORD.size)
+                _, _, value, _ = _RECORD.unpack(f.read(_RECORD.size))
+                if value < timestamp:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        return lo
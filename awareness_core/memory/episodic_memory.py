@@ -3,10 +3,18 @@
 from __future__ import annotations
 
 import json
+import os
+import time
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from ..config import MemoryConfig, SegmentConfig, WriterConfig
+from .episodic_index import EpisodicIndex, IndexEntry, TimeLike, to_epoch, tool_key
+from .episodic_segments import Segment, SegmentStore
+from .episodic_writer import EpisodicWriter
+from .vector_index import VectorIndex
 
 
 @dataclass
@@ -21,15 +29,97 @@ class EpisodicEvent:
 
 
 class EpisodicMemory:
-    """JSONL-based episodic memory store."""
+    """JSONL-based episodic memory store.
+
+    A sidecar index (``<name>.idx``) keeps the byte offset, timestamp and tool
+    of every line so tail reads and time-range queries seek directly to the
+    relevant records instead of scanning the whole log.
+
+    Passing a :class:`WriterConfig` switches ``append`` to a group-commit
+    :class:`EpisodicWriter`; call :meth:`close` (or use the store as a context
+    manager) to commit the last batch.
+
+    With ``vector_dim`` set, events may carry an awareness-state vector that
+    is kept in a memory-mapped :class:`VectorIndex` (``<name>.vec``) and
+    searched by :meth:`recall`.
 
-    def __init__(self, path: Path) -> None:
+    With a :class:`SegmentConfig` (or ``max_events``) the log at ``path`` is
+    only the active segment: it is rotated into compressed segments under
+    ``<name>.segments/`` and old segments are dropped by ``max_events`` or
+    age. Events keep a stable global id (their position), and reads span
+    sealed and active segments transparently, decompressing a sealed segment
+    only when the query needs its events.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        writer: Optional[WriterConfig] = None,
+        vector_dim: Optional[int] = None,
+        vector_mode: str = "exact",
+        segments: Optional[SegmentConfig] = None,
+        max_events: Optional[int] = None,
+    ) -> None:
         self.path = path
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        if segments is None and max_events is not None:
+            segments = SegmentConfig(segment_events=max(1, max_events // 4))
+        self.segment_config = segments
+        self.max_events = max_events
+        self.segments: Optional[SegmentStore] = None
+        if segments is not None:
+            self.segments = SegmentStore(self.path.with_name(self.path.name + ".segments"), segments.compression)
         if not self.path.exists():
             self.path.touch()
+        self.index = EpisodicIndex(self.path.with_name(self.path.name + ".idx"))
+        self.index.sync(self.path)
+        # Append handle on the active log (unbuffered path) and the log size it ends at.
+        self._log: Optional[BinaryIO] = None
+        self._log_end = 0
+        self._writer_config = writer
+        self._writer = EpisodicWriter(self.path, self.index, writer) if writer is not None else None
+        self._count = len(self.index)
+        self._active_bytes = self.index.covered_bytes()
+        self.vectors: Optional[VectorIndex] = None
+        if vector_dim is not None:
+            self.vectors = VectorIndex(
+                self.path.with_name(self.path.name + ".vec"), dim=vector_dim, mode=vector_mode
+            )
+
+    @classmethod
+    def from_config(cls, config: MemoryConfig) -> "EpisodicMemory":
+        """Build a store from :class:`MemoryConfig`."""
+        return cls(
+            config.episodic_path,
+            writer=config.writer,
+            vector_dim=config.vector_dim,
+            vector_mode=config.vector_index,
+            segments=config.segments,
+            max_events=config.max_events,
+        )
+
+    @property
+    def first_position(self) -> int:
+        """Global id of the oldest retained event."""
+        return self.segments.first_position if self.segments is not None else 0
 
-    def append(self, question: str, tool: str, answer: str, metadata: Optional[Dict[str, Any]] = None) -> EpisodicEvent:
+    @property
+    def next_position(self) -> int:
+        """Global id the next appended event will get."""
+        return self._base + self._count
+
+    @property
+    def _base(self) -> int:
+        return self.segments.active_position if self.segments is not None else 0
+
+    def append(
+        self,
+        question: str,
+        tool: str,
+        answer: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        vector: Optional[Sequence[float]] = None,
+    ) -> EpisodicEvent:
         event = EpisodicEvent(
             timestamp=datetime.utcnow().isoformat(),
             question=question,
@@ -37,25 +127,413 @@ class EpisodicMemory:
             answer=answer,
             metadata=metadata or {},
         )
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(asdict(event), ensure_ascii=False) + "\n")
+        line = self._encode(event)
+        position = self.next_position
+        if self._writer is not None:
+            self._writer.write(line, to_epoch(event.timestamp), tool)
+        else:
+            offset = self._write_log(line)
+            self.index.append(offset, len(line), to_epoch(event.timestamp), tool)
+        self._count += 1
+        self._active_bytes += len(line)
+        if vector is not None:
+            if self.vectors is None:
+                raise ValueError("EpisodicMemory was created without vector_dim")
+            self.vectors.add(vector, position)
+        if self._should_rotate():
+            self.rotate()
         return event
 
+    def append_many(self, records: Sequence[Mapping[str, Any]]) -> List[EpisodicEvent]:
+        """Append several events (dicts of :meth:`append` arguments) in bulk.
+
+        Each run between rotation points is written with one ``write`` and
+        one index update, and vectors with one :meth:`VectorIndex.add_many`;
+        segments rotate at the same events as with repeated :meth:`append`.
+        """
+        events = [
+            EpisodicEvent(
+                timestamp=datetime.utcnow().isoformat(),
+                question=record["question"],
+                tool=record["tool"],
+                answer=record["answer"],
+                metadata=record.get("metadata") or {},
+            )
+            for record in records
+        ]
+        if any(record.get("vector") is not None for record in records) and self.vectors is None:
+            raise ValueError("EpisodicMemory was created without vector_dim")
+        lines = [self._encode(event) for event in events]
+        start = 0
+        count, size = self._count, self._active_bytes
+        for stop in range(1, len(lines) + 1):
+            count += 1
+            size += len(lines[stop - 1])
+            if stop == len(lines) or self._should_rotate(count, size):
+                self._append_run(events[start:stop], lines[start:stop], records[start:stop])
+                if self._should_rotate():
+                    self.rotate()
+                start = stop
+                count, size = self._count, self._active_bytes
+        return events
+
+    def _append_run(
+        self, events: List[EpisodicEvent], lines: List[bytes], records: Sequence[Mapping[str, Any]]
+    ) -> None:
+        position = self.next_position
+        if self._writer is not None:
+            for event, line in zip(events, lines):
+                self._writer.write(line, to_epoch(event.timestamp), event.tool)
+        else:
+            offset = self._write_log(b"".join(lines))
+            entries = []
+            for event, line in zip(events, lines):
+                entries.append(IndexEntry(offset, len(line), to_epoch(event.timestamp), tool_key(event.tool)))
+                offset += len(line)
+            self.index.append_many(entries)
+        self._count += len(lines)
+        self._active_bytes += sum(len(line) for line in lines)
+        ids = [position + i for i, record in enumerate(records) if record.get("vector") is not None]
+        if ids and self.vectors is not None:
+            self.vectors.add_many([records[i - position]["vector"] for i in ids], ids)
+
+    def _write_log(self, data: bytes) -> int:
+        """Append ``data`` to the active log through the kept-open handle; returns its offset."""
+        if self._log is None:
+            self._log = self.path.open("ab")
+            self._log_end = self._log.seek(0, os.SEEK_END)
+        offset = self._log_end
+        self._log.write(data)
+        self._log.flush()
+        self._log_end += len(data)
+        return offset
+
+    def _close_log(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self.index.close()
+
+    def _should_rotate(self, count: Optional[int] = None, size: Optional[int] = None) -> bool:
+        config = self.segment_config
+        if config is None:
+            return False
+        count = self._count if count is None else count
+        size = self._active_bytes if size is None else size
+        return (config.segment_events is not None and count >= config.segment_events) or (
+            config.segment_bytes is not None and size >= config.segment_bytes
+        )
+
+    def rotate(self) -> Optional[Segment]:
+        """Seal the active log into a compressed segment and apply retention."""
+        if self.segments is None or self._count == 0:
+            return None
+        if self._writer is not None:
+            self._writer.close()
+        self._close_log()
+        segment = self.segments.seal(self.path, self.index.path)
+        self.path.touch()
+        self.index.sync(self.path)
+        self._count = 0
+        self._active_bytes = 0
+        if self._writer_config is not None:
+            self._writer = EpisodicWriter(self.path, self.index, self._writer_config)
+        self.enforce_retention()
+        return segment
+
+    def enforce_retention(self, now: Optional[float] = None) -> List[Segment]:
+        """Drop the oldest sealed segments that exceed ``max_events`` or ``max_age``."""
+        if self.segments is None or self.segment_config is None:
+            return []
+        now = time.time() if now is None else now
+        max_age = self.segment_config.max_age
+        total = len(self)
+        doomed: List[Segment] = []
+        for segment in self.segments.segments:
+            expired = max_age is not None and segment.last_timestamp < now - max_age
+            over = self.max_events is not None and total - segment.count >= self.max_events
+            if not (expired or over):
+                break
+            doomed.append(segment)
+            total -= segment.count
+        if doomed:
+            self.segments.drop(doomed)
+            self._prune_vectors()
+        return doomed
+
+    def _prune_vectors(self) -> None:
+        """Forget vectors of events no longer in the log, so recall stays at ``k`` results."""
+        if self.vectors is not None:
+            self.vectors.drop_before(self.first_position)
+
+    def compact(
+        self,
+        before: TimeLike,
+        summarize: Optional[Callable[[List[EpisodicEvent]], Optional[EpisodicEvent]]] = None,
+    ) -> int:
+        """Drop or summarize sealed segments whose events all precede ``before``.
+
+        Without ``summarize`` such segments are deleted; otherwise each is
+        replaced by the single event ``summarize`` returns for it (``None``
+        deletes it). The active segment is never compacted. Returns the number
+        of events removed.
+        """
+        if self.segments is None:
+            return 0
+        cutoff = to_epoch(before)
+        removed = 0
+        for segment in list(self.segments.segments):
+            if segment.last_timestamp >= cutoff:
+                break
+            summary = summarize(self._read_source(segment)) if summarize is not None else None
+            if summary is None:
+                self.segments.drop([segment])
+                removed += segment.count
+            else:
+                self.segments.rewrite(segment, [self._encode(summary)])
+                removed += segment.count - 1
+        self._prune_vectors()
+        return removed
+
+    def recall(self, vector: Sequence[float], k: int = 5) -> List[Tuple[EpisodicEvent, float]]:
+        """Return the ``k`` past events whose stored vectors are most similar."""
+        if self.vectors is None:
+            raise ValueError("EpisodicMemory was created without vector_dim")
+        self._flush_for_read()
+        results: List[Tuple[EpisodicEvent, float]] = []
+        for position, score in self.vectors.search(vector, k):
+            # Vectors may outlive log lines lost in a crash or summarized away by compaction.
+            event = self._event_at(position)
+            if event is not None:
+                results.append((event, score))
+        return results
+
+    def flush(self) -> None:
+        """Commit buffered events so readers and other processes see them."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Flush and release the buffered writer (if any) and the append handles."""
+        if self._writer is not None:
+            self._writer.close()
+        self._close_log()
+        if self.vectors is not None:
+            self.vectors.close()
+
+    def __enter__(self) -> "EpisodicMemory":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def load_recent(self, limit: int = 20) -> List[EpisodicEvent]:
-        """Load the most recent events (simple file scan)."""
-        lines = self.path.read_text(encoding="utf-8").splitlines()
+        """Load the most recent events by seeking to their indexed offsets."""
+        if limit <= 0:
+            return []
+        self._flush_for_read()
         events: List[EpisodicEvent] = []
-        for line in lines[-limit:]:
-            try:
-                payload = json.loads(line)
-                events.append(EpisodicEvent(**payload))
-            except json.JSONDecodeError:
+        remaining = limit
+        for segment in reversed(self._sources()):
+            index = self._index_for(segment)
+            count = len(index)
+            take = min(remaining, count)
+            events[:0] = self._read_entries(index.entries(count - take, count), segment)
+            remaining -= take
+            if remaining == 0:
+                break
+        return events
+
+    def load_range(self, start: Optional[TimeLike] = None, end: Optional[TimeLike] = None) -> List[EpisodicEvent]:
+        """Load events with ``start <= timestamp < end`` (either bound optional)."""
+        return list(self.iter_range(start, end))
+
+    def iter_range(self, start: Optional[TimeLike] = None, end: Optional[TimeLike] = None) -> Iterator[EpisodicEvent]:
+        """Stream events in a time range, locating the bounds by binary search."""
+        self._flush_for_read()
+        start_epoch = to_epoch(start) if start is not None else None
+        end_epoch = to_epoch(end) if end is not None else None
+        for segment in self._sources():
+            if segment is not None and (
+                (start_epoch is not None and segment.last_timestamp < start_epoch)
+                or (end_epoch is not None and segment.first_timestamp >= end_epoch)
+            ):
+                continue
+            index = self._index_for(segment)
+            first = index.bisect_time(start_epoch) if start_epoch is not None else 0
+            last = index.bisect_time(end_epoch) if end_epoch is not None else len(index)
+            for chunk_start in range(first, last, 1024):
+                yield from self._read_entries(index.entries(chunk_start, min(last, chunk_start + 1024)), segment)
+
+    def filter(self, tool: Optional[str] = None, limit: Optional[int] = None) -> List[EpisodicEvent]:
+        """Return events recorded for ``tool`` (oldest first), using the index to skip others.
+
+        Matching entries that sit next to each other in the log are read in
+        one seek, and the active log is opened once for the whole scan.
+        """
+        self._flush_for_read()
+        key = tool_key(tool) if tool is not None else None
+        events: List[EpisodicEvent] = []
+        for segment in self._sources():
+            if segment is not None and key is not None and key not in segment.tool_keys:
                 continue
+            handle = self.path.open("rb") if segment is None else None
+            try:
+                for run in self._matching_runs(self._index_for(segment), key):
+                    for event in self._read_entries(run, segment, handle):
+                        # The key is a hash; confirm against the decoded event.
+                        if tool is not None and event.tool != tool:
+                            continue
+                        events.append(event)
+                        if limit is not None and len(events) >= limit:
+                            return events
+            finally:
+                if handle is not None:
+                    handle.close()
         return events
 
+    @staticmethod
+    def _matching_runs(index: EpisodicIndex, key: Optional[int], chunk: int = 1024) -> Iterator[List[IndexEntry]]:
+        """Group entries with ``key`` into runs of adjacent log lines (at most ``chunk`` each)."""
+        run: List[IndexEntry] = []
+        for entry in index.iter_entries():
+            if key is not None and entry.tool_key != key:
+                continue
+            if run and (len(run) >= chunk or run[-1].offset + run[-1].length != entry.offset):
+                yield run
+                run = []
+            run.append(entry)
+        if run:
+            yield run
+
+    def read_lines(self, start: int, stop: int) -> bytes:
+        """Return the raw JSONL bytes of events with global ids ``[start, stop)``."""
+        self._flush_for_read()
+        blobs: List[bytes] = []
+        for segment, local_start, local_stop in self._spans(start, stop):
+            entries = self._index_for(segment).entries(local_start, local_stop)
+            if entries:
+                blobs.append(self._read_bytes(segment, entries[0].offset, entries[-1].offset + entries[-1].length))
+        return b"".join(blobs)
+
+    def end_offset(self, position: int) -> Optional[int]:
+        """Return the logical log byte offset just past event ``position - 1``.
+
+        Offsets count uncompressed bytes across all segments; ``None`` means
+        event ``position - 1`` is no longer retained.
+        """
+        if position <= 0:
+            return 0
+        for segment, local_start, _ in self._spans(position - 1, position):
+            entry = self._index_for(segment).entry(local_start)
+            first_byte = segment.first_byte if segment is not None else self._active_first_byte
+            return first_byte + entry.offset + entry.length
+        return None
+
+    @property
+    def _active_first_byte(self) -> int:
+        return self.segments.active_byte if self.segments is not None else 0
+
+    def __len__(self) -> int:
+        self._flush_for_read()
+        sealed = len(self.segments) if self.segments is not None else 0
+        return sealed + len(self.index)
+
     def __iter__(self) -> Iterable[EpisodicEvent]:
-        for line in self.path.read_text(encoding="utf-8").splitlines():
-            try:
-                yield EpisodicEvent(**json.loads(line))
-            except json.JSONDecodeError:
+        self._flush_for_read()
+        for segment in self._sources():
+            if segment is not None:
+                yield from self._read_source(segment)
                 continue
+            with self.path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    event = self._decode(line)
+                    if event is not None:
+                        yield event
+
+    def _flush_for_read(self) -> None:
+        if self._writer is not None and not self._writer.closed:
+            self._writer.flush()
+
+    def _sources(self) -> List[Optional[Segment]]:
+        """Sealed segments oldest first, then ``None`` for the active log."""
+        sealed: List[Optional[Segment]] = list(self.segments.segments) if self.segments is not None else []
+        return sealed + [None]
+
+    def _spans(self, start: int, stop: int) -> Iterator[Tuple[Optional[Segment], int, int]]:
+        """Split global ids ``[start, stop)`` into per-segment local ranges."""
+        if self.segments is not None:
+            for segment in self.segments.segments:
+                if segment.stop_position <= start:
+                    continue
+                if segment.first_position >= stop:
+                    break
+                yield (
+                    segment,
+                    max(start, segment.first_position) - segment.first_position,
+                    min(stop, segment.stop_position) - segment.first_position,
+                )
+        base = self._base
+        local_start, local_stop = max(start, base) - base, min(stop, base + len(self.index)) - base
+        if local_start < local_stop:
+            yield None, local_start, local_stop
+
+    def _index_for(self, segment: Optional[Segment]) -> EpisodicIndex:
+        if segment is None:
+            return self.index
+        assert self.segments is not None
+        return self.segments.index(segment)
+
+    def _read_bytes(
+        self, segment: Optional[Segment], start: int, stop: int, handle: Optional[BinaryIO] = None
+    ) -> bytes:
+        if segment is None:
+            if handle is not None:
+                handle.seek(start)
+                return handle.read(stop - start)
+            with self.path.open("rb") as f:
+                f.seek(start)
+                return f.read(stop - start)
+        assert self.segments is not None
+        return self.segments.read(segment)[start:stop]
+
+    def _read_source(self, segment: Segment) -> List[EpisodicEvent]:
+        assert self.segments is not None
+        events: List[EpisodicEvent] = []
+        for line in self.segments.read(segment).splitlines():
+            event = self._decode(line)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _event_at(self, position: int) -> Optional[EpisodicEvent]:
+        for segment, local_start, _ in self._spans(position, position + 1):
+            entry = self._index_for(segment).entry(local_start)
+            return self._decode(self._read_bytes(segment, entry.offset, entry.offset + entry.length))
+        return None
+
+    @staticmethod
+    def _encode(event: EpisodicEvent) -> bytes:
+        return (json.dumps(asdict(event), ensure_ascii=False) + "\n").encode("utf-8")
+
+    @staticmethod
+    def _decode(line: str | bytes) -> Optional[EpisodicEvent]:
+        try:
+            return EpisodicEvent(**json.loads(line))
+        except (json.JSONDecodeError, TypeError):
+            return None
+
+    def _read_entries(
+        self, entries: List[IndexEntry], segment: Optional[Segment] = None, handle: Optional[BinaryIO] = None
+    ) -> List[EpisodicEvent]:
+        """Read a contiguous run of indexed lines with a single seek."""
+        if not entries:
+            return []
+        start = entries[0].offset
+        blob = self._read_bytes(segment, start, entries[-1].offset + entries[-1].length, handle)
+        events: List[EpisodicEvent] = []
+        for entry in entries:
+            event = self._decode(blob[entry.offset - start : entry.offset - start + entry.length])
+            if event is not None:
+                events.append(event)
+        return events
@@ -0,0 +1,236 @@
+"""Sealed, compressed segments of the episodic log."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .episodic_index import EpisodicIndex
+
+try:  # Python 3.14+
+    from compression import zstd as _zstd  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on the interpreter
+    _zstd = None
+
+COMPRESSIONS = ("gzip", "zstd", "none")
+_SUFFIXES = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst", "none": ".jsonl"}
+
+
+def resolve_compression(name: str) -> str:
+    """Return the codec actually used for ``name``; zstd falls back to gzip."""
+    if name not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {name!r}; expected one of {COMPRESSIONS}")
+    if name == "zstd" and _zstd is None:
+        return "gzip"
+    return name
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if codec == "zstd":
+        return _zstd.compress(data)
+    return data
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":
+        if _zstd is None:
+            raise RuntimeError("segment is zstd-compressed but compression.zstd is unavailable")
+        return _zstd.decompress(data)
+    return data
+
+
+@dataclass
+class Segment:
+    """Manifest record of one sealed segment.
+
+    ``first_position`` is the global event id of the first line and
+    ``first_byte`` its offset in the uncompressed logical log; ``bytes`` is
+    the uncompressed size. ``tool_keys`` lets tool filters skip the segment
+    without decompressing it.
+    """
+
+    name: str
+    codec: str
+    first_position: int
+    count: int
+    first_byte: int
+    bytes: int
+    first_timestamp: float
+    last_timestamp: float
+    tool_keys: List[int] = field(default_factory=list)
+
+    @property
+    def stop_position(self) -> int:
+        return self.first_position + self.count
+
+
+class SegmentStore:
+    """Manifest plus compressed files for sealed episodic segments.
+
+    Each segment keeps its uncompressed offset index (``<seg>.idx``) next to
+    the compressed log, so counts, timestamps and tool keys are answered from
+    the index and a segment is only decompressed when a query reads its
+    events. The most recently decompressed segment is cached.
+    """
+
+    def __init__(self, directory: Path, compression: str = "gzip") -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.codec = resolve_compression(compression)
+        self.manifest_path = directory / "manifest.json"
+        self.segments: List[Segment] = []
+        # Global id and logical byte offset of the active segment's first line.
+        self.active_position = 0
+        self.active_byte = 0
+        self._cache: Optional[Tuple[str, bytes]] = None
+        if self.manifest_path.exists():
+            payload = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            self.segments = [Segment(**record) for record in payload["segments"]]
+            self.active_position = payload["active_position"]
+            self.active_byte = payload["active_byte"]
+        self._recover()
+
+    def __len__(self) -> int:
+        return sum(segment.count for segment in self.segments)
+
+    @property
+    def first_position(self) -> int:
+        return self.segments[0].first_position if self.segments else self.active_position
+
+    def index(self, segment: Segment) -> EpisodicIndex:
+        return EpisodicIndex(self.directory / f"{segment.name}.idx")
+
+    def read(self, segment: Segment) -> bytes:
+        """Return the uncompressed bytes of ``segment``."""
+        if self._cache is not None and self._cache[0] == segment.name:
+            return self._cache[1]
+        path = self.directory / (segment.name + _SUFFIXES[segment.codec])
+        data = _decompress(segment.codec, path.read_bytes())
+        self._cache = (segment.name, data)
+        return data
+
+    def find(self, position: int) -> Optional[Segment]:
+        """Return the sealed segment holding global id ``position``, if any."""
+        lo, hi = 0, len(self.segments)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.segments[mid].stop_position <= position:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.segments) and self.segments[lo].first_position <= position:
+            return self.segments[lo]
+        return None
+
+    def seal(self, log_path: Path, index_path: Path) -> Segment:
+        """Move the active log and its index into a new compressed segment.
+
+        Both files are renamed into the segment directory first (the caller
+        then starts a fresh active log), compressed, and only then added to
+        the manifest. A crash in between leaves a ``.sealing`` file that the
+        next open finishes sealing.
+        """
+        name = f"seg-{self.active_position:012d}"
+        raw = self.directory / f"{name}.sealing"
+        os.replace(index_path, self.directory / f"{name}.idx")
+        os.replace(log_path, raw)
+        return self._finish_seal(name, raw)
+
+    def _recover(self) -> None:
+        known = {segment.name for segment in self.segments}
+        for raw in sorted(self.directory.glob("*.sealing")):
+            name = raw.name[: -len(".sealing")]
+            if name in known:
+                raw.unlink()
+            else:
+                self._finish_seal(name, raw)
+
+    def _finish_seal(self, name: str, raw: Path) -> Segment:
+        index = EpisodicIndex(self.directory / f"{name}.idx")
+        index.sync(raw)
+        data = raw.read_bytes()
+        self._write_atomic(self.directory / (name + _SUFFIXES[self.codec]), _compress(self.codec, data))
+        segment = self._describe(name, index, self.active_position, self.active_byte, len(data))
+        self.segments.append(segment)
+        self.active_position += segment.count
+        self.active_byte += len(data)
+        self._save_manifest()
+        raw.unlink()
+        return segment
+
+    def _describe(self, name: str, index: EpisodicIndex, first_position: int, first_byte: int, size: int) -> Segment:
+        entries = index.entries(0)
+        return Segment(
+            name=name,
+            codec=self.codec,
+            first_position=first_position,
+            count=len(entries),
+            first_byte=first_byte,
+            bytes=size,
+            first_timestamp=entries[0].timestamp if entries else 0.0,
+            last_timestamp=entries[-1].timestamp if entries else 0.0,
+            tool_keys=sorted({entry.tool_key for entry in entries}),
+        )
+
+    def drop(self, segments: List[Segment]) -> None:
+        """Remove sealed segments from the manifest, then delete their files."""
+        names = {segment.name for segment in segments}
+        self.segments = [segment for segment in self.segments if segment.name not in names]
+        self._save_manifest()
+        for segment in segments:
+            self._unlink(segment)
+
+    def rewrite(self, segment: Segment, lines: List[bytes]) -> Segment:
+        """Replace a segment's events with ``lines`` (used by compaction).
+
+        The segment keeps its first id and logical byte offset; ids of
+        removed events become gaps. ``lines`` must be JSONL event records.
+        """
+        base, _, generation = segment.name.partition("-g")
+        name = f"{base}-g{int(generation or 0) + 1}"
+        raw = self.directory / f"{name}.rewrite"
+        self._write_atomic(raw, b"".join(lines))
+        index = EpisodicIndex(self.directory / f"{name}.idx")
+        index.sync(raw)
+        data = raw.read_bytes()
+        self._write_atomic(self.directory / (name + _SUFFIXES[self.codec]), _compress(self.codec, data))
+        replacement = self._describe(name, index, segment.first_position, segment.first_byte, len(data))
+        self.segments[self.segments.index(segment)] = replacement
+        self._save_manifest()
+        raw.unlink()
+        self._unlink(segment)
+        return replacement
+
+    def _unlink(self, segment: Segment) -> None:
+        if self._cache is not None and self._cache[0] == segment.name:
+            self._cache = None
+        for suffix in (_SUFFIXES[segment.codec], ".idx"):
+            try:
+                (self.directory / (segment.name + suffix)).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _save_manifest(self) -> None:
+        payload: Dict[str, Any] = {
+            "active_position": self.active_position,
+            "active_byte": self.active_byte,
+            "segments": [asdict(segment) for segment in self.segments],
+        }
+        self._write_atomic(self.manifest_path, json.dumps(payload).encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
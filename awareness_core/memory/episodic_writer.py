@@ -0,0 +1,135 @@
+"""Group-commit writer for the episodic JSONL log."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..config import WriterConfig
+from .episodic_index import EpisodicIndex, IndexEntry, tool_key
+
+DURABILITY_MODES = ("none", "flush", "fsync-every-N", "fsync-interval")
+
+
+class EpisodicWriter:
+    """Long-lived append handle that batches events by count or time.
+
+    Events are held in memory until ``flush_events`` accumulate or the oldest
+    pending event is ``flush_interval`` seconds old; a background thread
+    enforces the time bound. A process crash therefore loses at most one
+    window of events. The index sidecar is only extended once the
+    corresponding bytes have been handed to the OS, so a crash never leaves
+    it pointing past the log.
+    """
+
+    def __init__(self, path: Path, index: EpisodicIndex, config: Optional[WriterConfig] = None) -> None:
+        self.config = config or WriterConfig()
+        if self.config.durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"Unknown durability {self.config.durability!r}; expected one of {DURABILITY_MODES}"
+            )
+        self.path = path
+        self.index = index
+        self._handle = path.open("ab", buffering=1 << 20)
+        self._position = self._handle.tell()
+        self._pending: List[Tuple[bytes, float, str]] = []
+        self._pending_since: Optional[float] = None
+        self._unindexed: List[IndexEntry] = []
+        self._since_fsync = 0
+        self._last_fsync = time.monotonic()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="episodic-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: bytes, timestamp: float, tool: str) -> None:
+        """Queue one encoded line; commits inline once the batch is full."""
+        with self._lock:
+            if self._closed:
+                raise ValueError("EpisodicWriter is closed")
+            if not self._pending:
+                self._pending_since = time.monotonic()
+                self._wakeup.notify()
+            self._pending.append((line, timestamp, tool))
+            if len(self._pending) >= self.config.flush_events:
+                self._commit_locked()
+
+    def flush(self) -> None:
+        """Commit pending events and make them visible to readers."""
+        with self._lock:
+            self._commit_locked()
+            self._flush_handle_locked()
+
+    def close(self) -> None:
+        """Commit everything, sync according to the policy and stop the flusher."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._commit_locked()
+            self._flush_handle_locked()
+            if self.config.durability != "none":
+                os.fsync(self._handle.fileno())
+            self._handle.close()
+            self._wakeup.notify()
+        self._thread.join()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _commit_locked(self) -> None:
+        if self._pending:
+            blob = b"".join(line for line, _, _ in self._pending)
+            self._handle.write(blob)
+            for line, timestamp, tool in self._pending:
+                self._unindexed.append(IndexEntry(self._position, len(line), timestamp, tool_key(tool)))
+                self._position += len(line)
+            self._since_fsync += len(self._pending)
+            self._pending = []
+            self._pending_since = None
+        if self.config.durability == "none":
+            return
+        self._flush_handle_locked()
+        if self._needs_fsync():
+            os.fsync(self._handle.fileno())
+            self._since_fsync = 0
+            self._last_fsync = time.monotonic()
+
+    def _flush_handle_locked(self) -> None:
+        self._handle.flush()
+        if self._unindexed:
+            self.index.append_many(self._unindexed)
+            self._unindexed = []
+
+    def _needs_fsync(self) -> bool:
+        if self.config.durability == "fsync-every-N":
+            return self._since_fsync >= self.config.fsync_every
+        if self.config.durability == "fsync-interval":
+            return self._since_fsync > 0 and time.monotonic() - self._last_fsync >= self.config.fsync_interval
+        return False
+
+    def _next_deadline_locked(self) -> Optional[float]:
+        deadlines = []
+        if self._pending_since is not None:
+            deadlines.append(self._pending_since + self.config.flush_interval)
+        if self.config.durability == "fsync-interval" and self._since_fsync:
+            deadlines.append(self._last_fsync + self.config.fsync_interval)
+        return min(deadlines) if deadlines else None
+
+    def _run(self) -> None:
+        with self._lock:
+            while not self._closed:
+                deadline = self._next_deadline_locked()
+                if deadline is None:
+                    self._wakeup.wait()
+                    continue
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(timeout=delay)
+                    continue
+                self._commit_locked()
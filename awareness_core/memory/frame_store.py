@@ -0,0 +1,220 @@
+"""Fixed-width binary frame store with zero-copy mmap reads."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ..config import AxisConfig
+from ..core_state import AwarenessFrame
+
+_MAGIC = b"AWFS"
+_VERSION = 1
+_PREFIX = struct.Struct("<4sII")  # magic, version, header length
+_HEADER_ALIGN = 64
+_FIXED_FIELDS = [
+    ("step", "<i8"),
+    ("timestamp", "<f8"),
+    ("side_offset", "<u8"),
+    ("side_length", "<u4"),
+    ("_pad", "<u4"),
+]
+
+
+def _record_dtype(axes: Sequence[Mapping[str, Any]]) -> np.dtype:
+    fields: List[Any] = list(_FIXED_FIELDS)
+    fields += [(f"axis:{axis['name']}", "<f4", (int(axis["dim"]),)) for axis in axes]
+    return np.dtype(fields)
+
+
+class FrameStore:
+    """Append-only store of awareness frames in fixed-width binary records.
+
+    ``<path>`` starts with a JSON header describing the axis schema (built
+    from ``CoreConfig.axes``), followed by one record per frame: ``step``,
+    ``timestamp`` (epoch seconds), the location of the frame's summaries/meta
+    in the ``<path>.side`` JSONL file, and one float32 block per axis. Reads
+    map the file with :mod:`mmap` and expose records as a NumPy structured
+    array without copying; :meth:`vectors` returns per-axis views.
+
+    Stored steps strictly increase, which makes :meth:`frame_at` a binary
+    search: when a caller's counter starts over (a new loop on an existing
+    store), its steps are shifted past the last stored one. A partial
+    trailing record left by an interrupted write is truncated on open.
+    """
+
+    def __init__(self, path: Path, axes: Optional[Mapping[str, AxisConfig]] = None) -> None:
+        self.path = path
+        self.side_path = path.with_name(path.name + ".side")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size > 0:
+            self.schema, self._data_offset = self._read_header()
+            if axes is not None and self._axes_schema(axes) != self.schema["axes"]:
+                raise ValueError(f"{self.path} was written with a different axis schema")
+        else:
+            if axes is None:
+                raise ValueError("axes are required to create a new frame store")
+            self.schema = {"axes": self._axes_schema(axes)}
+            self._data_offset = self._write_header()
+        self.dtype = _record_dtype(self.schema["axes"])
+        self.axis_names = [axis["name"] for axis in self.schema["axes"]]
+        self._truncate_partial()
+        self._handle = self.path.open("ab")
+        self._side = self.side_path.open("ab")
+        self._side_offset = self._side.tell()
+        self._mmap: Optional[mmap.mmap] = None
+        self._records: Optional[np.ndarray] = None
+        steps = self.steps()
+        self._last_step: Optional[int] = int(steps[-1]) if steps.shape[0] else None
+        self._step_shift = 0
+
+    @staticmethod
+    def _axes_schema(axes: Mapping[str, AxisConfig]) -> List[Dict[str, Any]]:
+        return [{"name": cfg.name, "dim": cfg.dim} for cfg in axes.values()]
+
+    def _write_header(self) -> int:
+        body = json.dumps(self.schema, ensure_ascii=False).encode("utf-8")
+        total = _PREFIX.size + len(body)
+        padded = (total + _HEADER_ALIGN - 1) // _HEADER_ALIGN * _HEADER_ALIGN
+        with self.path.open("wb") as f:
+            f.write(_PREFIX.pack(_MAGIC, _VERSION, padded))
+            f.write(body)
+            f.write(b" " * (padded - total))
+        return padded
+
+    def _read_header(self) -> tuple:
+        with self.path.open("rb") as f:
+            magic, version, header_length = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{self.path} is not a frame store")
+            schema = json.loads(f.read(header_length - _PREFIX.size).decode("utf-8").rstrip())
+        return schema, header_length
+
+    def _truncate_partial(self) -> None:
+        size = self.path.stat().st_size - self._data_offset
+        partial = size % self.dtype.itemsize if size > 0 else 0
+        if partial:
+            with self.path.open("r+b") as f:
+                f.truncate(self._data_offset + size - partial)
+
+    def append(
+        self,
+        step: int,
+        timestamp: float,
+        vectors: Mapping[str, Sequence[float]],
+        summaries: Optional[Dict[str, Any]] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Append one frame; axes missing from ``vectors`` are stored as zeros.
+
+        Returns the step actually stored, which is ``step`` unless it does not
+        follow the last stored step.
+        """
+        step += self._step_shift
+        if self._last_step is not None and step <= self._last_step:
+            self._step_shift += self._last_step + 1 - step
+            step = self._last_step + 1
+        side = (json.dumps({"summaries": summaries or {}, "meta": meta or {}}, ensure_ascii=False) + "\n").encode("utf-8")
+        record = np.zeros(1, dtype=self.dtype)
+        record["step"] = step
+        record["timestamp"] = timestamp
+        record["side_offset"] = self._side_offset
+        record["side_length"] = len(side)
+        for name in self.axis_names:
+            vector = vectors.get(name)
+            if vector is not None:
+                record[f"axis:{name}"] = vector
+        # Side data first: a record never points at side bytes not yet written.
+        self._side.write(side)
+        self._side.flush()
+        self._side_offset += len(side)
+        self._handle.write(record.tobytes())
+        self._handle.flush()
+        self._last_step = step
+        return step
+
+    def append_frame(self, frame: AwarenessFrame) -> int:
+        timestamp = frame.timestamp.replace(tzinfo=timezone.utc).timestamp()
+        return self.append(frame.step, timestamp, frame.vectors, frame.summaries, frame.meta)
+
+    def __len__(self) -> int:
+        size = self.path.stat().st_size - self._data_offset
+        return max(0, size // self.dtype.itemsize)
+
+    @property
+    def records(self) -> np.ndarray:
+        """Structured array over every complete record (zero-copy mmap view)."""
+        count = len(self)
+        if self._records is None or self._records.shape[0] != count:
+            self._remap(count)
+        assert self._records is not None
+        return self._records
+
+    def _remap(self, count: int) -> None:
+        # Views handed out earlier may still export the old map; it is unmapped once they are gone.
+        self._records = None
+        self._mmap = None
+        if count == 0:
+            self._records = np.zeros(0, dtype=self.dtype)
+            return
+        with self.path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._records = np.frombuffer(self._mmap, dtype=self.dtype, count=count, offset=self._data_offset)
+
+    def steps(self) -> np.ndarray:
+        return self.records["step"]
+
+    def timestamps(self) -> np.ndarray:
+        return self.records["timestamp"]
+
+    def vectors(self, axis: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Return a ``[n, dim]`` float32 view of one axis for records ``[start, stop)``."""
+        return self.records[f"axis:{axis}"][start:stop]
+
+    def position_of(self, step: int) -> int:
+        """Return the record position holding ``step`` or raise ``KeyError``."""
+        steps = self.steps()
+        position = int(np.searchsorted(steps, step))
+        if position >= steps.shape[0] or steps[position] != step:
+            raise KeyError(step)
+        return position
+
+    def frame_at(self, step: int) -> AwarenessFrame:
+        """Materialize the frame recorded for ``step``."""
+        return self.frame(self.position_of(step))
+
+    def frame(self, position: int) -> AwarenessFrame:
+        """Materialize the frame at record ``position`` (reads the side file)."""
+        record = self.records[position]
+        with self.side_path.open("rb") as f:
+            f.seek(int(record["side_offset"]))
+            side = json.loads(f.read(int(record["side_length"])))
+        return AwarenessFrame(
+            timestamp=datetime.fromtimestamp(float(record["timestamp"]), timezone.utc).replace(tzinfo=None),
+            step=int(record["step"]),
+            vectors={name: record[f"axis:{name}"].tolist() for name in self.axis_names},
+            summaries=side["summaries"],
+            meta=side["meta"],
+        )
+
+    def __iter__(self) -> Iterator[AwarenessFrame]:
+        for position in range(len(self)):
+            yield self.frame(position)
+
+    def close(self) -> None:
+        self._records = None
+        self._mmap = None
+        self._handle.close()
+        self._side.close()
+
+    def __enter__(self) -> "FrameStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,285 @@
+"""Semantic memory consolidated by replaying the episodic log."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .episodic_memory import EpisodicMemory
+
+_LATIN = re.compile(r"[a-z0-9_]{2,}")
+_CJK = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def extract_concepts(text: str) -> List[str]:
+    """Return concept tokens: latin words of 2+ chars and CJK character bigrams."""
+    text = text.casefold()
+    tokens = _LATIN.findall(text)
+    for run in _CJK.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def question_key(question: str) -> str:
+    return _WHITESPACE.sub(" ", question.casefold()).strip()
+
+
+@dataclass
+class SemanticDelta:
+    """Partial consolidation result for a contiguous run of events."""
+
+    events: int = 0
+    concepts: Counter = field(default_factory=Counter)
+    tools: Counter = field(default_factory=Counter)
+    modes: Counter = field(default_factory=Counter)
+    # (tool, question key) -> [answer, count, last timestamp]
+    pairs: Dict[Tuple[str, str], List[Any]] = field(default_factory=dict)
+    first_timestamp: Optional[str] = None
+    last_timestamp: Optional[str] = None
+
+
+def extract_chunk(blob: bytes) -> SemanticDelta:
+    """Consolidate raw JSONL lines; runs inside replay worker processes."""
+    delta = SemanticDelta()
+    for line in blob.splitlines():
+        try:
+            event = json.loads(line)
+            question, tool, answer = event["question"], event["tool"], event["answer"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue
+        timestamp = event.get("timestamp")
+        delta.events += 1
+        delta.concepts.update(extract_concepts(question))
+        delta.concepts.update(extract_concepts(answer))
+        delta.tools[tool] += 1
+        mode = (event.get("metadata") or {}).get("mode")
+        if mode is not None:
+            delta.modes[str(mode)] += 1
+        key = (tool, question_key(question))
+        pair = delta.pairs.get(key)
+        if pair is None:
+            delta.pairs[key] = [answer, 1, timestamp]
+        else:
+            pair[0] = answer
+            pair[1] += 1
+            pair[2] = timestamp
+        if delta.first_timestamp is None:
+            delta.first_timestamp = timestamp
+        delta.last_timestamp = timestamp
+    return delta
+
+
+class SemanticMemory:
+    """Compact store of concepts, tool-answer pairs and counts.
+
+    The store and its replay checkpoint (episodic position and the log byte
+    offset it corresponds to) live in one JSON file that is replaced
+    atomically, so a crash mid-replay resumes from the last saved chunk.
+    Concepts and pairs are pruned to ``max_concepts``/``max_pairs`` once a
+    replay finishes; checkpoints saved during a replay keep every count, so a
+    resumed replay ends with the same store as an uninterrupted one.
+    """
+
+    def __init__(self, path: Path, max_concepts: int = 5000, max_pairs: int = 5000) -> None:
+        self.path = path
+        self.max_concepts = max_concepts
+        self.max_pairs = max_pairs
+        self.events = 0
+        self.concepts: Counter = Counter()
+        self.tools: Counter = Counter()
+        self.modes: Counter = Counter()
+        self.pairs: Dict[Tuple[str, str], List[Any]] = {}
+        self.first_timestamp: Optional[str] = None
+        self.last_timestamp: Optional[str] = None
+        self.checkpoint = 0
+        self.checkpoint_bytes: Optional[int] = 0
+        if self.path.exists():
+            self._load()
+
+    def merge(self, delta: SemanticDelta) -> None:
+        """Fold a later chunk's results into the store."""
+        self.events += delta.events
+        self.concepts.update(delta.concepts)
+        self.tools.update(delta.tools)
+        self.modes.update(delta.modes)
+        for key, (answer, count, timestamp) in delta.pairs.items():
+            pair = self.pairs.get(key)
+            if pair is None:
+                self.pairs[key] = [answer, count, timestamp]
+            else:
+                self.pairs[key] = [answer, pair[1] + count, timestamp]
+        if self.first_timestamp is None:
+            self.first_timestamp = delta.first_timestamp
+        if delta.last_timestamp is not None:
+            self.last_timestamp = delta.last_timestamp
+
+    def top_concepts(self, limit: int = 20) -> List[Tuple[str, int]]:
+        return self.concepts.most_common(limit)
+
+    def answer_for(self, question: str, tool: Optional[str] = None) -> Optional[str]:
+        """Return the latest consolidated answer to ``question``, if any."""
+        key = question_key(question)
+        if tool is not None:
+            pair = self.pairs.get((tool, key))
+            return pair[0] if pair else None
+        best: Optional[List[Any]] = None
+        for (_, candidate_key), pair in self.pairs.items():
+            if candidate_key == key and (best is None or (pair[2] or "") > (best[2] or "")):
+                best = pair
+        return best[0] if best else None
+
+    def reset(self) -> None:
+        """Forget everything, including the replay checkpoint."""
+        self.events = 0
+        self.concepts, self.tools, self.modes, self.pairs = Counter(), Counter(), Counter(), {}
+        self.first_timestamp = self.last_timestamp = None
+        self.checkpoint = self.checkpoint_bytes = 0
+
+    def update_from_replay(
+        self,
+        episodic: EpisodicMemory,
+        workers: Optional[int] = None,
+        chunk_size: int = 2048,
+        checkpoint_every: int = 8,
+    ) -> int:
+        """Consolidate events appended since the last checkpoint.
+
+        Raw JSONL chunks are read sequentially from the checkpointed position
+        and extracted by a process pool of ``workers`` processes (``0`` runs
+        in-process); results are merged in log order and the store is saved
+        every ``checkpoint_every`` chunks. Returns the number of events read.
+        """
+        pipeline = ReplayPipeline(
+            episodic, self, workers=workers, chunk_size=chunk_size, checkpoint_every=checkpoint_every
+        )
+        return pipeline.run()
+
+    def save(self, prune: bool = True) -> None:
+        if prune:
+            self._prune()
+        payload = {
+            "checkpoint": {"position": self.checkpoint, "log_bytes": self.checkpoint_bytes},
+            "events": self.events,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "concepts": dict(self.concepts),
+            "tools": dict(self.tools),
+            "modes": dict(self.modes),
+            "pairs": [[tool, key, *pair] for (tool, key), pair in self.pairs.items()],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _load(self) -> None:
+        payload = json.loads(self.path.read_text(encoding="utf-8"))
+        self.checkpoint = payload["checkpoint"]["position"]
+        self.checkpoint_bytes = payload["checkpoint"]["log_bytes"]
+        self.events = payload["events"]
+        self.first_timestamp = payload["first_timestamp"]
+        self.last_timestamp = payload["last_timestamp"]
+        self.concepts = Counter(payload["concepts"])
+        self.tools = Counter(payload["tools"])
+        self.modes = Counter(payload["modes"])
+        self.pairs = {(tool, key): [answer, count, ts] for tool, key, answer, count, ts in payload["pairs"]}
+
+    def _prune(self) -> None:
+        if len(self.concepts) > self.max_concepts:
+            self.concepts = Counter(dict(self.concepts.most_common(self.max_concepts)))
+        if len(self.pairs) > self.max_pairs:
+            ranked = sorted(self.pairs.items(), key=lambda item: (item[1][1], item[1][2] or ""), reverse=True)
+            self.pairs = dict(ranked[: self.max_pairs])
+
+
+class ReplayPipeline:
+    """Streams episodic chunks from the checkpoint through an extraction pool.
+
+    At most ``2 * workers`` chunks are in flight, so memory stays bounded no
+    matter how far behind the checkpoint is.
+    """
+
+    def __init__(
+        self,
+        episodic: EpisodicMemory,
+        semantic: SemanticMemory,
+        workers: Optional[int] = None,
+        chunk_size: int = 2048,
+        checkpoint_every: int = 8,
+    ) -> None:
+        self.episodic = episodic
+        self.semantic = semantic
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self.checkpoint_every = checkpoint_every
+
+    def run(self) -> int:
+        self.episodic.flush()
+        start = self._resume_position()
+        stop = self.episodic.next_position
+        if start >= stop:
+            return 0
+        if self.workers <= 0 or stop - start <= self.chunk_size:
+            return self._run(start, stop, None)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return self._run(start, stop, executor)
+
+    def _resume_position(self) -> int:
+        """Return the checkpointed position, resetting if the log was rewritten.
+
+        Events dropped by retention since the checkpoint are skipped.
+        """
+        semantic = self.semantic
+        first = self.episodic.first_position
+        position = semantic.checkpoint
+        if position > self.episodic.next_position or (
+            position > first and self.episodic.end_offset(position) != semantic.checkpoint_bytes
+        ):
+            semantic.reset()
+            return first
+        return max(position, first)
+
+    def _run(self, start: int, stop: int, executor: Optional[Executor]) -> int:
+        window: Deque[Tuple[int, Any]] = deque()
+        limit = max(1, 2 * self.workers)
+        self._unsaved = 0
+        self._events = 0
+        for chunk_start in range(start, stop, self.chunk_size):
+            chunk_stop = min(stop, chunk_start + self.chunk_size)
+            blob = self.episodic.read_lines(chunk_start, chunk_stop)
+            if executor is None:
+                window.append((chunk_stop, extract_chunk(blob)))
+            else:
+                window.append((chunk_stop, executor.submit(extract_chunk, blob)))
+            while len(window) >= limit or (executor is None and window):
+                self._merge_next(window)
+        while window:
+            self._merge_next(window)
+        self.semantic.save()
+        return self._events
+
+    def _merge_next(self, window: Deque[Tuple[int, Any]]) -> None:
+        chunk_stop, pending = window.popleft()
+        delta = pending.result() if isinstance(pending, Future) else pending
+        semantic = self.semantic
+        semantic.merge(delta)
+        self._events += delta.events
+        semantic.checkpoint = chunk_stop
+        semantic.checkpoint_bytes = self.episodic.end_offset(chunk_stop)
+        self._unsaved += 1
+        if self._unsaved >= self.checkpoint_every:
+            semantic.save(prune=False)
+            self._unsaved = 0
@@ -0,0 +1,193 @@
+"""Memory-mapped similarity index over episodic event vectors."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_MAGIC = 0x58565741  # "AWVX"
+_VERSION = 1
+_HEADER_SLOTS = 8
+_HEADER_BYTES = _HEADER_SLOTS * 8
+INDEX_MODES = ("exact", "lsh")
+
+
+class VectorIndex:
+    """Append-only cosine-similarity index persisted as ``np.memmap`` files.
+
+    Rows are L2-normalised float32 vectors stored in ``<path>`` after a small
+    header; the event position each row belongs to lives in ``<path>.ids``.
+    Storage grows by doubling so appends stay amortised O(dim). ``exact`` mode
+    scores every row with one matrix product; ``lsh`` mode buckets rows by
+    random-hyperplane signatures and only scores rows whose signature is within
+    Hamming distance one of the query, falling back to exact search when the
+    probe yields fewer than ``k`` candidates.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        dim: int,
+        mode: str = "exact",
+        lsh_bits: int = 12,
+        seed: int = 0,
+        initial_capacity: int = 1024,
+    ) -> None:
+        if mode not in INDEX_MODES:
+            raise ValueError(f"Unknown index mode {mode!r}; expected one of {INDEX_MODES}")
+        self.path = path
+        self.ids_path = path.with_name(path.name + ".ids")
+        self.dim = dim
+        self.mode = mode
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open(initial_capacity)
+        self._planes: Optional[np.ndarray] = None
+        self._buckets: Dict[int, List[int]] = {}
+        if mode == "lsh":
+            rng = np.random.default_rng(seed)
+            self._planes = rng.standard_normal((dim, lsh_bits)).astype(np.float32)
+            self._bit_weights = (1 << np.arange(lsh_bits, dtype=np.int64))
+            self._rebuild_buckets()
+
+    def __len__(self) -> int:
+        return int(self._header[3])
+
+    def _open(self, initial_capacity: int) -> None:
+        if self.path.exists() and self.path.stat().st_size >= _HEADER_BYTES:
+            header = np.memmap(self.path, dtype="<i8", mode="r", shape=(_HEADER_SLOTS,))
+            magic, version, dim = int(header[0]), int(header[1]), int(header[2])
+            del header
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{self.path} is not a vector index file")
+            if dim != self.dim:
+                raise ValueError(f"{self.path} stores dim={dim}, expected {self.dim}")
+            capacity = (self.path.stat().st_size - _HEADER_BYTES) // (4 * self.dim)
+            self._map(capacity)
+        else:
+            self._resize(max(1, initial_capacity))
+            self._header[0] = _MAGIC
+            self._header[1] = _VERSION
+            self._header[2] = self.dim
+            self._header[3] = 0
+
+    def _map(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._header = np.memmap(self.path, dtype="<i8", mode="r+", shape=(_HEADER_SLOTS,))
+        self._vectors = np.memmap(
+            self.path, dtype="<f4", mode="r+", offset=_HEADER_BYTES, shape=(capacity, self.dim)
+        )
+        self._ids = np.memmap(self.ids_path, dtype="<i8", mode="r+", shape=(capacity,))
+
+    def _resize(self, capacity: int) -> None:
+        if hasattr(self, "_vectors"):
+            self.flush()
+            del self._vectors, self._ids, self._header
+        with self.path.open("ab") as f:
+            f.truncate(_HEADER_BYTES + capacity * self.dim * 4)
+        with self.ids_path.open("ab") as f:
+            f.truncate(capacity * 8)
+        self._map(capacity)
+
+    def add(self, vector: Sequence[float], event_id: int) -> None:
+        """Append one vector for the event at position ``event_id``."""
+        row = self._normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        self._append_rows(row, np.asarray([event_id], dtype=np.int64))
+
+    def add_many(self, vectors: Sequence[Sequence[float]], event_ids: Sequence[int]) -> None:
+        """Append a batch of vectors in one copy."""
+        rows = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        self._append_rows(rows, np.asarray(event_ids, dtype=np.int64))
+
+    def _append_rows(self, rows: np.ndarray, ids: np.ndarray) -> None:
+        if rows.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dim {self.dim}, got {rows.shape[1]}")
+        count = len(self)
+        needed = count + rows.shape[0]
+        if needed > self._capacity:
+            capacity = self._capacity
+            while capacity < needed:
+                capacity *= 2
+            self._resize(capacity)
+        self._vectors[count:needed] = rows
+        self._ids[count:needed] = ids
+        if self._planes is not None:
+            for offset, signature in enumerate(self._signatures(rows)):
+                self._buckets.setdefault(int(signature), []).append(count + offset)
+        # Publish the new count last so a crash never exposes unwritten rows.
+        self._header[3] = needed
+
+    def drop_before(self, event_id: int) -> int:
+        """Remove rows of events before position ``event_id``; returns how many were removed."""
+        count = len(self)
+        keep = np.flatnonzero(self._ids[:count] >= event_id)
+        removed = count - keep.size
+        if removed == 0:
+            return 0
+        self._vectors[: keep.size] = self._vectors[keep]
+        self._ids[: keep.size] = self._ids[keep]
+        self._header[3] = keep.size
+        if self._planes is not None:
+            self._rebuild_buckets()
+        return removed
+
+    def search(self, vector: Sequence[float], k: int = 5) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(event_id, cosine_similarity)`` pairs, best first."""
+        count = len(self)
+        if count == 0 or k <= 0:
+            return []
+        query = self._normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        if query.shape[0] != self.dim:
+            raise ValueError(f"Expected vectors of dim {self.dim}, got {query.shape[0]}")
+        rows: Optional[np.ndarray] = None
+        if self._planes is not None:
+            rows = self._probe(query)
+            if rows.size < k:
+                rows = None
+        if rows is None:
+            scores = self._vectors[:count] @ query
+            candidates = np.arange(count)
+        else:
+            scores = self._vectors[rows] @ query
+            candidates = rows
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[candidates[i]]), float(scores[i])) for i in top]
+
+    def flush(self) -> None:
+        """Flush dirty pages of the memory maps to disk."""
+        self._vectors.flush()
+        self._ids.flush()
+        self._header.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+    def _normalize(self, rows: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return rows / norms
+
+    def _signatures(self, rows: np.ndarray) -> np.ndarray:
+        assert self._planes is not None
+        bits = (rows @ self._planes) > 0
+        return bits.astype(np.int64) @ self._bit_weights
+
+    def _rebuild_buckets(self, chunk: int = 65536) -> None:
+        self._buckets = {}
+        count = len(self)
+        for start in range(0, count, chunk):
+            signatures = self._signatures(np.asarray(self._vectors[start : min(count, start + chunk)]))
+            for offset, signature in enumerate(signatures):
+                self._buckets.setdefault(int(signature), []).append(start + offset)
+
+    def _probe(self, query: np.ndarray) -> np.ndarray:
+        signature = int(self._signatures(query.reshape(1, -1))[0])
+        assert self._planes is not None
+        keys = [signature] + [signature ^ (1 << bit) for bit in range(self._planes.shape[1])]
+        rows: List[int] = []
+        for key in keys:
+            rows.extend(self._buckets.get(key, ()))
+        return np.asarray(rows, dtype=np.int64)
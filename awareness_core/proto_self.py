@@ -3,7 +3,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Mapping, Optional
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from .system_sampler import DEFAULT_SLOTS, SystemSampler
+
+# Slots whose maximum is reported by ProtoSelf.load().
+LOAD_SLOTS = ("cpu", "load", "queue_depth")
 
 
 @dataclass
@@ -16,10 +21,37 @@ class ProtoState:
 
 
 class ProtoSelf:
-    """Encodes system metrics into a proto-self vector p(t)."""
+    """Encodes system metrics into a proto-self vector p(t).
 
-    def __init__(self, dim: int = 6) -> None:
+    The vector has a stable named-slot layout: position ``i`` always holds
+    metric ``slots[i]`` (see :data:`DEFAULT_SLOTS`), and slots beyond the
+    named ones are zero. With a :class:`SystemSampler` attached, slots that
+    are not passed explicitly are filled from its latest smoothed sample.
+    """
+
+    def __init__(
+        self,
+        dim: int = 6,
+        slots: Optional[Sequence[str]] = None,
+        sampler: Optional[SystemSampler] = None,
+    ) -> None:
         self.dim = dim
+        self.slots = tuple(slots if slots is not None else (sampler.slots if sampler else DEFAULT_SLOTS))[:dim]
+        self.sampler = sampler
+        self._sampler_index = (
+            [sampler.slot_index.get(name) for name in self.slots] if sampler is not None else []
+        )
+
+    def observe(self, name: str, value: float) -> None:
+        """Forward an application gauge (e.g. ``tool_latency``) to the sampler."""
+        if self.sampler is not None:
+            self.sampler.set_gauge(name, value)
+
+    def load(self) -> float:
+        """Highest sampled :data:`LOAD_SLOTS` value in [0, 1]; 0 without a sampler."""
+        if self.sampler is None:
+            return 0.0
+        return max(self._clip(self.sampler.value(name)) for name in LOAD_SLOTS)
 
     def encode(
         self,
@@ -28,18 +60,27 @@ class ProtoSelf:
     ) -> ProtoState:
         """Produce a proto-self vector from metrics.
 
-        Missing metrics default to zero; values are clipped to [0, 1] and
-        truncated or padded to the configured dimension.
+        Explicit metrics win over sampled ones; metrics without a slot are
+        kept in the returned state but not packed. Values are clipped to
+        [0, 1].
         """
         system_metrics = dict(system_metrics or {})
         learning_metrics = dict(learning_metrics or {})
-        combined = list(system_metrics.values()) + list(learning_metrics.values())
-        vector = self._normalize(combined)
+        vector = self._normalize(system_metrics, learning_metrics)
         return ProtoState(vector=vector, system_metrics=system_metrics, learning_metrics=learning_metrics)
 
-    def _normalize(self, values: List[float]) -> List[float]:
+    def _normalize(self, system_metrics: Mapping[str, float], learning_metrics: Mapping[str, float]) -> List[float]:
+        sampled = self.sampler.latest() if self.sampler is not None else None
         normalized = []
-        for value in values[: self.dim]:
+        for i, name in enumerate(self.slots):
+            if name in system_metrics:
+                value = system_metrics[name]
+            elif name in learning_metrics:
+                value = learning_metrics[name]
+            elif sampled is not None and self._sampler_index[i] is not None:
+                value = float(sampled[self._sampler_index[i]])
+            else:
+                value = 0.0
             normalized.append(self._clip(value))
         while len(normalized) < self.dim:
             normalized.append(0.0)
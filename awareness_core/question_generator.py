@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 from .core_state import AwarenessState
+from .world_model.imagination_loop import ImaginedTrajectory
 
 
 @dataclass
@@ -25,13 +26,23 @@ class QuestionGenerator:
         state: AwarenessState,
         uncertainty: float,
         hint: Optional[str] = None,
+        imagined: Optional[Sequence[ImaginedTrajectory]] = None,
     ) -> GeneratedQuestion:
-        """Produce a question string describing what the agent wants to learn."""
+        """Produce a question string describing what the agent wants to learn.
+
+        With ``imagined`` rollouts (best first) the question asks about the
+        axis the best trajectory changes most.
+        """
         summary = state.summary()
         text_axis_summary = summary.get("text")
         topic = hint
         if topic is None and text_axis_summary is not None:
             topic = text_axis_summary.extras.get("external_text")
         topic = topic or "当前输入"
+        if imagined:
+            best = imagined[0]
+            axis = best.target_axis or "text"
+            text = f"如果{topic}继续发展，{axis} 轴会如何变化？（想象得分={best.score:.2f}，不确定度={uncertainty:.2f}）"
+            return GeneratedQuestion(text=text, target_axis=axis, expected_type="prediction")
         text = f"请帮我解释并扩展：{topic}（不确定度={uncertainty:.2f}）"
         return GeneratedQuestion(text=text)
@@ -2,23 +2,301 @@
 
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+import heapq
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
 
-from .config import CoreConfig
+import numpy as np
+
+from .config import CoreConfig, QueueConfig
+from .proto_self import ProtoSelf
+from .tools.limited_tool import ToolLimiter
 
 
 class Scheduler:
-    """Rule-based scheduler choosing between external processing and internal thinking."""
+    """Rule-based scheduler choosing between external processing and internal thinking.
+
+    With ``limiters`` (see :class:`~awareness_core.tools.limited_tool.LimitedTool`)
+    it never asks for ``external`` work while none of them can start a call:
+    the step is downgraded to ``internal_think`` or ``idle``.
+    """
 
-    def __init__(self, config: CoreConfig) -> None:
+    def __init__(self, config: CoreConfig, limiters: Sequence[ToolLimiter] = ()) -> None:
         self.config = config
+        self.limiters = list(limiters)
 
     def decide(self, external_salience: float, drives: Dict[str, float] | None = None) -> str:
         """Return one of: 'external', 'internal_think', or 'idle'."""
         drives = drives or {}
-        if external_salience >= self.config.external_salience_threshold:
+        if external_salience >= self.config.external_salience_threshold and not self.budget_exhausted():
             return "external"
         curiosity = drives.get("curiosity", 0.0)
         if curiosity >= self.config.internal_think_threshold:
             return "internal_think"
         return "idle"
+
+    def decide_batch(self, external_salience: np.ndarray, curiosity: np.ndarray) -> np.ndarray:
+        """:meth:`decide` for arrays of salience and curiosity; returns an object array of modes."""
+        modes = np.where(curiosity >= self.config.internal_think_threshold, "internal_think", "idle").astype(object)
+        if not self.budget_exhausted():
+            modes[external_salience >= self.config.external_salience_threshold] = "external"
+        return modes
+
+    def budget_exhausted(self) -> bool:
+        """True when tool limiters are attached and none can start a call now."""
+        return bool(self.limiters) and not any(limiter.available() for limiter in self.limiters)
+
+
+@dataclass
+class QueuedInput:
+    """One input waiting in a :class:`PriorityScheduler` queue."""
+
+    text: str
+    source: str
+    salience: float
+    # Newer inputs with the same (source, key) supersede this one under load.
+    key: str
+    enqueued: float
+    seq: int
+    dropped: bool = field(default=False, repr=False)
+
+
+class PriorityScheduler(Scheduler):
+    """Event-driven scheduler over bounded per-source input queues.
+
+    Adapters :meth:`offer` inputs (or ``await`` :meth:`put` for
+    backpressure) and the loop takes the most urgent one with :meth:`pop`,
+    scored as described in :class:`QueueConfig`. Within a source the order
+    does not depend on the current time, so each source is a heap and
+    :meth:`pop` only compares the source heads. Superseded and shed inputs are marked
+    dropped and skipped lazily. :meth:`decide` is inherited unchanged.
+
+    ``counters`` holds ``enqueued``, ``dequeued``, ``rejected`` (queue full),
+    ``shed`` (refused by admission control or evicted for a more salient
+    input), ``coalesced`` (superseded) and ``expired``; :meth:`stats` adds
+    the queue depths. The total depth is also published to the proto-self as
+    the ``queue_depth`` gauge.
+    """
+
+    def __init__(
+        self,
+        config: CoreConfig,
+        queue: Optional[QueueConfig] = None,
+        proto_self: Optional[ProtoSelf] = None,
+        clock: Callable[[], float] = time.monotonic,
+        limiters: Sequence[ToolLimiter] = (),
+    ) -> None:
+        super().__init__(config, limiters)
+        self.queue = queue or config.input_queue or QueueConfig()
+        self.proto_self = proto_self
+        self.clock = clock
+        self._heaps: Dict[str, List[Tuple[float, int, QueuedInput]]] = {}
+        self._depth: Dict[str, int] = {}
+        self._latest: Dict[Tuple[str, str], QueuedInput] = {}
+        self._size = 0
+        self._seq = 0
+        self._space_waiters: Deque[asyncio.Future] = deque()
+        self._item_waiters: Deque[asyncio.Future] = deque()
+        self.counters: Dict[str, int] = {
+            "enqueued": 0,
+            "dequeued": 0,
+            "rejected": 0,
+            "shed": 0,
+            "coalesced": 0,
+            "expired": 0,
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def depth(self, source: Optional[str] = None) -> int:
+        return self._size if source is None else self._depth.get(source, 0)
+
+    def load(self) -> float:
+        """The larger of queue fill and the proto-self load, in [0, 1]."""
+        fill = self._size / self.queue.capacity if self.queue.capacity else 1.0
+        proto = self.proto_self.load() if self.proto_self is not None else 0.0
+        return min(1.0, max(fill, proto))
+
+    def offer(self, text: str, source: str = "text", salience: float = 1.0, key: Optional[str] = None) -> bool:
+        """Queue an input without waiting; returns False if it was not admitted."""
+        status = self._admit(text, source, salience, key)
+        if status == "full":
+            self.counters["rejected"] += 1
+        return status == "queued"
+
+    async def put(
+        self,
+        text: str,
+        source: str = "text",
+        salience: float = 1.0,
+        key: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Queue an input, waiting up to ``timeout`` seconds while the queues are full."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            status = self._admit(text, source, salience, key)
+            if status != "full":
+                return status == "queued"
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                self.counters["rejected"] += 1
+                return False
+            waiter = loop.create_future()
+            self._space_waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def pop(self, drives: Optional[Dict[str, float]] = None) -> Optional[QueuedInput]:
+        """Remove and return the most urgent input, or None if all queues are empty."""
+        now = self.clock()
+        config = self.queue
+        drives = drives or {}
+        best: Optional[QueuedInput] = None
+        best_score = 0.0
+        for source in self._heaps:
+            item = self._head(source, now)
+            if item is None:
+                continue
+            score = item.salience + config.age_weight * (now - item.enqueued)
+            drive = config.source_drives.get(source)
+            if drive is not None:
+                score += config.drive_weight * drives.get(drive, 0.0)
+            if best is None or score > best_score or (score == best_score and item.seq < best.seq):
+                best, best_score = item, score
+        if best is None:
+            return None
+        heapq.heappop(self._heaps[best.source])
+        self._remove(best)
+        self.counters["dequeued"] += 1
+        return best
+
+    async def get(self, drives: Optional[Dict[str, float]] = None) -> QueuedInput:
+        """Wait for an input and return the most urgent one."""
+        while True:
+            item = self.pop(drives)
+            if item is not None:
+                return item
+            waiter = asyncio.get_running_loop().create_future()
+            self._item_waiters.append(waiter)
+            await waiter
+
+    def stats(self) -> Dict[str, object]:
+        stats: Dict[str, object] = dict(self.counters)
+        stats["depth"] = self._size
+        stats["depth_by_source"] = {source: depth for source, depth in self._depth.items() if depth}
+        stats["load"] = self.load()
+        return stats
+
+    def _admit(self, text: str, source: str, salience: float, key: Optional[str]) -> str:
+        """Return ``"queued"``, ``"shed"`` or ``"full"``."""
+        config = self.queue
+        now = self.clock()
+        key = source if key is None else key
+        proto_load = self.proto_self.load() if self.proto_self is not None else 0.0
+        low = salience < config.shed_salience
+        if low and proto_load >= config.admit_load:
+            self.counters["shed"] += 1
+            return "shed"
+        if self.load() >= config.load_watermark:
+            previous = self._latest.get((source, key))
+            if previous is not None and previous.salience < config.shed_salience:
+                self._drop(previous)
+                self.counters["coalesced"] += 1
+        source_full = self._depth.get(source, 0) >= config.source_capacity
+        if source_full or self._size >= config.capacity:
+            self._expire(now)
+            source_full = self._depth.get(source, 0) >= config.source_capacity
+        if source_full or self._size >= config.capacity:
+            victim = self._weakest(source if source_full else None, now)
+            if victim is None or low:
+                return "full"
+            self._drop(victim)
+            self.counters["shed"] += 1
+
+        item = QueuedInput(text=text, source=source, salience=salience, key=key, enqueued=now, seq=self._seq)
+        self._seq += 1
+        heap = self._heaps.setdefault(source, [])
+        heapq.heappush(heap, (config.age_weight * now - salience, item.seq, item))
+        if len(heap) > 2 * config.source_capacity:
+            heap[:] = [entry for entry in heap if not entry[2].dropped]
+            heapq.heapify(heap)
+        self._depth[source] = self._depth.get(source, 0) + 1
+        self._latest[(source, key)] = item
+        self._size += 1
+        self.counters["enqueued"] += 1
+        self._publish()
+        self._wake(self._item_waiters)
+        return "queued"
+
+    def _head(self, source: str, now: float) -> Optional[QueuedInput]:
+        heap = self._heaps[source]
+        max_age = self.queue.max_age
+        while heap:
+            item = heap[0][2]
+            if item.dropped:
+                heapq.heappop(heap)
+            elif max_age is not None and now - item.enqueued > max_age:
+                heapq.heappop(heap)
+                self._remove(item)
+                self.counters["expired"] += 1
+            else:
+                return item
+        return None
+
+    def _weakest(self, source: Optional[str], now: float) -> Optional[QueuedInput]:
+        """Lowest-priority live input below ``shed_salience`` (O(depth), only when full)."""
+        config = self.queue
+        weakest: Optional[QueuedInput] = None
+        sources = [source] if source is not None else list(self._heaps)
+        for name in sources:
+            for _, _, item in self._heaps.get(name, ()):
+                if item.dropped or item.salience >= config.shed_salience:
+                    continue
+                if weakest is None or item.salience - config.age_weight * item.enqueued < (
+                    weakest.salience - config.age_weight * weakest.enqueued
+                ):
+                    weakest = item
+        return weakest
+
+    def _expire(self, now: float) -> None:
+        max_age = self.queue.max_age
+        if max_age is None:
+            return
+        for heap in self._heaps.values():
+            for _, _, item in heap:
+                if not item.dropped and now - item.enqueued > max_age:
+                    self._drop(item)
+                    self.counters["expired"] += 1
+
+    def _drop(self, item: QueuedInput) -> None:
+        """Mark a queued input dropped; its heap entry is skipped later."""
+        item.dropped = True
+        self._remove(item)
+
+    def _remove(self, item: QueuedInput) -> None:
+        self._depth[item.source] -= 1
+        self._size -= 1
+        if self._latest.get((item.source, item.key)) is item:
+            del self._latest[(item.source, item.key)]
+        self._publish()
+        self._wake(self._space_waiters)
+
+    def _publish(self) -> None:
+        if self.proto_self is not None:
+            self.proto_self.observe("queue_depth", self._size)
+
+    @staticmethod
+    def _wake(waiters: Deque[asyncio.Future]) -> None:
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
@@ -17,11 +17,23 @@ class AxisSummary:
 
 
 class BaseAxis(ABC):
-    """Base interface for all awareness axes."""
+    """Base interface for all awareness axes.
+
+    Axes carry a ``version`` counter that implementations bump through
+    :meth:`touch` whenever ``reset`` or ``update_from_input`` changes their
+    state. :class:`~awareness_core.core_state.AwarenessState` caches vectors
+    and summaries per version, so an axis that forgets to call ``touch`` keeps
+    serving its previous values.
+    """
 
     def __init__(self, name: str, dim: int) -> None:
         self.name = name
         self.dim = dim
+        self.version = 0
+
+    def touch(self) -> None:
+        """Mark the axis state as changed."""
+        self.version += 1
 
     @abstractmethod
     def reset(self) -> None:
@@ -35,6 +47,14 @@ class BaseAxis(ABC):
     def to_vector(self) -> List[float]:
         """Export the current axis representation."""
 
+    def get_state(self) -> Dict[str, Any]:
+        """Return JSON-serializable state from which :meth:`set_state` rebuilds the axis."""
+        return {}
+
+    def set_state(self, state: Mapping[str, Any]) -> None:
+        """Restore state produced by :meth:`get_state`."""
+        self.touch()
+
     def summary(self) -> AxisSummary:
         """Return a light summary of axis state."""
         return AxisSummary(name=self.name, dim=self.dim, extras={})
@@ -2,35 +2,70 @@
 
 from __future__ import annotations
 
-import hashlib
 from typing import Any, Dict, List, Mapping, Optional
 
 from .base_axis import BaseAxis, AxisSummary
+from .text_encoder import EncoderStream, HashedNgramEncoder
 
 
 class TextAxis(BaseAxis):
-    """Tracks external and internal text with a simple deterministic embedding."""
+    """Tracks external and internal text with a hashed n-gram embedding.
 
-    def __init__(self, name: str = "text", dim: int = 12) -> None:
+    The vector embeds external and internal text together; each segment's
+    n-gram counts are memoized by the encoder, so updating only one of them
+    re-encodes just that segment. An ``internal_chunk`` feature appends to
+    the internal text through an :class:`EncoderStream`, so a streamed
+    answer is hashed once in total rather than once per chunk.
+    """
+
+    def __init__(self, name: str = "text", dim: int = 12, encoder: Optional[HashedNgramEncoder] = None) -> None:
         super().__init__(name=name, dim=dim)
+        if encoder is not None and encoder.dim != dim:
+            raise ValueError(f"Encoder dim {encoder.dim} does not match axis dim {dim}")
+        self.encoder = encoder or HashedNgramEncoder(dim=dim)
         self.external_text: Optional[str] = None
         self.internal_text: Optional[str] = None
+        # Incremental encoding of internal_text while it is being streamed.
+        self._stream: Optional[EncoderStream] = None
         self._vector: List[float] = [0.0 for _ in range(dim)]
 
     def reset(self) -> None:
         self.external_text = None
         self.internal_text = None
+        self._stream = None
         self._vector = [0.0 for _ in range(self.dim)]
+        self.touch()
 
     def update_from_input(self, features: Mapping[str, Any]) -> None:
         external = features.get("external_text")
         internal = features.get("internal_text")
+        chunk = features.get("internal_chunk")
         if external is not None:
             self.external_text = str(external)
-        if internal is not None:
+        if internal is not None and str(internal) != self.internal_text:
             self.internal_text = str(internal)
-        combined = " ".join(filter(None, [self.external_text, self.internal_text])) or ""
-        self._vector = self._encode_text(combined)
+            self._stream = None
+        if chunk:
+            if self._stream is None:
+                self._stream = self.encoder.stream(self.internal_text or "")
+            self._stream.append(str(chunk))
+            self.internal_text = (self.internal_text or "") + str(chunk)
+        if self._stream is None:
+            self._vector = self.encoder.combine([self.external_text or "", self.internal_text or ""]).tolist()
+        else:
+            raw = self._stream.raw
+            if self.external_text:
+                raw = raw + self.encoder.encode_segment(self.external_text)
+            self._vector = self.encoder.normalize(raw).tolist()
+        self.touch()
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"external_text": self.external_text, "internal_text": self.internal_text}
+
+    def set_state(self, state: Mapping[str, Any]) -> None:
+        self.reset()
+        if state.get("external_text") is not None or state.get("internal_text") is not None:
+            self.update_from_input(state)
 
     def to_vector(self) -> List[float]:
         return list(self._vector)
@@ -44,14 +79,3 @@ class TextAxis(BaseAxis):
                 "internal_text": (self.internal_text[:50] + "...") if self.internal_text and len(self.internal_text) > 53 else self.internal_text,
             },
         )
-
-    def _encode_text(self, text: str) -> List[float]:
-        if not text:
-            return [0.0 for _ in range(self.dim)]
-        digest = hashlib.sha256(text.encode("utf-8")).digest()
-        ints = list(digest)
-        vector: List[float] = []
-        for i in range(self.dim):
-            value = ints[i % len(ints)]
-            vector.append((value / 255.0) * 2 - 1)
-        return vector
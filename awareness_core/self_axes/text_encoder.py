@@ -0,0 +1,279 @@
+"""Hashed character/word n-gram text encoder."""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_PRIME = np.uint64(0x100000001B3)
+_WORD_SALT = np.uint64(0x9E3779B97F4A7C15)
+_WORD = re.compile(r"\w+")
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer; spreads n-gram hashes over all 64 bits."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _salt(kind: int, n: int) -> np.uint64:
+    return _mix(np.array([(kind << 8) | n], dtype=np.uint64))[0]
+
+
+class HashedNgramEncoder:
+    """Feature-hashing encoder over character and word n-grams.
+
+    Characters are hashed as Unicode code points, so CJK text gets useful
+    character uni/bi/tri-grams while Latin text additionally benefits from
+    word n-grams. Each n-gram adds ``+1`` or ``-1`` to one of ``dim`` buckets
+    (signed hashing keeps collisions unbiased). Batches are encoded in one
+    vectorized pass over the concatenated code points. Raw (unnormalized)
+    per-segment vectors are memoized in an LRU so callers combining several
+    segments only pay for the ones that changed.
+    """
+
+    def __init__(
+        self,
+        dim: int = 256,
+        char_ngrams: Sequence[int] = (1, 2, 3),
+        word_ngrams: Sequence[int] = (1, 2),
+        memo_size: int = 1024,
+    ) -> None:
+        if any(n < 1 for n in char_ngrams) or any(n not in (1, 2) for n in word_ngrams):
+            raise ValueError("char_ngrams must be >= 1 and word_ngrams must be 1 or 2")
+        self.dim = dim
+        self.char_ngrams = tuple(char_ngrams)
+        self.word_ngrams = tuple(word_ngrams)
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._char_salts = {n: _salt(1, n) for n in self.char_ngrams}
+        self._word_salts = {n: _salt(2, n) for n in self.word_ngrams}
+
+    def encode(self, text: str) -> np.ndarray:
+        """Return the L2-normalized embedding of one text."""
+        return self.normalize(self.encode_segment(text))
+
+    def encode_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Return L2-normalized embeddings, shape ``[len(texts), dim]``."""
+        return self.normalize(self.encode_raw_batch(texts))
+
+    def encode_segment(self, text: str) -> np.ndarray:
+        """Return the memoized raw (signed count) vector of one segment."""
+        cached = self._memo.get(text)
+        if cached is not None:
+            self._memo.move_to_end(text)
+            return cached
+        raw = self.encode_raw_batch([text])[0]
+        raw.setflags(write=False)
+        self._memo[text] = raw
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return raw
+
+    def prime(self, texts: Sequence[str]) -> None:
+        """Encode the segments of ``texts`` missing from the memo in one batch."""
+        missing = list(dict.fromkeys(text for text in texts if text and text not in self._memo))
+        if not missing:
+            return
+        for text, raw in zip(missing, self.encode_raw_batch(missing)):
+            raw.setflags(write=False)
+            self._memo[text] = raw
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def stream(self, text: str = "") -> "EncoderStream":
+        """Start an incremental encoding of ``text`` that later chunks extend."""
+        stream = EncoderStream(self)
+        stream.append(text)
+        return stream
+
+    def combine(self, segments: Sequence[str]) -> np.ndarray:
+        """Embed the concatenation of segments from their memoized parts."""
+        raw = np.zeros(self.dim, dtype=np.float32)
+        for segment in segments:
+            if segment:
+                raw += self.encode_segment(segment)
+        return self.normalize(raw)
+
+    @staticmethod
+    def normalize(raw: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(raw, axis=-1, keepdims=True)
+        return raw / np.where(norms == 0, 1.0, norms)
+
+    def encode_raw_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Return signed n-gram counts, shape ``[len(texts), dim]``."""
+        batch = len(texts)
+        out = np.zeros(batch * self.dim, dtype=np.float64)
+        if batch == 0:
+            return out.reshape(0, self.dim).astype(np.float32)
+        code_points = [np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32) for text in texts]
+        lengths = np.array([len(cp) for cp in code_points], dtype=np.int64)
+        chars = np.concatenate(code_points).astype(np.uint64) if lengths.sum() else np.zeros(0, np.uint64)
+        owner = np.repeat(np.arange(batch, dtype=np.int64), lengths)
+
+        rows: List[np.ndarray] = []
+        hashes: List[np.ndarray] = []
+        for n, salt in self._char_salts.items():
+            row, value = self._char_features(chars, owner, n, salt)
+            rows.append(row)
+            hashes.append(value)
+        if self.word_ngrams:
+            for row, value in self._word_features(texts, chars, lengths):
+                rows.append(row)
+                hashes.append(value)
+
+        if rows:
+            row = np.concatenate(rows)
+            mixed = _mix(np.concatenate(hashes))
+            bucket = (mixed % np.uint64(self.dim)).astype(np.int64)
+            sign = 1.0 - 2.0 * (mixed >> np.uint64(63)).astype(np.float64)
+            out += np.bincount(row * self.dim + bucket, weights=sign, minlength=batch * self.dim)
+        return out.reshape(batch, self.dim).astype(np.float32)
+
+    @staticmethod
+    def _char_features(
+        chars: np.ndarray, owner: np.ndarray, n: int, salt: np.uint64
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        count = chars.shape[0] - n + 1
+        if count <= 0:
+            return np.zeros(0, np.int64), np.zeros(0, np.uint64)
+        value = np.zeros(count, dtype=np.uint64)
+        for j in range(n):
+            value = value * _PRIME + chars[j : j + count]
+        # Drop n-grams spanning two texts of the batch.
+        same = owner[:count] == owner[n - 1 : n - 1 + count]
+        return owner[:count][same], (value ^ salt)[same]
+
+    def _word_features(
+        self, texts: Sequence[str], chars: np.ndarray, lengths: np.ndarray
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        starts: List[int] = []
+        ends: List[int] = []
+        owners: List[int] = []
+        base = 0
+        for index, text in enumerate(texts):
+            for match in _WORD.finditer(text):
+                starts.append(base + match.start())
+                ends.append(base + match.end())
+                owners.append(index)
+            base += int(lengths[index])
+        if not starts:
+            return []
+        word_start = np.asarray(starts, dtype=np.int64)
+        word_len = np.asarray(ends, dtype=np.int64) - word_start
+        word_owner = np.asarray(owners, dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(word_len)[:-1]))
+        within = np.arange(int(word_len.sum()), dtype=np.int64) - np.repeat(offsets, word_len)
+        positions = np.repeat(word_start, word_len) + within
+        # Position-dependent mixing keeps word hashes order sensitive.
+        per_char = _mix(chars[positions] ^ ((within.astype(np.uint64) + np.uint64(1)) * _WORD_SALT))
+        words = np.add.reduceat(per_char, offsets)
+
+        features: List[Tuple[np.ndarray, np.ndarray]] = []
+        if 1 in self._word_salts:
+            features.append((word_owner, words ^ self._word_salts[1]))
+        if 2 in self._word_salts and words.shape[0] > 1:
+            same = word_owner[:-1] == word_owner[1:]
+            pairs = (words[:-1] * _PRIME + words[1:]) ^ self._word_salts[2]
+            features.append((word_owner[:-1][same], pairs[same]))
+        return features
+
+
+class EncoderStream:
+    """Raw n-gram counts of a growing text, updated per appended chunk.
+
+    Only n-grams touching the new chunk are hashed: character n-grams reuse
+    the last ``max(char_ngrams) - 1`` code points as context, and because a
+    word hash is a position-salted sum over its characters, a word that
+    continues across chunks is extended in place (its old unigram/bigram
+    features are retracted and the extended ones added). :attr:`raw` always
+    equals ``encoder.encode_segment(text)`` for the concatenated text.
+    """
+
+    def __init__(self, encoder: HashedNgramEncoder) -> None:
+        self.encoder = encoder
+        self.raw = np.zeros(encoder.dim, dtype=np.float32)
+        self.length = 0
+        self._counts = np.zeros(encoder.dim, dtype=np.float64)
+        self._context = np.zeros(0, dtype=np.uint64)
+        self._keep = max(encoder.char_ngrams, default=1) - 1
+        # Hash and length of the last word, whether it may continue, and the word before it.
+        self._word: Optional[np.uint64] = None
+        self._word_len = 0
+        self._word_open = False
+        self._previous: Optional[np.uint64] = None
+
+    def append(self, chunk: str) -> np.ndarray:
+        """Add ``chunk`` to the text and return the updated raw vector (do not mutate)."""
+        if not chunk:
+            return self.raw
+        chars = np.frombuffer(chunk.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        rows: List[np.ndarray] = []
+        signs: List[float] = []
+        self._char_features(chars, rows)
+        if self.encoder.word_ngrams:
+            self._word_features(chunk, chars, rows, signs)
+        if rows:
+            mixed = _mix(np.concatenate(rows))
+            bucket = (mixed % np.uint64(self.encoder.dim)).astype(np.int64)
+            sign = 1.0 - 2.0 * (mixed >> np.uint64(63)).astype(np.float64)
+            # Character features are always added; retracted word features carry -1.
+            sign[sign.shape[0] - len(signs) :] *= signs
+            self._counts += np.bincount(bucket, weights=sign, minlength=self.encoder.dim)
+            self.raw = self._counts.astype(np.float32)
+        self.length += len(chunk)
+        return self.raw
+
+    def _char_features(self, chars: np.ndarray, rows: List[np.ndarray]) -> None:
+        context = np.concatenate((self._context, chars))
+        start = self._context.shape[0]
+        for n, salt in self.encoder._char_salts.items():
+            first = max(0, start - n + 1)
+            count = context.shape[0] - n + 1 - first
+            if count <= 0:
+                continue
+            value = np.zeros(count, dtype=np.uint64)
+            for j in range(n):
+                value = value * _PRIME + context[first + j : first + j + count]
+            rows.append(value ^ salt)
+        self._context = context[max(0, context.shape[0] - self._keep) :] if self._keep else context[:0]
+
+    def _word_features(self, chunk: str, chars: np.ndarray, rows: List[np.ndarray], signs: List[float]) -> None:
+        salts = self.encoder._word_salts
+        features: List[np.uint64] = []
+
+        def emit(word: np.uint64, previous: Optional[np.uint64], sign: float) -> None:
+            if 1 in salts:
+                features.append(word ^ salts[1])
+                signs.append(sign)
+            if 2 in salts and previous is not None:
+                features.append((previous * _PRIME + word) ^ salts[2])
+                signs.append(sign)
+
+        matches = list(_WORD.finditer(chunk))
+        with np.errstate(over="ignore"):
+            for index, match in enumerate(matches):
+                begin, end = match.start(), match.end()
+                extend = index == 0 and begin == 0 and self._word_open
+                offset = self._word_len if extend else 0
+                within = np.arange(offset, offset + end - begin, dtype=np.uint64)
+                partial = _mix(chars[begin:end] ^ ((within + np.uint64(1)) * _WORD_SALT)).sum(dtype=np.uint64)
+                if extend:
+                    assert self._word is not None
+                    emit(self._word, self._previous, -1.0)
+                    self._word = self._word + partial
+                    self._word_len += end - begin
+                else:
+                    self._previous = self._word
+                    self._word = partial
+                    self._word_len = end - begin
+                emit(self._word, self._previous, 1.0)
+        self._word_open = bool(matches) and matches[-1].end() == len(chunk)
+        if features:
+            rows.append(np.asarray(features, dtype=np.uint64))
@@ -0,0 +1,267 @@
+"""Autobiographical self graph: episodes clustered online into phases."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..config import AutobiographyConfig
+
+_COLUMNS = (
+    "counts",
+    "visits",
+    "first_step",
+    "last_step",
+    "first_position",
+    "last_position",
+    "first_time",
+    "last_time",
+)
+
+
+@dataclass
+class Phase:
+    """Snapshot of one phase (cluster of similar episodes)."""
+
+    id: int
+    centroid: np.ndarray
+    count: int
+    visits: int
+    first_step: int
+    last_step: int
+    first_position: int
+    last_position: int
+    first_time: float
+    last_time: float
+    tools: Dict[str, int] = field(default_factory=dict)
+
+
+class AutobiographicalGraph:
+    """Phases of the agent's history and the transitions between them.
+
+    Leader clustering over state vectors: an episode close to the current
+    phase's centroid is added to it in O(dim); only when the state leaves
+    the current phase are the (at most ``max_phases``) centroids scanned in
+    one matrix-vector product. Centroids are running means, so nothing is
+    recomputed from the episodic log. Consecutive phases are linked by
+    counted edges, and an inverted index maps tools to the phases that used
+    them. Memory is ``max_phases * dim`` floats plus at most
+    ``max_timeline`` timeline entries.
+    """
+
+    def __init__(self, dim: int, config: Optional[AutobiographyConfig] = None) -> None:
+        self.dim = dim
+        self.config = config or AutobiographyConfig()
+        capacity = self.config.max_phases
+        self._sums = np.zeros((capacity, dim), dtype=np.float64)
+        self.centroids = np.zeros((capacity, dim), dtype=np.float32)
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=np.float64 if name.endswith("_time") else np.int64) for name in _COLUMNS
+        }
+        self._tools: List[Dict[str, int]] = []
+        self._by_tool: Dict[str, Set[int]] = {}
+        # Transition counts, ``edges[src][dst]``.
+        self.edges: Dict[int, Dict[int, int]] = {}
+        # (step, phase) at the newest ``max_timeline`` phase changes.
+        self._timeline: Deque[Tuple[int, int]] = deque(maxlen=self.config.max_timeline)
+        self.current: Optional[int] = None
+        self.events = 0
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def observe(
+        self,
+        vector: Sequence[float],
+        tool: Optional[str] = None,
+        step: Optional[int] = None,
+        position: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> int:
+        """Assign one episode to a phase and return the phase id."""
+        unit = np.asarray(vector, dtype=np.float64)
+        norm = float(np.linalg.norm(unit))
+        if norm > 0:
+            unit = unit / norm
+        step = self.events if step is None else step
+        phase = self._assign(unit)
+        columns = self._columns
+        if phase == len(self._tools):
+            self._tools.append({})
+            for name, value in (("first_step", step), ("first_position", position), ("first_time", timestamp)):
+                columns[name][phase] = -1 if value is None else value
+        if phase != self.current:
+            if self.current is not None:
+                out = self.edges.setdefault(self.current, {})
+                out[phase] = out.get(phase, 0) + 1
+            columns["visits"][phase] += 1
+            self._timeline.append((step, phase))
+            self.current = phase
+        self._sums[phase] += unit
+        total = float(np.linalg.norm(self._sums[phase]))
+        if total > 0:
+            self.centroids[phase] = self._sums[phase] / total
+        columns["counts"][phase] += 1
+        columns["last_step"][phase] = step
+        columns["last_position"][phase] = -1 if position is None else position
+        columns["last_time"][phase] = -1 if timestamp is None else timestamp
+        if tool is not None:
+            tools = self._tools[phase]
+            tools[tool] = tools.get(tool, 0) + 1
+            self._by_tool.setdefault(tool, set()).add(phase)
+        self.events += 1
+        return phase
+
+    def phase(self, phase_id: int) -> Phase:
+        columns = self._columns
+        return Phase(
+            id=phase_id,
+            centroid=self.centroids[phase_id].copy(),
+            count=int(columns["counts"][phase_id]),
+            visits=int(columns["visits"][phase_id]),
+            first_step=int(columns["first_step"][phase_id]),
+            last_step=int(columns["last_step"][phase_id]),
+            first_position=int(columns["first_position"][phase_id]),
+            last_position=int(columns["last_position"][phase_id]),
+            first_time=float(columns["first_time"][phase_id]),
+            last_time=float(columns["last_time"][phase_id]),
+            tools=dict(self._tools[phase_id]),
+        )
+
+    def phases(self) -> List[Phase]:
+        return [self.phase(phase_id) for phase_id in range(len(self))]
+
+    def phases_with_tool(self, tool: str) -> List[Phase]:
+        """Phases in which ``tool`` answered, most recent first."""
+        found = self._by_tool.get(tool, ())
+        last = self._columns["last_step"]
+        return [self.phase(phase_id) for phase_id in sorted(found, key=lambda p: -last[p])]
+
+    def most_recent_like(self, vector: Sequence[float], min_similarity: Optional[float] = None) -> Optional[Phase]:
+        """The most recently active phase within ``min_similarity`` (default: the threshold) of ``vector``."""
+        if not len(self):
+            return None
+        threshold = self.config.threshold if min_similarity is None else min_similarity
+        scores = self._similarities(vector)
+        candidates = np.flatnonzero(scores >= threshold)
+        if candidates.size == 0:
+            return None
+        last = self._columns["last_step"][candidates]
+        return self.phase(int(candidates[np.argmax(last)]))
+
+    def nearest(self, vector: Sequence[float], k: int = 3) -> List[Tuple[Phase, float]]:
+        """The ``k`` phases most similar to ``vector``."""
+        if not len(self):
+            return []
+        scores = self._similarities(vector)
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.phase(int(index)), float(scores[index])) for index in top]
+
+    def successors(self, phase_id: int) -> Dict[int, int]:
+        """Phases entered right after ``phase_id``, with transition counts."""
+        return dict(self.edges.get(phase_id, {}))
+
+    def timeline(self) -> List[Tuple[int, int]]:
+        """``(step, phase)`` at the newest ``max_timeline`` phase changes, oldest first."""
+        return list(self._timeline)
+
+    def get_state(self) -> Dict[str, Any]:
+        count = len(self)
+        edges = [(src, dst, n) for src, out in self.edges.items() for dst, n in out.items()]
+        return {
+            "sums": self._sums[:count],
+            "columns": {name: column[:count] for name, column in self._columns.items()},
+            "tools": self._tools,
+            "edges": np.array(edges, dtype=np.int64).reshape(-1, 3),
+            "timeline": np.array(self._timeline, dtype=np.int64).reshape(-1, 2),
+            "current": self.current,
+            "events": self.events,
+        }
+
+    def set_state(self, state: Mapping[str, Any]) -> None:
+        sums = np.asarray(state["sums"], dtype=np.float64)
+        count = sums.shape[0]
+        if count > self.config.max_phases or (count and sums.shape[1] != self.dim):
+            raise ValueError(f"autobiography state {sums.shape} does not fit ({self.config.max_phases}, {self.dim})")
+        self._sums[:] = 0.0
+        self._sums[:count] = sums
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        self.centroids[:] = 0.0
+        self.centroids[:count] = sums / np.where(norms == 0, 1.0, norms)
+        for name, column in self._columns.items():
+            column[:] = 0
+            column[:count] = state["columns"][name]
+        self._tools = [dict(tools) for tools in state["tools"]]
+        self._by_tool = {}
+        for phase_id, tools in enumerate(self._tools):
+            for tool in tools:
+                self._by_tool.setdefault(tool, set()).add(phase_id)
+        self.edges = {}
+        for src, dst, n in np.asarray(state["edges"]).reshape(-1, 3):
+            self.edges.setdefault(int(src), {})[int(dst)] = int(n)
+        self._timeline = deque(
+            ((int(step), int(phase)) for step, phase in np.asarray(state["timeline"]).reshape(-1, 2)),
+            maxlen=self.config.max_timeline,
+        )
+        self.current = state["current"]
+        self.events = int(state["events"])
+
+    def save(self, path: Path) -> None:
+        """Write the graph to ``path`` (``.npz``) atomically."""
+        state = self.get_state()
+        arrays = {f"column_{name}": column for name, column in state.pop("columns").items()}
+        arrays["sums"] = state.pop("sums")
+        arrays["edges"] = state.pop("edges")
+        arrays["timeline"] = state.pop("timeline")
+        meta = json.dumps({"dim": self.dim, **state}, ensure_ascii=False)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez_compressed(f, meta=np.frombuffer(meta.encode("utf-8"), dtype=np.uint8), **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, config: Optional[AutobiographyConfig] = None) -> "AutobiographicalGraph":
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes())
+            state: Dict[str, Any] = {
+                "sums": data["sums"],
+                "columns": {name: data[f"column_{name}"] for name in _COLUMNS},
+                "edges": data["edges"],
+                "timeline": data["timeline"],
+                "tools": meta["tools"],
+                "current": meta["current"],
+                "events": meta["events"],
+            }
+            graph = cls(meta["dim"], config)
+            graph.set_state(state)
+        return graph
+
+    def _assign(self, unit: np.ndarray) -> int:
+        count = len(self)
+        threshold = self.config.threshold
+        current = self.current
+        if current is not None and float(self.centroids[current] @ unit) >= threshold:
+            return current
+        if count == 0:
+            return 0
+        scores = self.centroids[:count] @ unit.astype(np.float32)
+        best = int(np.argmax(scores))
+        if scores[best] >= threshold or count >= self.config.max_phases:
+            return best
+        return count
+
+    def _similarities(self, vector: Sequence[float]) -> np.ndarray:
+        unit = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(unit))
+        if norm > 0:
+            unit = unit / norm
+        return self.centroids[: len(self)] @ unit
@@ -0,0 +1,202 @@
+"""Local asyncio HTTP / stdio front end for :class:`SessionManager`.
+
+HTTP (keep-alive, JSON bodies)::
+
+    POST /sessions/<id>/step   {"text": "..."}  ->  {"session", "answer", "metadata"}
+    GET  /stats                                 ->  SessionManager statistics
+
+stdio: one JSON object per line, ``{"session": "<id>", "text": "...", "id": any}``;
+responses are written as JSON lines (echoing ``id``) as soon as each step finishes.
+
+Usage::
+
+    python -m awareness_core.session_server --root data/sessions --http 127.0.0.1:8080
+    python -m awareness_core.session_server --root data/sessions --stdio
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .config import CoreConfig
+from .sessions import SessionManager
+from .tools.base_tool import ToolResult
+from .tools.llm_tool import LLMTool
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _result_payload(session_id: str, result: Optional[ToolResult]) -> Dict[str, Any]:
+    return {
+        "session": session_id,
+        "answer": result.content if result is not None else None,
+        "metadata": result.metadata if result is not None else {},
+    }
+
+
+def _parse_text(request: Any) -> Optional[str]:
+    """The ``text`` field of a request object; ``ValueError`` if malformed."""
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    text = request.get("text")
+    if text is not None and not isinstance(text, str):
+        raise ValueError("text must be a string")
+    return text
+
+
+class SessionServer:
+    """Routes HTTP requests and stdio lines to a :class:`SessionManager`."""
+
+    def __init__(self, manager: SessionManager, sweep_interval: Optional[float] = None) -> None:
+        self.manager = manager
+        self.sweep_interval = sweep_interval or max(1.0, min(manager.idle_timeout / 2, 30.0))
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+        if parts == ["stats"]:
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, self.manager.snapshot_stats()
+        if len(parts) == 3 and parts[0] == "sessions" and parts[2] == "step":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                text = _parse_text(json.loads(body or b"{}"))
+                self.manager.session_dir(parts[1])
+            except ValueError as exc:
+                return 400, {"error": str(exc)}
+            result = await self.manager.step(parts[1], text)
+            return 200, _result_payload(parts[1], result)
+        return 404, {"error": f"no route for {path}"}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, version = (lines[0].split(" ") + ["", "", ""])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0") or 0))
+                try:
+                    status, payload = await self.handle(method, path, body)
+                    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                except Exception as exc:  # noqa: BLE001 - reported to the client
+                    status = 500
+                    data = json.dumps({"error": repr(exc)}, ensure_ascii=False).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_http(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        print(f"[sessions] listening on http://{host}:{port}", file=sys.stderr)
+        async with server:
+            await asyncio.gather(server.serve_forever(), self._sweep())
+
+    async def serve_stdio(self) -> None:
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        sweeper = asyncio.create_task(self._sweep())
+        tasks = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                task = asyncio.create_task(self._stdio_line(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        sweeper.cancel()
+
+    async def _stdio_line(self, line: bytes) -> None:
+        request: Any = {}
+        response: Dict[str, Any]
+        try:
+            request = json.loads(line)
+            text = _parse_text(request)
+            session_id = str(request["session"])
+            self.manager.session_dir(session_id)
+        except (ValueError, KeyError) as exc:
+            response = {"error": str(exc)}
+        else:
+            try:
+                response = _result_payload(session_id, await self.manager.step(session_id, text))
+            except Exception as exc:  # noqa: BLE001 - reported to the client
+                response = {"error": repr(exc)}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        try:
+            data = json.dumps(response, ensure_ascii=False)
+        except (TypeError, ValueError) as exc:
+            data = json.dumps({"error": repr(exc), "id": response.get("id")}, ensure_ascii=False)
+        sys.stdout.write(data + "\n")
+        sys.stdout.flush()
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.manager.evict_idle()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve awareness loop sessions over HTTP or stdio.")
+    parser.add_argument("--root", type=Path, default=Path("data/sessions"))
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--http", metavar="HOST:PORT")
+    mode.add_argument("--stdio", action="store_true")
+    parser.add_argument("--max-resident", type=int, default=1024)
+    parser.add_argument("--idle-timeout", type=float, default=300.0)
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    manager = SessionManager(
+        CoreConfig(),
+        LLMTool(),
+        args.root,
+        max_resident=args.max_resident,
+        idle_timeout=args.idle_timeout,
+        pool_size=args.pool_size,
+    )
+    server = SessionServer(manager)
+    try:
+        if args.stdio:
+            asyncio.run(server.serve_stdio())
+        else:
+            host, _, port = args.http.rpartition(":")
+            asyncio.run(server.serve_http(host or "127.0.0.1", int(port)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Hosting many awareness loop sessions in one process."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .async_loop import AsyncAwarenessLoop
+from .config import CoreConfig
+from .integration.text_input_adapter import TextInputAdapter
+from .memory.episodic_memory import EpisodicMemory
+from .proto_self import ProtoSelf
+from .question_generator import QuestionGenerator
+from .scheduler import Scheduler
+from .self_axes.text_axis import TextAxis
+from .self_axes.text_encoder import HashedNgramEncoder
+from .tools.async_tool import AsyncBaseTool, as_async_tool
+from .tools.base_tool import BaseTool, ToolResult
+from .tools.limited_tool import find_limiters
+
+_SESSION_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}")
+
+
+class SessionManager:
+    """Serves one :class:`AsyncAwarenessLoop` per session id.
+
+    The scheduler, question generator, text adapter, proto-self, text encoder
+    (and its memo) and the tool's worker pool are shared by all sessions, so
+    a resident session only owns its axes, a ``max_history``-frame history
+    and its episodic store. With ``config.input_queue`` each session gets
+    its own :class:`PriorityScheduler` instead, so queued inputs stay per
+    session. Each session writes its own episodic shard under
+    ``root/<xx>/<session_id>/``. At most ``max_resident`` sessions stay in
+    memory: the least recently used one, and any idle for ``idle_timeout``
+    seconds (see :meth:`evict_idle`), is snapshotted to its shard directory
+    with :meth:`AwarenessLoop.snapshot` and restored lazily on its next
+    input, frame history included. A resident session keeps its episodic
+    log and index open for appending, so size ``max_resident`` to the
+    process's file descriptor limit.
+    """
+
+    def __init__(
+        self,
+        config: CoreConfig,
+        tool: BaseTool | AsyncBaseTool,
+        root: Path,
+        max_resident: int = 1024,
+        idle_timeout: float = 300.0,
+        max_history: int = 8,
+        pool_size: int = 8,
+        proto_self: Optional[ProtoSelf] = None,
+    ) -> None:
+        # Frame stores are per process, not per session.
+        self.config = replace(config, max_history=max_history, memory=replace(config.memory, frame_store_path=None))
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_resident = max_resident
+        self.idle_timeout = idle_timeout
+        self.async_tool = as_async_tool(tool, max_workers=pool_size)
+        # Input queues are per session; a plain Scheduler is stateless and shared.
+        self.scheduler: Optional[Scheduler] = None
+        if self.config.input_queue is None:
+            self.scheduler = Scheduler(config=self.config, limiters=find_limiters(tool))
+        self.question_generator = QuestionGenerator()
+        self.text_adapter = TextInputAdapter()
+        self.proto_self = proto_self or ProtoSelf()
+        self.encoder = HashedNgramEncoder(dim=self.config.axis("text").dim)
+        self._sessions: "OrderedDict[str, AsyncAwarenessLoop]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._busy: Dict[str, int] = {}
+        self.stats: Dict[str, int] = {"steps": 0, "created": 0, "restored": 0, "evicted": 0}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def session_dir(self, session_id: str) -> Path:
+        if not _SESSION_ID.fullmatch(session_id):
+            raise ValueError(f"Invalid session id {session_id!r}")
+        shard = hashlib.sha1(session_id.encode("utf-8")).hexdigest()[:2]
+        return self.root / shard / session_id
+
+    def get(self, session_id: str) -> AsyncAwarenessLoop:
+        """Return the resident loop for ``session_id``, restoring or creating it."""
+        loop = self._sessions.get(session_id)
+        if loop is not None:
+            self._sessions.move_to_end(session_id)
+            return loop
+        directory = self.session_dir(session_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        memory = EpisodicMemory.from_config(replace(self.config.memory, episodic_path=directory / "episodic.jsonl"))
+        text = self.config.axis("text")
+        loop = AsyncAwarenessLoop(
+            config=self.config,
+            tool=self.async_tool,
+            memory=memory,
+            proto_self=self.proto_self,
+            text_axis=TextAxis(name=text.name, dim=text.dim, encoder=self.encoder),
+            max_in_flight=1,
+            scheduler=self.scheduler,
+            question_generator=self.question_generator,
+            text_adapter=self.text_adapter,
+        )
+        snapshot = directory / "session.snap"
+        if snapshot.exists():
+            loop.restore(snapshot)
+            self.stats["restored"] += 1
+        else:
+            self.stats["created"] += 1
+        self._sessions[session_id] = loop
+        self._last_used[session_id] = time.monotonic()
+        self._evict_overflow(keep=session_id)
+        return loop
+
+    async def step(self, session_id: str, text: Optional[str]) -> Optional[ToolResult]:
+        """Feed one input to a session; steps of one session run in order."""
+        loop = self.get(session_id)
+        self._busy[session_id] = self._busy.get(session_id, 0) + 1
+        try:
+            return await loop.step(text)
+        finally:
+            self._busy[session_id] -= 1
+            if not self._busy[session_id]:
+                del self._busy[session_id]
+            self._last_used[session_id] = time.monotonic()
+            self.stats["steps"] += 1
+            self._evict_overflow(keep=session_id)
+
+    def evict(self, session_id: str) -> bool:
+        """Snapshot and unload a session; busy sessions are left alone."""
+        loop = self._sessions.get(session_id)
+        if loop is None or session_id in self._busy:
+            return False
+        loop.snapshot(self.session_dir(session_id) / "session.snap")
+        loop.close()
+        loop.memory.close()
+        del self._sessions[session_id]
+        self._last_used.pop(session_id, None)
+        self.stats["evicted"] += 1
+        return True
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Evict sessions unused for ``idle_timeout`` seconds."""
+        now = time.monotonic() if now is None else now
+        idle = [sid for sid, used in self._last_used.items() if now - used >= self.idle_timeout]
+        return [sid for sid in idle if self.evict(sid)]
+
+    def close(self) -> None:
+        """Snapshot every resident session and release the tool pool."""
+        for session_id in list(self._sessions):
+            self.evict(session_id)
+        self.async_tool.close()
+
+    def snapshot_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.stats)
+        stats["resident"] = len(self._sessions)
+        stats["busy"] = len(self._busy)
+        return stats
+
+    def _evict_overflow(self, keep: str) -> None:
+        if len(self._sessions) <= self.max_resident:
+            return
+        for session_id in list(self._sessions):
+            if len(self._sessions) <= self.max_resident:
+                break
+            if session_id != keep:
+                self.evict(session_id)
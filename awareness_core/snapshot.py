@@ -0,0 +1,206 @@
+"""Versioned binary snapshots of awareness loop state."""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .loop import AwarenessLoop
+
+MAGIC = b"AWSN"
+VERSION = 1
+_PREFIX = struct.Struct("<4sII")  # magic, version, header length
+_ALIGN = 64
+_SECTION_KEY = "__section__"
+
+
+@dataclass
+class SnapshotInfo:
+    """What :func:`read_snapshot` restored."""
+
+    version: int
+    created: float
+    step: int
+    frames: int
+    # Events the snapshot saw that the episodic log no longer holds.
+    memory_lag: int
+
+
+class _SectionWriter:
+    """Collects arrays and blobs into aligned binary sections."""
+
+    def __init__(self) -> None:
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.payloads: List[bytes] = []
+        self.size = 0
+
+    def add(self, name: str, data: bytes, dtype: str = "u1", shape: Tuple[int, ...] = ()) -> Dict[str, str]:
+        padding = -self.size % _ALIGN
+        if padding:
+            self.payloads.append(b"\0" * padding)
+            self.size += padding
+        self.sections[name] = {"offset": self.size, "nbytes": len(data), "dtype": dtype, "shape": list(shape or (len(data),))}
+        self.payloads.append(data)
+        self.size += len(data)
+        return {_SECTION_KEY: name}
+
+    def add_array(self, name: str, array: np.ndarray) -> Dict[str, str]:
+        array = np.ascontiguousarray(array)
+        return self.add(name, array.tobytes(), array.dtype.str, array.shape)
+
+    def encode(self, prefix: str, value: Any) -> Any:
+        """Replace arrays nested in ``value`` by section references."""
+        if isinstance(value, np.ndarray):
+            return self.add_array(prefix, value)
+        if isinstance(value, dict):
+            return {key: self.encode(f"{prefix}.{key}", item) for key, item in value.items()}
+        return value
+
+
+def write_snapshot(loop: "AwarenessLoop", path: Path) -> None:
+    """Write ``loop``'s state to ``path`` atomically."""
+    writer = _SectionWriter()
+    state = loop.state
+    history = state.history.export()
+    header: Dict[str, Any] = {
+        "created": time.time(),
+        "step": state.step,
+        "axes": writer.encode("axes", {name: axis.get_state() for name, axis in state.axes.items()}),
+        "loop": {
+            "tool_calls": loop.tool_calls,
+            "answered_internally": loop.answered_internally,
+            "skips_in_row": loop._skips_in_row,
+        },
+        "tool": writer.encode("tool", loop.tool.get_state()) if hasattr(loop.tool, "get_state") else None,
+        "world_model": writer.encode("world_model", loop.world_model.get_state()) if loop.world_model is not None else None,
+        "autobiography": (
+            writer.encode("autobiography", loop.autobiography.get_state()) if loop.autobiography is not None else None
+        ),
+        "memory": {"next_position": loop.memory.next_position},
+        "history": {
+            "max_history": state.history.max_history,
+            "head": history["head"],
+            "size": history["size"],
+            "steps": writer.add_array("history.steps", history["steps"]),
+            "timestamps": writer.add_array("history.timestamps", history["timestamps"]),
+            "vectors": {name: writer.add_array(f"history.vectors.{name}", block) for name, block in history["vectors"].items()},
+            "side": writer.add(
+                "history.side",
+                json.dumps([history["summaries"], history["meta"]], ensure_ascii=False).encode("utf-8"),
+            ),
+        },
+    }
+    header["sections"] = writer.sections
+    body = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = -(-(_PREFIX.size + len(body)) // _ALIGN) * _ALIGN
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, data_start))
+        f.write(body)
+        f.write(b"\0" * (data_start - _PREFIX.size - len(body)))
+        for payload in writer.payloads:
+            f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(loop: "AwarenessLoop", path: Path) -> SnapshotInfo:
+    """Restore ``loop`` from ``path``.
+
+    Only the small JSON header is parsed eagerly. Arrays (frame history,
+    world model) are copy-on-write memory maps paged in on access, and frame
+    summaries/meta are decoded the first time a frame is materialized, so the
+    cost does not grow with history size.
+    """
+    with path.open("rb") as f:
+        magic, version, data_start = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an awareness snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+        header = json.loads(f.read(data_start - _PREFIX.size).rstrip(b"\0"))
+    sections = header["sections"]
+
+    def section(name: str) -> np.ndarray:
+        spec = sections[name]
+        shape = tuple(spec["shape"])
+        if spec["nbytes"] == 0:
+            return np.zeros(shape, dtype=np.dtype(spec["dtype"]))
+        mapped = np.memmap(path, dtype=np.dtype(spec["dtype"]), mode="c", offset=data_start + spec["offset"], shape=shape)
+        return np.asarray(mapped)
+
+    def decode(value: Any) -> Any:
+        if isinstance(value, dict):
+            if set(value) == {_SECTION_KEY}:
+                return section(value[_SECTION_KEY])
+            return {key: decode(item) for key, item in value.items()}
+        return value
+
+    state = loop.state
+    state.step = header["step"]
+    for name, axis_state in decode(header["axes"]).items():
+        if name in state.axes:
+            state.axes[name].set_state(axis_state)
+    counters = header["loop"]
+    loop.tool_calls = counters["tool_calls"]
+    loop.answered_internally = counters["answered_internally"]
+    loop._skips_in_row = counters["skips_in_row"]
+    if header["tool"] is not None and hasattr(loop.tool, "set_state"):
+        loop.tool.set_state(decode(header["tool"]))
+    if header["world_model"] is not None and loop.world_model is not None:
+        loop.world_model.set_state(decode(header["world_model"]))
+    if header.get("autobiography") is not None and loop.autobiography is not None:
+        loop.autobiography.set_state(decode(header["autobiography"]))
+
+    saved = header["history"]
+    vectors = {name: decode(ref) for name, ref in saved["vectors"].items() if name in state.axes}
+    side = decode(saved["side"])
+    loader: Callable[[], Tuple[List[Any], List[Any]]] = lambda: tuple(json.loads(side.tobytes()))  # type: ignore[assignment,return-value]
+    history = state.history
+    if saved["max_history"] == history.max_history:
+        history.adopt(saved["head"], saved["size"], decode(saved["steps"]), decode(saved["timestamps"]), vectors, loader)
+    else:
+        _replay_history(history, saved, vectors, decode(saved["steps"]), decode(saved["timestamps"]), loader)
+
+    memory_lag = max(0, header["memory"]["next_position"] - loop.memory.next_position)
+    return SnapshotInfo(
+        version=version,
+        created=header["created"],
+        step=header["step"],
+        frames=len(history),
+        memory_lag=memory_lag,
+    )
+
+
+def _replay_history(
+    history: Any,
+    saved: Dict[str, Any],
+    vectors: Dict[str, np.ndarray],
+    steps: np.ndarray,
+    timestamps: np.ndarray,
+    loader: Callable[[], Tuple[List[Any], List[Any]]],
+) -> None:
+    """Copy the newest frames into a history of a different capacity."""
+    capacity = saved["max_history"]
+    summaries, meta = loader()
+    history.clear()
+    stop = saved["head"] + capacity
+    for row in range(stop - min(saved["size"], history.max_history), stop):
+        slot = row % capacity
+        history.append(
+            step=int(steps[row]),
+            timestamp=float(timestamps[row]),
+            vectors={name: block[row] for name, block in vectors.items()},
+            summaries=summaries[slot] or {},
+            meta=meta[slot],
+        )
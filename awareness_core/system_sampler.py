@@ -0,0 +1,178 @@
+"""Background sampler of process/system metrics for the proto-self."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_SLOTS: Tuple[str, ...] = ("cpu", "rss", "load", "fds", "queue_depth", "tool_latency")
+
+
+class SystemSampler:
+    """Samples ``/proc`` on a daemon thread into a fixed-size ring buffer.
+
+    Each tick reads process CPU share, RSS (fraction of ``MemTotal``), 1-min
+    load per core and open file descriptors (fraction of the soft limit), and
+    copies the latest pushed gauges such as ``queue_depth`` and
+    ``tool_latency``. Every value is normalized to ``[0, 1]``. After each tick
+    the smoothed vector (EWMA, or the mean of the ring window) is published
+    by reference, so :meth:`latest` is a non-blocking O(dim) read. Probes that
+    are unavailable on the platform report ``0``.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        window: int = 64,
+        alpha: float = 0.3,
+        smoothing: str = "ewma",
+        slots: Sequence[str] = DEFAULT_SLOTS,
+        gauge_scales: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        if smoothing not in ("ewma", "window"):
+            raise ValueError(f"Unknown smoothing {smoothing!r}; expected 'ewma' or 'window'")
+        self.interval = interval
+        self.alpha = alpha
+        self.smoothing = smoothing
+        self.slots = tuple(slots)
+        self.slot_index = {name: i for i, name in enumerate(self.slots)}
+        # Raw gauge value mapped to 1.0 (e.g. 64 queued inputs, 10 s latency).
+        self.gauge_scales: Dict[str, float] = {"queue_depth": 64.0, "tool_latency": 10.0}
+        self.gauge_scales.update(gauge_scales or {})
+        self._ring = np.zeros((window, len(self.slots)), dtype=np.float64)
+        self._sum = np.zeros(len(self.slots), dtype=np.float64)
+        self._head = 0
+        self._filled = 0
+        self._ewma: Optional[np.ndarray] = None
+        self._latest = np.zeros(len(self.slots), dtype=np.float64)
+        self._gauges: Dict[str, float] = {}
+        self._probes: Dict[str, Callable[[], float]] = {
+            "cpu": self._cpu,
+            "rss": self._rss,
+            "load": self._load,
+            "fds": self._fds,
+        }
+        self._cpu_count = os.cpu_count() or 1
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._mem_total = self._read_mem_total()
+        self._fd_limit = self._read_fd_limit()
+        self._last_cpu: Optional[Tuple[float, float]] = None
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SystemSampler":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="system-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SystemSampler":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Push an application gauge; picked up on the next tick."""
+        self._gauges[name] = value
+
+    def latest(self) -> np.ndarray:
+        """Return the smoothed slot vector published by the last tick (do not mutate)."""
+        return self._latest
+
+    def value(self, name: str) -> float:
+        index = self.slot_index.get(name)
+        return 0.0 if index is None else float(self._latest[index])
+
+    def sample_once(self) -> np.ndarray:
+        """Take one sample synchronously and publish the smoothed values."""
+        row = np.zeros(len(self.slots), dtype=np.float64)
+        for i, name in enumerate(self.slots):
+            probe = self._probes.get(name)
+            if probe is not None:
+                try:
+                    raw = probe()
+                except (OSError, ValueError):
+                    raw = 0.0
+            else:
+                raw = self._gauges.get(name, 0.0) / self.gauge_scales.get(name, 1.0)
+            row[i] = min(1.0, max(0.0, raw))
+        self._push(row)
+        return row
+
+    def _push(self, row: np.ndarray) -> None:
+        window = self._ring.shape[0]
+        if self._filled == window:
+            self._sum -= self._ring[self._head]
+        else:
+            self._filled += 1
+        self._ring[self._head] = row
+        self._sum += row
+        self._head = (self._head + 1) % window
+        if self._ewma is None:
+            self._ewma = row.copy()
+        else:
+            self._ewma = (1 - self.alpha) * self._ewma + self.alpha * row
+        smoothed = self._ewma if self.smoothing == "ewma" else self._sum / self._filled
+        # Publish a fresh array so readers never observe a partial update.
+        self._latest = smoothed.copy()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample_once()
+            self._stop.wait(self.interval)
+
+    def _cpu(self) -> float:
+        with open("/proc/self/stat", "rb") as f:
+            fields = f.read().rsplit(b")", 1)[1].split()
+        busy = (int(fields[11]) + int(fields[12])) / self._clock_ticks
+        now = time.monotonic()
+        last, self._last_cpu = self._last_cpu, (busy, now)
+        if last is None or now <= last[1]:
+            return 0.0
+        return (busy - last[0]) / (now - last[1]) / self._cpu_count
+
+    def _rss(self) -> float:
+        with open("/proc/self/statm", "rb") as f:
+            resident = int(f.read().split()[1])
+        return resident * self._page_size / self._mem_total if self._mem_total else 0.0
+
+    def _load(self) -> float:
+        with open("/proc/loadavg", "rb") as f:
+            return float(f.read().split()[0]) / self._cpu_count
+
+    def _fds(self) -> float:
+        return len(os.listdir("/proc/self/fd")) / self._fd_limit if self._fd_limit else 0.0
+
+    @staticmethod
+    def _read_mem_total() -> float:
+        try:
+            with open("/proc/meminfo", "rb") as f:
+                for line in f:
+                    if line.startswith(b"MemTotal:"):
+                        return float(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0.0
+
+    @staticmethod
+    def _read_fd_limit() -> float:
+        try:
+            import resource
+
+            soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+            return float(soft) if soft > 0 else 0.0
+        except (ImportError, ValueError, OSError):
+            return 0.0
@@ -0,0 +1,110 @@
+"""Async tool interface and an executor adapter for sync tools."""
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
+
+from .base_tool import BaseTool, ToolQuery, ToolResult
+
+_DONE = object()
+
+
+class AsyncToolStream:
+    """Async counterpart of :class:`~awareness_core.tools.base_tool.ToolStream`."""
+
+    def __init__(self, chunks: AsyncIterable[str], metadata: Optional[Dict[str, Any]] = None, raw: Any = None) -> None:
+        self._chunks = chunks.__aiter__()
+        self.metadata: Dict[str, Any] = metadata if metadata is not None else {}
+        self.raw = raw
+        self.parts: List[str] = []
+
+    @classmethod
+    def of(cls, result: ToolResult) -> "AsyncToolStream":
+        """A single-chunk stream for a complete result."""
+
+        async def single() -> AsyncIterator[str]:
+            yield result.content
+
+        return cls(single(), metadata=result.metadata, raw=result.raw)
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self
+
+    async def __anext__(self) -> str:
+        chunk = await self._chunks.__anext__()
+        self.parts.append(chunk)
+        return chunk
+
+    async def result(self) -> ToolResult:
+        async for _ in self:
+            pass
+        return ToolResult(content="".join(self.parts), raw=self.raw, metadata=self.metadata)
+
+
+class AsyncBaseTool(ABC):
+    """Abstract interface for tools that can be awaited."""
+
+    name: str = "async_base"
+    description: str = "abstract async tool"
+
+    @abstractmethod
+    async def acall(self, query: ToolQuery) -> ToolResult:
+        """Execute the tool with the provided query."""
+        raise NotImplementedError
+
+    async def astream(self, query: ToolQuery) -> AsyncToolStream:
+        """Answer ``query`` as chunks; the default yields the whole :meth:`acall` answer once."""
+        return AsyncToolStream.of(await self.acall(query))
+
+    def close(self) -> None:
+        """Release resources held by the tool."""
+
+
+class SyncToolAdapter(AsyncBaseTool):
+    """Runs a blocking :class:`BaseTool` in a bounded thread pool.
+
+    At most ``max_workers`` calls run at once; further calls queue in the
+    executor. Cancelling an ``acall`` stops waiting for the result but cannot
+    interrupt a ``call`` already running in a worker thread.
+    """
+
+    def __init__(self, tool: BaseTool, max_workers: int = 4, executor: Optional[ThreadPoolExecutor] = None) -> None:
+        self.tool = tool
+        self.name = tool.name
+        self.description = tool.description
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"tool-{tool.name}"
+        )
+
+    async def acall(self, query: ToolQuery) -> ToolResult:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.tool.call, query)
+
+    async def astream(self, query: ToolQuery) -> AsyncToolStream:
+        """Pull the sync tool's stream chunk by chunk on the worker pool."""
+        loop = asyncio.get_running_loop()
+        stream = await loop.run_in_executor(self._executor, self.tool.stream, query)
+
+        async def chunks() -> AsyncIterator[str]:
+            while True:
+                chunk = await loop.run_in_executor(self._executor, next, stream, _DONE)
+                if chunk is _DONE:
+                    return
+                yield chunk
+
+        return AsyncToolStream(chunks(), metadata=stream.metadata, raw=stream.raw)
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def as_async_tool(tool: BaseTool | AsyncBaseTool, max_workers: int = 4) -> AsyncBaseTool:
+    """Return ``tool`` unchanged if it is async, otherwise wrap it."""
+    if isinstance(tool, AsyncBaseTool):
+        return tool
+    return SyncToolAdapter(tool, max_workers=max_workers)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
 
 @dataclass
@@ -24,6 +24,39 @@ class ToolResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+class ToolStream:
+    """An answer arriving in text chunks.
+
+    Iterating yields the chunks in order; :meth:`result` drains whatever is
+    left and returns the collected :class:`ToolResult`. Tools may fill
+    ``metadata`` in place while streaming (e.g. token usage at the end).
+    """
+
+    def __init__(self, chunks: Iterable[str], metadata: Optional[Dict[str, Any]] = None, raw: Any = None) -> None:
+        self._chunks = iter(chunks)
+        self.metadata: Dict[str, Any] = metadata if metadata is not None else {}
+        self.raw = raw
+        self.parts: List[str] = []
+
+    @classmethod
+    def of(cls, result: ToolResult) -> "ToolStream":
+        """A single-chunk stream for a complete result."""
+        return cls([result.content], metadata=result.metadata, raw=result.raw)
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        chunk = next(self._chunks)
+        self.parts.append(chunk)
+        return chunk
+
+    def result(self) -> ToolResult:
+        for _ in self:
+            pass
+        return ToolResult(content="".join(self.parts), raw=self.raw, metadata=self.metadata)
+
+
 class BaseTool(ABC):
     """Abstract interface for all tools."""
 
@@ -34,3 +67,30 @@ class BaseTool(ABC):
     def call(self, query: ToolQuery) -> ToolResult:
         """Execute the tool with the provided query."""
         raise NotImplementedError
+
+    def call_batch(self, queries: Sequence[ToolQuery]) -> List[ToolResult]:
+        """Execute several queries; results align with ``queries``.
+
+        Backends that are cheaper per query when batched should override this;
+        the default simply calls :meth:`call` for each query in order.
+        """
+        return [self.call(query) for query in queries]
+
+    def stream(self, query: ToolQuery) -> ToolStream:
+        """Answer ``query`` as a stream of chunks.
+
+        The default calls :meth:`call` and yields the whole answer as one
+        chunk; streaming backends should subclass :class:`StreamingTool`.
+        """
+        return ToolStream.of(self.call(query))
+
+
+class StreamingTool(BaseTool):
+    """Base for tools that natively stream; :meth:`call` collects the stream."""
+
+    @abstractmethod
+    def stream(self, query: ToolQuery) -> ToolStream:
+        raise NotImplementedError
+
+    def call(self, query: ToolQuery) -> ToolResult:
+        return self.stream(query).result()
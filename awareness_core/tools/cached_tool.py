@@ -0,0 +1,252 @@
+"""Response cache wrapping any tool, keyed by normalized questions."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .base_tool import BaseTool, ToolQuery, ToolResult
+
+NormalizationRule = Callable[[str], str]
+
+# Matches the suffix QuestionGenerator appends, e.g. "（不确定度=0.37）".
+_UNCERTAINTY = re.compile(r"\s*[（(]\s*不确定度\s*=\s*([0-9.]+)\s*[）)]")
+
+
+def collapse_whitespace(text: str) -> str:
+    """Trim and collapse runs of whitespace."""
+    return " ".join(text.split())
+
+
+def casefold(text: str) -> str:
+    """Case-insensitive matching for Latin text."""
+    return text.casefold()
+
+
+def drop_uncertainty(text: str) -> str:
+    """Remove the uncertainty suffix entirely."""
+    return _UNCERTAINTY.sub("", text)
+
+
+def bucket_uncertainty(width: float = 0.25) -> NormalizationRule:
+    """Return a rule that rounds the uncertainty value down to ``width`` buckets."""
+
+    def rule(text: str) -> str:
+        def repl(match: re.Match) -> str:
+            try:
+                value = float(match.group(1))
+            except ValueError:
+                return match.group(0)
+            bucket = int(value / width) * width
+            return f"（不确定度≈{bucket:.2f}）"
+
+        return _UNCERTAINTY.sub(repl, text)
+
+    return rule
+
+
+DEFAULT_RULES: Tuple[NormalizationRule, ...] = (drop_uncertainty, collapse_whitespace)
+
+
+@dataclass
+class CacheStats:
+    """Counters exposed by :class:`CachedTool`."""
+
+    hits: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class _DiskTier:
+    """SQLite-backed cache tier that survives restarts."""
+
+    def __init__(self, path: Path, max_entries: Optional[int]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, content TEXT NOT NULL, metadata TEXT NOT NULL, "
+            "expires REAL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+
+    def get(self, key: str, now: float) -> Tuple[Optional[Tuple[str, Dict[str, Any], Optional[float]]], bool]:
+        """Return ``(entry, expired)`` for ``key``."""
+        row = self._conn.execute(
+            "SELECT content, metadata, expires FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None, False
+        content, metadata, expires = row
+        if expires is not None and expires <= now:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None, True
+        self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return (content, json.loads(metadata), expires), False
+
+    def put(self, key: str, content: str, metadata: Dict[str, Any], expires: Optional[float], now: float) -> int:
+        """Store an entry and return how many entries were evicted."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, content, metadata, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, content, json.dumps(metadata, ensure_ascii=False, default=str), expires, now),
+        )
+        if self.max_entries is None:
+            return 0
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+            (excess,),
+        )
+        return excess
+
+    def delete(self, key: str) -> None:
+        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class CachedTool(BaseTool):
+    """Wraps a tool with an in-memory LRU/TTL tier and an optional SQLite tier.
+
+    Cache keys combine the wrapped tool's name and ``provider`` with the
+    question after applying ``rules`` in order, so questions that only differ
+    in the generated uncertainty suffix share an answer by default. Exceptions
+    from the wrapped tool are never cached. Hits are marked with
+    ``metadata["cache"]`` set to ``"memory"`` or ``"disk"``.
+    """
+
+    def __init__(
+        self,
+        tool: BaseTool,
+        rules: Sequence[NormalizationRule] = DEFAULT_RULES,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 3600.0,
+        disk_path: Optional[Path] = None,
+        max_disk_entries: Optional[int] = 100_000,
+    ) -> None:
+        self.tool = tool
+        self.name = tool.name
+        self.description = tool.description
+        self.rules = tuple(rules)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, Tuple[Optional[float], ToolResult]]" = OrderedDict()
+        self._disk = _DiskTier(disk_path, max_disk_entries) if disk_path is not None else None
+        self._lock = threading.Lock()
+
+    def normalize(self, question: str) -> str:
+        for rule in self.rules:
+            question = rule(question)
+        return question
+
+    def cache_key(self, query: ToolQuery) -> str:
+        provider = str(getattr(self.tool, "provider", "") or "")
+        material = "\x1f".join((self.tool.name, provider, self.normalize(query.content)))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def call(self, query: ToolQuery) -> ToolResult:
+        key = self.cache_key(query)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        result = self.tool.call(query)
+        self._store(key, result)
+        return result
+
+    def call_batch(self, queries: Sequence[ToolQuery]) -> List[ToolResult]:
+        """Serve hits from the cache and forward all misses in one batch."""
+        keys = [self.cache_key(query) for query in queries]
+        results: List[Optional[ToolResult]] = [self._lookup(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fresh = self.tool.call_batch([queries[i] for i in missing])
+            if len(fresh) != len(missing):
+                raise RuntimeError(
+                    f"{self.tool.name}.call_batch returned {len(fresh)} results for {len(missing)} queries"
+                )
+            for i, result in zip(missing, fresh):
+                self._store(keys[i], result)
+                results[i] = result
+        return results  # type: ignore[return-value]
+
+    def invalidate(self, query: ToolQuery) -> None:
+        key = self.cache_key(query)
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._disk is not None:
+                self._disk.delete(key)
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+    def _lookup(self, key: str) -> Optional[ToolResult]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires, result = entry
+                if expires is None or expires > now:
+                    self._memory.move_to_end(key)
+                    self.stats.hits += 1
+                    self.stats.memory_hits += 1
+                    return self._mark(result, "memory")
+                del self._memory[key]
+                self.stats.expirations += 1
+            if self._disk is not None:
+                found, expired = self._disk.get(key, now)
+                if expired:
+                    self.stats.expirations += 1
+                if found is not None:
+                    content, metadata, expires = found
+                    result = ToolResult(content=content, metadata=metadata)
+                    self._remember(key, expires, result)
+                    self.stats.hits += 1
+                    self.stats.disk_hits += 1
+                    return self._mark(result, "disk")
+            self.stats.misses += 1
+            return None
+
+    def _store(self, key: str, result: ToolResult) -> None:
+        now = time.time()
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._remember(key, expires, result)
+            if self._disk is not None:
+                self.stats.evictions += self._disk.put(key, result.content, result.metadata, expires, now)
+            self.stats.stores += 1
+
+    def _remember(self, key: str, expires: Optional[float], result: ToolResult) -> None:
+        self._memory[key] = (expires, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    @staticmethod
+    def _mark(result: ToolResult, tier: str) -> ToolResult:
+        metadata = dict(result.metadata)
+        metadata["cache"] = tier
+        return replace(result, metadata=metadata)
@@ -0,0 +1,259 @@
+"""Adaptive concurrency, rate and cost limits around a tool."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..config import LimiterConfig
+from .base_tool import BaseTool, ToolQuery, ToolResult
+
+_CHARS_PER_TOKEN = 4.0
+_BASELINE_DRIFT = 0.01
+_LATENCY_ALPHA = 0.2
+
+
+class BudgetExhausted(RuntimeError):
+    """Raised when a limited tool cannot start a call within its budget."""
+
+
+def estimate_tokens(query: ToolQuery, result: Optional[ToolResult]) -> float:
+    """Token count from ``metadata["usage"]``, else a character-based estimate."""
+    usage = result.metadata.get("usage") if result is not None else None
+    if isinstance(usage, dict):
+        if "total_tokens" in usage:
+            return float(usage["total_tokens"])
+        if "prompt_tokens" in usage or "completion_tokens" in usage:
+            return float(usage.get("prompt_tokens", 0)) + float(usage.get("completion_tokens", 0))
+    chars = len(query.content) + (len(result.content) if result is not None else 0)
+    return chars / _CHARS_PER_TOKEN
+
+
+class ToolLimiter:
+    """Thread-safe AIMD concurrency limit plus rate and cost token buckets.
+
+    :meth:`acquire` blocks until a call may start (a free slot and a rate
+    token) and raises :class:`BudgetExhausted` when the cost budget is spent
+    or the wait exceeds ``acquire_timeout``. It reserves the fixed
+    ``cost_per_call`` of the call up front, so concurrent calls cannot all
+    pass the budget check before any of them is charged. :meth:`release`
+    settles the reservation against the actual cost and feeds the call's
+    latency and outcome back into the limits.
+    """
+
+    def __init__(
+        self, name: str, config: Optional[LimiterConfig] = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.name = name
+        self.config = config or LimiterConfig()
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._limit = float(self.config.initial_concurrency)
+        self.in_flight = 0
+        now = clock()
+        self._rate_capacity = self.config.burst or max(1.0, self.config.rate or 1.0)
+        self._rate_tokens = self._rate_capacity
+        self._budget = self.config.cost_budget
+        self._refilled = now
+        self._last_decrease = now
+        self.latency_ewma: Optional[float] = None
+        self.baseline: Optional[float] = None
+        self.counters: Dict[str, float] = {
+            "calls": 0,
+            "errors": 0,
+            "slow": 0,
+            "decreases": 0,
+            "throttled": 0,
+            "rejected": 0,
+            "cost": 0.0,
+        }
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def available(self) -> bool:
+        """Whether the budget and rate allow a call to start now.
+
+        The concurrency limit is deliberately not checked: a saturated limit
+        clears as soon as a call finishes and :meth:`acquire` waits for it, so
+        the scheduler should not give up on work because of it.
+        """
+        with self._cond:
+            self._refill(self.clock())
+            return self._budget_left() and (self.config.rate is None or self._rate_tokens >= 1.0)
+
+    def acquire(self, weight: int = 1) -> None:
+        """Wait for a slot and ``weight`` rate tokens; raises :class:`BudgetExhausted`."""
+        config = self.config
+        need = min(float(weight), self._rate_capacity)
+        timeout = config.acquire_timeout
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            while True:
+                now = self.clock()
+                self._refill(now)
+                if not self._budget_left(weight):
+                    self.counters["rejected"] += 1
+                    raise BudgetExhausted(f"{self.name}: cost budget exhausted for this window")
+                delay: Optional[float] = None
+                if self.in_flight < self.limit:
+                    if config.rate is None or self._rate_tokens >= need:
+                        break
+                    delay = (need - self._rate_tokens) / config.rate
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self.counters["throttled"] += 1
+                        raise BudgetExhausted(f"{self.name}: no capacity within {timeout}s")
+                    delay = remaining if delay is None else min(delay, remaining)
+                self._cond.wait(delay)
+            self.in_flight += 1
+            if config.rate is not None:
+                self._rate_tokens -= float(weight)
+            if self._budget is not None:
+                self._budget -= config.cost_per_call * weight
+
+    def release(self, latency: float, ok: bool, cost: float, weight: int = 1) -> None:
+        """Record a finished call of ``weight`` queries and adapt the concurrency limit.
+
+        A successful call is charged ``cost`` less what :meth:`acquire`
+        reserved; a failed one gives its reservation back and is not charged.
+        """
+        config = self.config
+        with self._cond:
+            now = self.clock()
+            self.in_flight -= 1
+            self.counters["calls"] += 1
+            reserved = config.cost_per_call * weight
+            if ok:
+                self.counters["cost"] += cost
+                if self._budget is not None:
+                    self._budget -= cost - reserved
+                if self.latency_ewma is None:
+                    self.latency_ewma = latency
+                else:
+                    self.latency_ewma = (1 - _LATENCY_ALPHA) * self.latency_ewma + _LATENCY_ALPHA * latency
+                # Windowed-minimum stand-in: drifts up so a lasting shift is re-learned.
+                drifted = None if self.baseline is None else self.baseline * (1 + _BASELINE_DRIFT)
+                self.baseline = self.latency_ewma if drifted is None else min(drifted, self.latency_ewma)
+                if latency > config.latency_tolerance * self.baseline:
+                    self.counters["slow"] += 1
+                    self._decrease(now)
+                else:
+                    self._limit = min(float(config.max_concurrency), self._limit + 1.0 / max(1.0, self._limit))
+            else:
+                if self._budget is not None:
+                    self._budget += reserved
+                self.counters["errors"] += 1
+                self._decrease(now)
+            self._cond.notify_all()
+
+    def cost_of(self, queries: Sequence[ToolQuery], results: Sequence[Optional[ToolResult]]) -> float:
+        config = self.config
+        cost = config.cost_per_call * len(queries)
+        if config.cost_per_token:
+            cost += config.cost_per_token * sum(estimate_tokens(q, r) for q, r in zip(queries, results))
+        return cost
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            self._refill(self.clock())
+            metrics: Dict[str, Any] = dict(self.counters)
+            metrics.update(
+                limit=self.limit,
+                in_flight=self.in_flight,
+                latency_ewma=self.latency_ewma,
+                latency_baseline=self.baseline,
+                rate_tokens=self._rate_tokens if self.config.rate is not None else None,
+                budget_remaining=self._budget,
+            )
+            return metrics
+
+    def _budget_left(self, weight: int = 1) -> bool:
+        """Whether the remaining budget covers the fixed cost of ``weight`` calls."""
+        if self._budget is None:
+            return True
+        config = self.config
+        # A batch costing more than the whole budget can still start on a full one.
+        need = min(config.cost_per_call * weight, config.cost_budget or 0.0)
+        return self._budget > 0 and self._budget >= need
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled
+        if elapsed <= 0:
+            return
+        self._refilled = now
+        config = self.config
+        if config.rate is not None:
+            self._rate_tokens = min(self._rate_capacity, self._rate_tokens + elapsed * config.rate)
+        if self._budget is not None and config.cost_budget is not None:
+            self._budget = min(config.cost_budget, self._budget + elapsed * config.cost_budget / config.cost_window)
+
+    def _decrease(self, now: float) -> None:
+        # One cut per round trip, so a burst of failures counts as one signal.
+        if now - self._last_decrease < (self.latency_ewma or 0.0):
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.config.min_concurrency), self._limit * self.config.backoff)
+        self.counters["decreases"] += 1
+
+
+class LimitedTool(BaseTool):
+    """Wraps a tool with a :class:`ToolLimiter`.
+
+    Every call (a batch counts as one slot and one rate token per query)
+    goes through :meth:`ToolLimiter.acquire`; exceptions from the backend,
+    such as throttling errors, shrink the concurrency limit.
+    """
+
+    def __init__(
+        self, tool: BaseTool, config: Optional[LimiterConfig] = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.tool = tool
+        self.name = tool.name
+        self.description = tool.description
+        self.limiter = ToolLimiter(tool.name, config, clock)
+
+    def call(self, query: ToolQuery) -> ToolResult:
+        return self.call_batch([query])[0]
+
+    def call_batch(self, queries: Sequence[ToolQuery]) -> List[ToolResult]:
+        limiter = self.limiter
+        limiter.acquire(weight=len(queries))
+        started = time.perf_counter()
+        try:
+            if len(queries) == 1:
+                results = [self.tool.call(queries[0])]
+            else:
+                results = self.tool.call_batch(queries)
+        except Exception:
+            limiter.release(time.perf_counter() - started, ok=False, cost=0.0, weight=len(queries))
+            raise
+        cost = limiter.cost_of(queries, results)
+        limiter.release(time.perf_counter() - started, ok=True, cost=cost, weight=len(queries))
+        return results
+
+    def metrics(self) -> Dict[str, Any]:
+        return self.limiter.metrics()
+
+
+def find_limiters(tool: Any) -> List[ToolLimiter]:
+    """Limiters of ``tool`` and the tools it wraps (adapters, caches, managers)."""
+    found: List[ToolLimiter] = []
+    pending = [tool]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        limiter = getattr(current, "limiter", None)
+        if isinstance(limiter, ToolLimiter):
+            found.append(limiter)
+        pending.append(getattr(current, "tool", None))
+        teachers = getattr(current, "tools", None)
+        if isinstance(teachers, dict):
+            pending.extend(teachers.values())
+    return found
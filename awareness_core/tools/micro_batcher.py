@@ -0,0 +1,150 @@
+"""Micro-batching and in-flight request coalescing for tool calls."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .base_tool import BaseTool, ToolQuery, ToolResult
+
+
+@dataclass
+class BatchStats:
+    """Counters exposed by :class:`MicroBatcher`."""
+
+    requests: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    batched_queries: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        stats: Dict[str, float] = dict(self.__dict__)
+        stats["mean_batch_size"] = self.batched_queries / self.batches if self.batches else 0.0
+        return stats
+
+
+def query_key(query: ToolQuery) -> str:
+    """Identity used to coalesce in-flight queries."""
+    context = json.dumps(query.context, sort_keys=True, ensure_ascii=False, default=str)
+    return query.content + "\x1f" + context
+
+
+class MicroBatcher(BaseTool):
+    """Shares one tool between many callers by batching their queries.
+
+    Concurrent ``call`` invocations (for example from several
+    :class:`~awareness_core.loop.AwarenessLoop` instances on different
+    threads) are collected for up to ``max_wait`` seconds or ``max_batch``
+    distinct queries, whichever comes first, and sent as one
+    :meth:`BaseTool.call_batch`. A query identical to one already queued or
+    in flight is not sent again; it waits for the same result (singleflight).
+    """
+
+    def __init__(
+        self,
+        tool: BaseTool,
+        max_batch: int = 16,
+        max_wait: float = 0.005,
+        max_concurrent_batches: int = 2,
+    ) -> None:
+        self.tool = tool
+        self.name = tool.name
+        self.description = tool.description
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = BatchStats()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._queue: List[Tuple[str, ToolQuery]] = []
+        self._queue_since: Optional[float] = None
+        self._inflight: Dict[str, "Future[ToolResult]"] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix=f"batch-{tool.name}")
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"batcher-{tool.name}", daemon=True)
+        self._thread.start()
+
+    def call(self, query: ToolQuery) -> ToolResult:
+        return self.submit(query).result()
+
+    def call_batch(self, queries: Sequence[ToolQuery]) -> List[ToolResult]:
+        futures = [self.submit(query) for query in queries]
+        return [future.result() for future in futures]
+
+    def submit(self, query: ToolQuery) -> "Future[ToolResult]":
+        """Queue a query and return a future for its result."""
+        key = query_key(query)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self.stats.requests += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats.coalesced += 1
+                return future
+            future = Future()
+            self._inflight[key] = future
+            if not self._queue:
+                self._queue_since = time.monotonic()
+            self._queue.append((key, query))
+            if len(self._queue) >= self.max_batch:
+                self._dispatch_locked()
+            else:
+                self._wakeup.notify()
+            return future
+
+    def close(self) -> None:
+        """Dispatch queued queries and stop the background thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._queue:
+                self._dispatch_locked()
+            self._wakeup.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        with self._lock:
+            while not self._closed:
+                if not self._queue:
+                    self._wakeup.wait()
+                    continue
+                assert self._queue_since is not None
+                delay = self._queue_since + self.max_wait - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(timeout=delay)
+                    continue
+                self._dispatch_locked()
+
+    def _dispatch_locked(self) -> None:
+        batch, self._queue = self._queue, []
+        self._queue_since = None
+        self.stats.batches += 1
+        self.stats.batched_queries += len(batch)
+        self._executor.submit(self._execute, batch)
+
+    def _execute(self, batch: List[Tuple[str, ToolQuery]]) -> None:
+        keys = [key for key, _ in batch]
+        try:
+            results = self.tool.call_batch([query for _, query in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"{self.tool.name}.call_batch returned {len(results)} results for {len(batch)} queries"
+                )
+        except Exception as exc:  # noqa: BLE001 - delivered to every waiter
+            with self._lock:
+                self.stats.errors += 1
+                futures = [self._inflight.pop(key) for key in keys]
+            for future in futures:
+                future.set_exception(exc)
+            return
+        with self._lock:
+            futures = [self._inflight.pop(key) for key in keys]
+        for future, result in zip(futures, results):
+            future.set_result(result)
@@ -0,0 +1,316 @@
+"""Multi-teacher tool manager with concurrent dispatch policies."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from .base_tool import BaseTool, ToolQuery, ToolResult
+
+POLICIES = ("wait_all", "first_valid", "hedged")
+
+Validator = Callable[[ToolResult], bool]
+
+
+def non_empty(result: ToolResult) -> bool:
+    """Default validator: any answer with visible content is acceptable."""
+    return bool(result.content and result.content.strip())
+
+
+@dataclass
+class TeacherStats:
+    """Online latency, error and trust statistics for one teacher."""
+
+    calls: int = 0
+    errors: int = 0
+    invalid: int = 0
+    latency_ewma: Optional[float] = None
+    trust: float = 0.5
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def record(self, latency: float, ok: bool, valid: bool, alpha: float) -> None:
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        elif not valid:
+            self.invalid += 1
+        if ok:
+            self.latencies.append(latency)
+            self.latency_ewma = latency if self.latency_ewma is None else (1 - alpha) * self.latency_ewma + alpha * latency
+        self.trust = (1 - alpha) * self.trust + alpha * (1.0 if ok and valid else 0.0)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "invalid": self.invalid,
+            "latency_ewma": self.latency_ewma,
+            "latency_p95": self.quantile(0.95),
+            "trust": self.trust,
+        }
+
+
+@dataclass
+class _Attempt:
+    teacher: str
+    result: Optional[ToolResult]
+    error: Optional[BaseException]
+    latency: float
+    valid: bool
+
+
+class ToolManager(BaseTool):
+    """Dispatches one query to several teachers through a thread pool.
+
+    Policies:
+
+    * ``wait_all`` asks every teacher and waits for all answers, returning the
+      most trusted valid one with the full comparison in its metadata.
+    * ``first_valid`` asks every teacher and returns the first answer that
+      passes the validator.
+    * ``hedged`` asks the best-ranked teacher and only starts the next one if
+      the primary has not answered within its observed p95 latency.
+
+    Teachers are ranked by trust, then by smoothed latency. Statistics update
+    as each call finishes, including calls whose answer arrives too late to
+    be used, and are attached to the returned :class:`ToolResult` metadata.
+    """
+
+    name = "tool_manager"
+    description = "Routes queries to one or more teacher tools."
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool] = (),
+        policy: str = "first_valid",
+        validator: Optional[Validator] = None,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 10,
+        hedge_default_delay: float = 1.0,
+        stats_alpha: float = 0.1,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; expected one of {POLICIES}")
+        self.policy = policy
+        self.validator = validator or non_empty
+        self.timeout = timeout
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_default_delay = hedge_default_delay
+        self.stats_alpha = stats_alpha
+        self.tools: Dict[str, BaseTool] = {}
+        self.stats: Dict[str, TeacherStats] = {}
+        self._lock = threading.Lock()
+        for tool in tools:
+            self.register(tool)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(4, 2 * len(self.tools)), thread_name_prefix="tool-manager"
+        )
+
+    def register(self, tool: BaseTool) -> None:
+        """Add a teacher; names must be unique."""
+        if tool.name in self.tools:
+            raise ValueError(f"Tool {tool.name!r} already registered")
+        self.tools[tool.name] = tool
+        self.stats[tool.name] = TeacherStats()
+
+    def ranked(self) -> List[BaseTool]:
+        """Teachers ordered by trust (desc) then smoothed latency (asc)."""
+        with self._lock:
+            keys = {
+                name: (-stats.trust, stats.latency_ewma if stats.latency_ewma is not None else 0.0)
+                for name, stats in self.stats.items()
+            }
+        return [self.tools[name] for name in sorted(self.tools, key=lambda n: keys[n])]
+
+    def select_tool(self, query: Optional[ToolQuery] = None) -> BaseTool:
+        """Single-teacher mode: return the best-ranked teacher."""
+        if not self.tools:
+            raise LookupError("ToolManager has no registered tools")
+        return self.ranked()[0]
+
+    def call(self, query: ToolQuery) -> ToolResult:
+        if not self.tools:
+            raise LookupError("ToolManager has no registered tools")
+        if self.policy == "wait_all":
+            return self._wait_all(query)
+        if self.policy == "hedged":
+            return self._hedged(query)
+        return self._first_valid(query, self.ranked())
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_state(self) -> Dict[str, Any]:
+        """Per-teacher statistics, for loop snapshots."""
+        with self._lock:
+            return {
+                name: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "invalid": stats.invalid,
+                    "latency_ewma": stats.latency_ewma,
+                    "trust": stats.trust,
+                    "latencies": list(stats.latencies),
+                }
+                for name, stats in self.stats.items()
+            }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Restore statistics of teachers that are still registered."""
+        with self._lock:
+            for name, saved in state.items():
+                stats = self.stats.get(name)
+                if stats is None:
+                    continue
+                stats.calls, stats.errors, stats.invalid = saved["calls"], saved["errors"], saved["invalid"]
+                stats.latency_ewma, stats.trust = saved["latency_ewma"], saved["trust"]
+                stats.latencies.clear()
+                stats.latencies.extend(saved["latencies"])
+
+    def _submit(self, tool: BaseTool, query: ToolQuery) -> "Future[_Attempt]":
+        return self._executor.submit(self._attempt, tool, query)
+
+    def _attempt(self, tool: BaseTool, query: ToolQuery) -> _Attempt:
+        start = time.perf_counter()
+        result: Optional[ToolResult] = None
+        error: Optional[BaseException] = None
+        try:
+            result = tool.call(query)
+        except Exception as exc:  # noqa: BLE001 - recorded as a teacher error
+            error = exc
+        latency = time.perf_counter() - start
+        valid = result is not None and self._is_valid(result)
+        with self._lock:
+            self.stats[tool.name].record(latency, ok=error is None, valid=valid, alpha=self.stats_alpha)
+        return _Attempt(tool.name, result, error, latency, valid)
+
+    def _is_valid(self, result: ToolResult) -> bool:
+        try:
+            return bool(self.validator(result))
+        except Exception:  # noqa: BLE001 - a crashing validator rejects the answer
+            return False
+
+    def _wait_all(self, query: ToolQuery) -> ToolResult:
+        futures = [self._submit(tool, query) for tool in self.ranked()]
+        done, _ = wait(futures, timeout=self.timeout)
+        attempts = [f.result() for f in futures if f in done]
+        comparison = [
+            {
+                "teacher": a.teacher,
+                "valid": a.valid,
+                "latency": a.latency,
+                "content": a.result.content if a.result is not None else None,
+                "error": repr(a.error) if a.error is not None else None,
+            }
+            for a in attempts
+        ]
+        with self._lock:
+            trust = {name: stats.trust for name, stats in self.stats.items()}
+        valid = sorted((a for a in attempts if a.valid), key=lambda a: -trust[a.teacher])
+        chosen = valid[0] if valid else self._fallback(attempts)
+        return self._annotate(chosen, [a.teacher for a in attempts], comparisons=comparison)
+
+    def _first_valid(self, query: ToolQuery, teachers: Sequence[BaseTool]) -> ToolResult:
+        futures = [self._submit(tool, query) for tool in teachers]
+        attempts, winner, _ = self._race(set(futures), deadline=self._deadline())
+        for future in futures:
+            future.cancel()
+        chosen = winner or self._fallback(attempts)
+        return self._annotate(chosen, [t.name for t in teachers])
+
+    def _hedged(self, query: ToolQuery) -> ToolResult:
+        teachers = self.ranked()
+        primary = teachers[0]
+        deadline = self._deadline()
+        hedge_delay = self._hedge_delay(primary.name)
+        if deadline is not None:
+            hedge_delay = min(hedge_delay, max(0.0, deadline - time.monotonic()))
+        attempts, winner, pending = self._race(
+            {self._submit(primary, query)}, deadline=time.monotonic() + hedge_delay
+        )
+        used = [primary.name]
+        hedged = False
+        if winner is None:
+            if len(teachers) > 1:
+                # Primary is slow or failed: start the backup and race both.
+                backup = teachers[1]
+                used.append(backup.name)
+                hedged = True
+                pending.add(self._submit(backup, query))
+            more, winner, _ = self._race(pending, deadline=deadline)
+            attempts += more
+        chosen = winner or self._fallback(attempts)
+        return self._annotate(chosen, used, hedged=hedged)
+
+    def _race(
+        self, pending: Set["Future[_Attempt]"], deadline: Optional[float]
+    ) -> Tuple[List[_Attempt], Optional[_Attempt], Set["Future[_Attempt]"]]:
+        """Wait for the first valid attempt.
+
+        Returns the attempts collected, the winner (if any) and the futures
+        still running.
+        """
+        attempts: List[_Attempt] = []
+        winner: Optional[_Attempt] = None
+        while pending and winner is None:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                attempt = future.result()
+                attempts.append(attempt)
+                if attempt.valid and winner is None:
+                    winner = attempt
+        return attempts, winner, pending
+
+    def _hedge_delay(self, teacher: str) -> float:
+        with self._lock:
+            stats = self.stats[teacher]
+            if len(stats.latencies) < self.hedge_min_samples:
+                return self.hedge_default_delay
+            return stats.quantile(self.hedge_quantile) or self.hedge_default_delay
+
+    def _deadline(self) -> Optional[float]:
+        return None if self.timeout is None else time.monotonic() + self.timeout
+
+    @staticmethod
+    def _fallback(attempts: List[_Attempt]) -> _Attempt:
+        """Pick an answer when no teacher produced a valid one."""
+        answered = [a for a in attempts if a.result is not None]
+        if answered:
+            return answered[0]
+        errors = [a.error for a in attempts if a.error is not None]
+        if errors:
+            raise errors[-1]  # type: ignore[misc]
+        raise TimeoutError("No teacher answered before the timeout")
+
+    def _annotate(self, attempt: _Attempt, teachers: List[str], **extra: Any) -> ToolResult:
+        assert attempt.result is not None
+        with self._lock:
+            stats = {name: self.stats[name].as_dict() for name in teachers}
+        metadata = dict(attempt.result.metadata)
+        metadata.update(
+            {
+                "teacher": attempt.teacher,
+                "policy": self.policy,
+                "latency": attempt.latency,
+                "valid": attempt.valid,
+                "teacher_stats": stats,
+            }
+        )
+        metadata.update(extra)
+        return replace(attempt.result, metadata=metadata)
@@ -0,0 +1,135 @@
+"""Batched imagination rollouts over hypothetical awareness trajectories."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+
+# trajectories [H + 1, B, D] -> scores [B]
+Objective = Callable[[np.ndarray], np.ndarray]
+
+
+class TransitionModel(Protocol):
+    """Anything that maps a ``[B, D]`` batch of states to next states."""
+
+    def predict_batch(self, states: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray: ...
+
+
+def novelty_objective(trajectories: np.ndarray) -> np.ndarray:
+    """Mean distance of every imagined state from the starting state."""
+    # |x_h - x_0|^2 expanded, so only [H, B] temporaries are allocated.
+    states, start = trajectories[1:], trajectories[0]
+    squared = np.einsum("hbd,hbd->hb", states, states)
+    squared -= 2.0 * np.einsum("hbd,bd->hb", states, start)
+    squared += np.einsum("bd,bd->b", start, start)
+    np.maximum(squared, 0.0, out=squared)
+    return np.sqrt(squared, out=squared).mean(axis=0)
+
+
+def goal_objective(goal: Sequence[float], discount: float = 0.9) -> Objective:
+    """Discounted cosine similarity of imagined states to ``goal``."""
+    target = np.asarray(goal, dtype=np.float32)
+    target = target / (np.linalg.norm(target) + 1e-9)
+
+    def objective(trajectories: np.ndarray) -> np.ndarray:
+        states = trajectories[1:]
+        norms = np.sqrt(np.einsum("hbd,hbd->hb", states, states)) + 1e-9
+        cosine = (states @ target) / norms
+        weights = discount ** np.arange(states.shape[0], dtype=np.float32)
+        return weights @ cosine
+
+    return objective
+
+
+@dataclass
+class ImaginedTrajectory:
+    """One of the top-k rollouts, copied out of the engine's buffers."""
+
+    score: float
+    states: np.ndarray  # [H + 1, D], states[0] is the starting vector
+    axis_change: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def final(self) -> np.ndarray:
+        return self.states[-1]
+
+    @property
+    def target_axis(self) -> Optional[str]:
+        """Axis that moves most along the trajectory."""
+        if not self.axis_change:
+            return None
+        return max(self.axis_change, key=self.axis_change.__getitem__)
+
+
+class ImaginationEngine:
+    """Rolls out ``batch`` noisy trajectories of ``horizon`` steps at once.
+
+    Each step applies ``transition.predict_batch`` to the whole ``[B, D]``
+    batch and adds Gaussian noise of scale ``noise`` (candidate ``0`` stays
+    noise-free as the model's own forecast). The trajectory buffer and the
+    noise block are preallocated and reused, and the built-in objectives
+    only allocate ``[horizon, batch]`` temporaries, so memory stays at about
+    ``(horizon + 2) * batch * dim`` float32 values regardless of how often
+    :meth:`imagine` runs; only the returned top-k are copied.
+    """
+
+    def __init__(
+        self,
+        transition: TransitionModel,
+        dim: int,
+        batch: int = 64,
+        horizon: int = 8,
+        noise: float = 0.05,
+        objective: Objective = novelty_objective,
+        axes: Optional[Dict[str, slice]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.transition = transition
+        self.dim = dim
+        self.batch = batch
+        self.horizon = horizon
+        self.noise = noise
+        self.objective = objective
+        self.axes = axes or {}
+        self._rng = np.random.default_rng(seed)
+        self._trajectories = np.zeros((horizon + 1, batch, dim), dtype=np.float32)
+        self._noise = np.zeros((batch, dim), dtype=np.float32)
+
+    def rollout(self, start: Sequence[float]) -> np.ndarray:
+        """Fill and return the ``[H + 1, B, D]`` trajectory buffer (reused on the next call)."""
+        trajectories = self._trajectories
+        trajectories[0] = np.asarray(start, dtype=np.float32)
+        for step in range(self.horizon):
+            current, following = trajectories[step], trajectories[step + 1]
+            self.transition.predict_batch(current, out=following)
+            if self.noise > 0:
+                self._rng.standard_normal(out=self._noise, dtype=np.float32)
+                self._noise[0] = 0.0
+                self._noise *= self.noise
+                following += self._noise
+        return trajectories
+
+    def imagine(self, start: Sequence[float], k: int = 3) -> List[ImaginedTrajectory]:
+        """Roll out from ``start`` and return the ``k`` best trajectories, best first."""
+        trajectories = self.rollout(start)
+        scores = np.asarray(self.objective(trajectories))
+        k = min(k, self.batch)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for index in top:
+            states = trajectories[:, index].copy()
+            delta = states[-1] - states[0]
+            axis_change = {name: float(np.linalg.norm(delta[span])) for name, span in self.axes.items()}
+            results.append(ImaginedTrajectory(score=float(scores[index]), states=states, axis_change=axis_change))
+        return results
+
+    @staticmethod
+    def drives(imagined: Sequence[ImaginedTrajectory]) -> Dict[str, float]:
+        """Map the best score to a ``curiosity`` drive in [0, 1) for :class:`Scheduler`."""
+        if not imagined:
+            return {}
+        return {"curiosity": 1.0 - math.exp(-max(0.0, imagined[0].score))}
@@ -0,0 +1,94 @@
+"""Online linear world model predicting the next awareness vector."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ..config import WorldModelConfig
+
+_MAX_TRACE = 1e6
+
+
+class WorldModel:
+    """Recursive-least-squares predictor ``y ≈ W^T [x; 1]`` over state vectors.
+
+    ``W`` starts as the identity (the next frame equals the current one) and
+    is refined by one O(dim^2) RLS update per observed transition with
+    forgetting factor ``config.forgetting``. The a-priori relative error of
+    each update feeds an EWMA that is exposed as :attr:`uncertainty`.
+    """
+
+    def __init__(self, dim: int, config: Optional[WorldModelConfig] = None) -> None:
+        self.dim = dim
+        self.config = config or WorldModelConfig()
+        self.weights = np.zeros((dim + 1, dim), dtype=np.float64)
+        self.weights[:dim] = np.eye(dim)
+        self._cov = np.eye(dim + 1, dtype=np.float64) * self.config.prior
+        self._z = np.ones(dim + 1, dtype=np.float64)
+        self._last: Optional[np.ndarray] = None
+        self.updates = 0
+        self.error = 1.0
+
+    @property
+    def uncertainty(self) -> float:
+        """Smoothed relative prediction error, clipped to [0, 1]."""
+        return min(1.0, self.error)
+
+    @property
+    def confident(self) -> bool:
+        return self.updates >= self.config.min_updates and self.uncertainty <= self.config.max_uncertainty
+
+    def predict(self, vector: Sequence[float]) -> np.ndarray:
+        self._z[: self.dim] = vector
+        return self._z @ self.weights
+
+    def predict_batch(self, states: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Predict next vectors for a ``[B, dim]`` batch, writing into ``out`` if given."""
+        out = np.matmul(states, self.weights[: self.dim], out=out)
+        out += self.weights[self.dim]
+        return out
+
+    def update(self, vector: Sequence[float], target: Sequence[float]) -> float:
+        """Learn one transition ``vector -> target``; returns its a-priori relative error."""
+        z = self._z
+        z[: self.dim] = vector
+        y = np.asarray(target, dtype=np.float64)
+        residual = y - z @ self.weights
+        relative = float(np.linalg.norm(residual) / (np.linalg.norm(y) + 1e-9))
+
+        lam = self.config.forgetting
+        cov_z = self._cov @ z
+        gain = cov_z / (lam + z @ cov_z)
+        self.weights += np.outer(gain, residual)
+        self._cov -= np.outer(gain, cov_z)
+        self._cov /= lam
+        # Without excitation the covariance grows as lam^-t; keep it bounded.
+        trace = np.trace(self._cov)
+        if trace > _MAX_TRACE:
+            self._cov *= _MAX_TRACE / trace
+
+        alpha = self.config.error_alpha
+        self.error = relative if self.updates == 0 else (1 - alpha) * self.error + alpha * relative
+        self.updates += 1
+        return relative
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"weights": self.weights, "cov": self._cov, "updates": self.updates, "error": self.error}
+
+    def set_state(self, state: Mapping[str, Any]) -> None:
+        weights = np.asarray(state["weights"], dtype=np.float64)
+        if weights.shape != self.weights.shape:
+            raise ValueError(f"world model shape {weights.shape} does not match {self.weights.shape}")
+        self.weights = weights
+        self._cov = np.asarray(state["cov"], dtype=np.float64)
+        self.updates = int(state["updates"])
+        self.error = float(state["error"])
+
+    def observe(self, vector: Sequence[float]) -> Optional[float]:
+        """Learn from consecutive frames; the first call only sets the context."""
+        current = np.array(vector, dtype=np.float64)
+        error = self.update(self._last, current) if self._last is not None else None
+        self._last = current
+        return error
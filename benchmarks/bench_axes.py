@@ -0,0 +1,46 @@
+"""TextAxis encoding and AwarenessState.to_frame at scale."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+
+from awareness_core.core_state import AwarenessState
+from awareness_core.self_axes.text_axis import TextAxis
+from awareness_core.self_axes.text_encoder import HashedNgramEncoder
+
+from .common import latency_stats, timed_each, timed_total
+
+_TEXT = "意识核把外部大模型当作老师 and keeps learning from its teachers. "
+
+
+def run(scale: Dict[str, Any], workdir: Path) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    updates = scale["axis_updates"]
+    for dim in scale["text_dims"]:
+        axis = TextAxis(dim=dim)
+        samples = timed_each(lambda i: axis.update_from_input({"external_text": f"{_TEXT} {i}"}), updates)
+        results.update(latency_stats(samples, f"axes.text.dim_{dim}.update_external"))
+        axis.update_from_input({"external_text": _TEXT * 4})
+        samples = timed_each(lambda i: axis.update_from_input({"internal_text": f"answer {i}"}), updates)
+        results.update(latency_stats(samples, f"axes.text.dim_{dim}.update_internal"))
+
+        encoder = HashedNgramEncoder(dim=dim)
+        batch = [f"{_TEXT} {i}" for i in range(scale["encode_batch"])]
+        elapsed = timed_total(lambda: encoder.encode_batch(batch))
+        results[f"axes.text.dim_{dim}.batch_texts_per_s"] = len(batch) / elapsed if elapsed else 0.0
+
+    axes = [TextAxis(name=f"text_{i}", dim=scale["state_axis_dim"]) for i in range(scale["state_axes"])]
+    state = AwarenessState(axes=axes, max_history=scale["state_history"])
+    for i, axis in enumerate(axes):
+        axis.update_from_input({"external_text": f"{_TEXT} {i}"})
+    frames = scale["state_frames"]
+
+    def churn(i: int) -> None:
+        axes[i % len(axes)].update_from_input({"internal_text": f"step {i}"})
+        state.to_frame()
+
+    results.update(latency_stats(timed_each(churn, frames), "state.to_frame.one_axis_changed"))
+    results.update(latency_stats(timed_each(lambda _: state.record(), frames), "state.record.unchanged"))
+    results.update(latency_stats(timed_each(lambda _: state.recent_frames(1000).vectors("text_0"), frames), "state.recent_frames_1000"))
+    return results
@@ -0,0 +1,35 @@
+"""AwarenessLoop.step throughput and latency."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict
+
+from awareness_core.config import CoreConfig, MemoryConfig
+from awareness_core.loop import AwarenessLoop
+from awareness_core.memory.episodic_memory import EpisodicMemory
+
+from .common import latency_stats, timed_each
+from .stub_tool import StubTool
+
+_INPUTS = [
+    "今天天气很好，我们去公园散步吧",
+    "Explain the difference between episodic and semantic memory.",
+    None,
+    "短",
+    "请总结一下刚才的对话，并指出哪里还不确定。" * 3,
+]
+
+
+def run(scale: Dict[str, Any], workdir: Path) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    steps = scale["loop_steps"]
+    for label, latency, jitter in (("overhead", 0.0, 0.0), ("stub_latency", scale["tool_latency"], scale["tool_jitter"])):
+        config = CoreConfig(memory=MemoryConfig(episodic_path=workdir / f"loop_{label}.jsonl"))
+        memory = EpisodicMemory.from_config(config.memory)
+        loop = AwarenessLoop(config=config, tool=StubTool(latency=latency, jitter=jitter), memory=memory)
+        count = steps if latency == 0 else max(1, steps // 20)
+        samples = timed_each(lambda i: loop.step(_INPUTS[i % len(_INPUTS)]), count)
+        results.update(latency_stats(samples, f"loop.step.{label}"))
+        memory.close()
+    return results
@@ -0,0 +1,68 @@
+"""EpisodicMemory append / recall / iteration on synthetic logs."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict
+
+from awareness_core.config import WriterConfig
+from awareness_core.memory.episodic_memory import EpisodicMemory
+
+from .common import latency_stats, timed_each, timed_total
+
+
+def write_synthetic_log(path: Path, events: int) -> None:
+    """Write ``events`` JSONL records quickly, bypassing EpisodicMemory."""
+    start = datetime(2024, 1, 1)
+    tools = ("llm", "code_llm", "search")
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        for i in range(events):
+            record = {
+                "timestamp": (start + timedelta(seconds=i)).isoformat(),
+                "question": f"请帮我解释并扩展：事件 {i}（不确定度=0.{i % 100:02d}）",
+                "tool": tools[i % len(tools)],
+                "answer": f"answer {i}",
+                "metadata": {"mode": "external", "external_salience": 0.5},
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def run(scale: Dict[str, Any], workdir: Path) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    appends = scale["memory_appends"]
+
+    direct = EpisodicMemory(workdir / "append_direct.jsonl")
+    samples = timed_each(lambda i: direct.append(f"q{i}", "llm", f"a{i}", {"i": i}), appends)
+    results.update(latency_stats(samples, "memory.append.direct"))
+
+    buffered = EpisodicMemory(workdir / "append_buffered.jsonl", writer=WriterConfig(durability="flush"))
+    samples = timed_each(lambda i: buffered.append(f"q{i}", "llm", f"a{i}", {"i": i}), appends)
+    buffered.close()
+    results.update(latency_stats(samples, "memory.append.buffered"))
+
+    for events in scale["memory_log_sizes"]:
+        prefix = f"memory.log_{events}"
+        path = workdir / f"synthetic_{events}.jsonl"
+        write_synthetic_log(path, events)
+        memory: EpisodicMemory | None = None
+
+        def open_store() -> None:
+            nonlocal memory
+            memory = EpisodicMemory(path)
+
+        results[f"{prefix}.index_build_s"] = timed_total(open_store)
+        assert memory is not None
+        store = memory
+        results.update(latency_stats(timed_each(lambda _: store.load_recent(20), 200), f"{prefix}.load_recent"))
+        middle = datetime(2024, 1, 1) + timedelta(seconds=events // 2)
+        results.update(
+            latency_stats(
+                timed_each(lambda _: store.load_range(middle, middle + timedelta(seconds=100)), 50),
+                f"{prefix}.load_range_100",
+            )
+        )
+        elapsed = timed_total(lambda: sum(1 for _ in store))
+        results[f"{prefix}.iterate_events_per_s"] = events / elapsed if elapsed else 0.0
+    return results
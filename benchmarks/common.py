@@ -0,0 +1,40 @@
+"""Timing helpers shared by the benchmark modules."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, List
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def latency_stats(samples: List[float], prefix: str) -> Dict[str, float]:
+    """Summarize per-operation latencies (seconds) under ``prefix``."""
+    total = sum(samples)
+    return {
+        f"{prefix}.ops_per_s": len(samples) / total if total else 0.0,
+        f"{prefix}.p50_us": percentile(samples, 0.50) * 1e6,
+        f"{prefix}.p99_us": percentile(samples, 0.99) * 1e6,
+    }
+
+
+def timed_each(func: Callable[[int], object], count: int) -> List[float]:
+    """Call ``func(i)`` ``count`` times and return each call's duration."""
+    samples: List[float] = []
+    clock = time.perf_counter
+    for i in range(count):
+        start = clock()
+        func(i)
+        samples.append(clock() - start)
+    return samples
+
+
+def timed_total(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
@@ -0,0 +1,153 @@
+"""Run the offline benchmark suite and optionally compare against a baseline.
+
+Usage::
+
+    python -m benchmarks.run --scale small --out bench.json
+    python -m benchmarks.run --scale small --baseline bench.json --tolerance 0.15
+
+Results are written as JSON (``{"meta": ..., "results": {metric: value}}``).
+With ``--baseline`` every shared metric is compared; metrics ending in
+``ops_per_s``/``per_s`` are higher-is-better, all others lower-is-better. The
+exit status is 1 when any metric regresses by more than ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from . import bench_axes, bench_loop, bench_memory
+
+SCALES: Dict[str, Dict[str, Any]] = {
+    "small": {
+        "loop_steps": 2_000,
+        "tool_latency": 0.002,
+        "tool_jitter": 0.001,
+        "memory_appends": 5_000,
+        "memory_log_sizes": [10_000],
+        "axis_updates": 2_000,
+        "text_dims": [12, 256],
+        "encode_batch": 1_000,
+        "state_axes": 8,
+        "state_axis_dim": 64,
+        "state_history": 10_000,
+        "state_frames": 2_000,
+    },
+    "medium": {
+        "loop_steps": 10_000,
+        "tool_latency": 0.005,
+        "tool_jitter": 0.002,
+        "memory_appends": 20_000,
+        "memory_log_sizes": [10_000, 100_000, 1_000_000],
+        "axis_updates": 10_000,
+        "text_dims": [12, 256, 1024],
+        "encode_batch": 10_000,
+        "state_axes": 32,
+        "state_axis_dim": 64,
+        "state_history": 100_000,
+        "state_frames": 10_000,
+    },
+    "large": {
+        "loop_steps": 50_000,
+        "tool_latency": 0.005,
+        "tool_jitter": 0.002,
+        "memory_appends": 100_000,
+        "memory_log_sizes": [10_000, 100_000, 1_000_000, 10_000_000],
+        "axis_updates": 50_000,
+        "text_dims": [12, 256, 1024, 4096],
+        "encode_batch": 50_000,
+        "state_axes": 64,
+        "state_axis_dim": 128,
+        "state_history": 100_000,
+        "state_frames": 50_000,
+    },
+}
+
+SUITES: Dict[str, Callable[[Dict[str, Any], Path], Dict[str, float]]] = {
+    "loop": bench_loop.run,
+    "memory": bench_memory.run,
+    "axes": bench_axes.run,
+}
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith("per_s")
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[Dict[str, Any]]:
+    """Return one row per shared metric with its relative change."""
+    rows = []
+    for metric in sorted(set(current) & set(baseline)):
+        old, new = baseline[metric], current[metric]
+        if old == 0:
+            continue
+        change = (new - old) / abs(old)
+        worse = -change if higher_is_better(metric) else change
+        rows.append({"metric": metric, "baseline": old, "current": new, "change": change, "regressed": worse > tolerance})
+    return rows
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--only", help="comma-separated subset of suites: " + ",".join(SUITES))
+    parser.add_argument("--out", type=Path, help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    parser.add_argument("--workdir", type=Path, help="directory for synthetic data (default: temp dir)")
+    args = parser.parse_args(argv)
+
+    suites = args.only.split(",") if args.only else list(SUITES)
+    unknown = [name for name in suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+
+    scale = SCALES[args.scale]
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory(prefix="awareness-bench-") as tmp:
+        workdir = args.workdir or Path(tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for name in suites:
+            started = time.perf_counter()
+            results.update(SUITES[name](scale, workdir))
+            print(f"[bench] {name}: {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "scale": args.scale,
+            "suites": suites,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+    exit_code = 0
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        rows = compare(results, baseline, args.tolerance)
+        report["comparison"] = rows
+        regressions = [row for row in rows if row["regressed"]]
+        for row in regressions:
+            print(
+                f"[bench] REGRESSION {row['metric']}: {row['baseline']:.4g} -> {row['current']:.4g} ({row['change']:+.1%})",
+                file=sys.stderr,
+            )
+        exit_code = 1 if regressions else 0
+
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out is not None:
+        args.out.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""Offline stub tool with configurable latency and jitter."""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Optional
+
+from awareness_core.tools.base_tool import BaseTool, ToolQuery, ToolResult
+
+
+class StubTool(BaseTool):
+    """Echo tool that sleeps ``latency ± jitter`` seconds per call."""
+
+    name = "stub"
+    description = "Benchmark stub that echoes queries after a simulated delay."
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = 0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+
+    def call(self, query: ToolQuery) -> ToolResult:
+        delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        return ToolResult(content=f"[stub] {query.content}", metadata={"delay": delay})
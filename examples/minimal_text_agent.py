@@ -10,7 +10,7 @@ from awareness_core.tools.llm_tool import LLMTool
 
 def main() -> None:
     config = CoreConfig()
-    memory = EpisodicMemory(config.memory.episodic_path)
+    memory = EpisodicMemory.from_config(config.memory)
     tool = LLMTool()
     loop = AwarenessLoop(config=config, tool=tool, memory=memory)
 
@@ -27,6 +27,7 @@ def main() -> None:
             print(f"{tool.name} > {result.content}")
         else:
             print("（当前步骤未触发工具调用）")
+    memory.close()
     print("结束，再见。")
 
 
@@ -0,0 +1,105 @@
+"""Behavior of the group-commit EpisodicWriter and its use by EpisodicMemory."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from awareness_core.config import WriterConfig
+from awareness_core.memory import episodic_writer
+from awareness_core.memory.episodic_index import EpisodicIndex
+from awareness_core.memory.episodic_memory import EpisodicMemory
+from awareness_core.memory.episodic_writer import EpisodicWriter
+
+
+def _writer(tmp_path: Path, **config: object) -> EpisodicWriter:
+    log = tmp_path / "events.jsonl"
+    log.touch()
+    index = EpisodicIndex(tmp_path / "events.jsonl.idx")
+    index.sync(log)
+    return EpisodicWriter(log, index, WriterConfig(**config))  # type: ignore[arg-type]
+
+
+def _line(i: int) -> bytes:
+    return b'{"timestamp": "2024-01-01T00:00:%02d", "tool": "t", "n": %d}\n' % (i, i)
+
+
+def _lines(writer: EpisodicWriter) -> List[bytes]:
+    return writer.path.read_bytes().splitlines(keepends=True)
+
+
+def test_batch_is_committed_when_full(tmp_path: Path) -> None:
+    writer = _writer(tmp_path, flush_events=3, flush_interval=60.0)
+    writer.write(_line(0), 0.0, "t")
+    writer.write(_line(1), 1.0, "t")
+    assert _lines(writer) == []
+    assert len(writer.index) == 0
+    writer.write(_line(2), 2.0, "t")
+    assert _lines(writer) == [_line(0), _line(1), _line(2)]
+    assert [entry.offset for entry in writer.index.iter_entries()] == [0, len(_line(0)), 2 * len(_line(0))]
+    writer.close()
+
+
+def test_background_thread_commits_after_flush_interval(tmp_path: Path) -> None:
+    writer = _writer(tmp_path, flush_events=100, flush_interval=0.02)
+    writer.write(_line(0), 0.0, "t")
+    deadline = time.monotonic() + 2.0
+    while not _lines(writer) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _lines(writer) == [_line(0)]
+    assert len(writer.index) == 1
+    writer.close()
+
+
+def test_index_never_points_past_buffered_bytes(tmp_path: Path) -> None:
+    writer = _writer(tmp_path, durability="none", flush_events=1)
+    writer.write(_line(0), 0.0, "t")
+    # Committed to the process buffer only: neither log nor index show it yet.
+    assert _lines(writer) == []
+    assert len(writer.index) == 0
+    writer.flush()
+    assert _lines(writer) == [_line(0)]
+    assert len(writer.index) == 1
+    writer.close()
+
+
+def test_fsync_every_n_events(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    synced: List[int] = []
+    monkeypatch.setattr(episodic_writer.os, "fsync", synced.append)
+    writer = _writer(tmp_path, durability="fsync-every-N", flush_events=1, fsync_every=2)
+    for i in range(5):
+        writer.write(_line(i), float(i), "t")
+    assert len(synced) == 2
+    writer.close()
+    assert len(synced) == 3
+
+
+def test_close_commits_pending_events_and_rejects_writes(tmp_path: Path) -> None:
+    writer = _writer(tmp_path, flush_events=100, flush_interval=60.0)
+    writer.write(_line(0), 0.0, "t")
+    writer.close()
+    assert writer.closed
+    assert _lines(writer) == [_line(0)]
+    assert len(writer.index) == 1
+    with pytest.raises(ValueError):
+        writer.write(_line(1), 1.0, "t")
+    writer.close()
+
+
+def test_unknown_durability_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        _writer(tmp_path, durability="sometimes")
+
+
+def test_memory_reads_see_buffered_events(tmp_path: Path) -> None:
+    memory = EpisodicMemory(tmp_path / "events.jsonl", writer=WriterConfig(flush_events=100, flush_interval=60.0))
+    for i in range(3):
+        memory.append(question=f"q{i}", tool="t", answer="a")
+    assert [event.question for event in memory.load_recent(3)] == ["q0", "q1", "q2"]
+    memory.close()
+    reopened = EpisodicMemory(tmp_path / "events.jsonl")
+    assert len(reopened) == 3
+    reopened.close()
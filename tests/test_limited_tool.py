@@ -0,0 +1,220 @@
+"""Behavior of ToolLimiter and LimitedTool: AIMD limit, rate and cost budgets."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import List
+
+import pytest
+
+from awareness_core.config import LimiterConfig
+from awareness_core.tools.base_tool import BaseTool, ToolQuery, ToolResult
+from awareness_core.tools.limited_tool import BudgetExhausted, LimitedTool, ToolLimiter, find_limiters
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Echo(BaseTool):
+    name = "echo"
+    description = "echoes the query"
+
+    def __init__(self, delay: float = 0.0, fail: bool = False, usage: int = 0) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.usage = usage
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def call(self, query: ToolQuery) -> ToolResult:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("backend throttled")
+            metadata = {"usage": {"total_tokens": self.usage}} if self.usage else {}
+            return ToolResult(content=query.content, metadata=metadata)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _limiter(**config: object) -> ToolLimiter:
+    return ToolLimiter("backend", LimiterConfig(**config), clock=_Clock())  # type: ignore[arg-type]
+
+
+def test_cost_budget_stops_calls_before_overspending() -> None:
+    limiter = _limiter(cost_budget=2.0, cost_per_call=1.0)
+    for _ in range(2):
+        limiter.acquire()
+        limiter.release(0.01, ok=True, cost=1.0)
+    assert not limiter.available()
+    with pytest.raises(BudgetExhausted):
+        limiter.acquire()
+    assert limiter.counters["rejected"] == 1
+    assert limiter.metrics()["budget_remaining"] == 0.0
+
+
+def test_cost_budget_refills_over_its_window() -> None:
+    limiter = _limiter(cost_budget=2.0, cost_per_call=1.0, cost_window=10.0)
+    for _ in range(2):
+        limiter.acquire()
+        limiter.release(0.01, ok=True, cost=1.0)
+    limiter.clock.now = 4.0  # type: ignore[attr-defined]
+    assert not limiter.available()
+    limiter.clock.now = 5.0  # type: ignore[attr-defined]
+    assert limiter.available()
+
+
+def test_batch_needs_budget_for_every_call() -> None:
+    limiter = _limiter(cost_budget=3.0, cost_per_call=1.0)
+    limiter.acquire()
+    limiter.release(0.01, ok=True, cost=2.0)
+    with pytest.raises(BudgetExhausted):
+        limiter.acquire(weight=2)
+    limiter.acquire(weight=1)
+
+
+def test_rate_limit_throttles_until_tokens_refill() -> None:
+    limiter = _limiter(rate=10.0, burst=2.0, acquire_timeout=0.0)
+    limiter.acquire()
+    limiter.acquire()
+    assert not limiter.available()
+    with pytest.raises(BudgetExhausted):
+        limiter.acquire()
+    assert limiter.counters["throttled"] == 1
+    limiter.clock.now = 0.1  # type: ignore[attr-defined]
+    assert limiter.available()
+
+
+def test_concurrency_limit_blocks_until_release() -> None:
+    limiter = _limiter(initial_concurrency=1, acquire_timeout=0.0)
+    limiter.acquire()
+    with pytest.raises(BudgetExhausted):
+        limiter.acquire()
+    # Saturation is transient, so it does not make the limiter unavailable.
+    assert limiter.available()
+    limiter.release(0.01, ok=True, cost=0.0)
+    limiter.acquire()
+    assert limiter.in_flight == 1
+
+
+def test_fast_successes_raise_the_limit_additively() -> None:
+    limiter = _limiter(initial_concurrency=2, max_concurrency=3)
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(0.01, ok=True, cost=0.0)
+    assert limiter.limit == 3
+    assert limiter.counters["decreases"] == 0
+
+
+def test_errors_cut_the_limit_once_per_round_trip() -> None:
+    limiter = _limiter(initial_concurrency=10, backoff=0.5)
+    limiter.acquire()
+    limiter.release(1.0, ok=True, cost=0.0)
+    limiter.clock.now = 10.0  # type: ignore[attr-defined]
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(0.0, ok=False, cost=0.0)
+    assert limiter.counters["errors"] == 3
+    assert limiter.counters["decreases"] == 1
+    assert limiter.limit == 5
+
+
+def test_slow_calls_count_as_congestion() -> None:
+    limiter = _limiter(initial_concurrency=8, latency_tolerance=2.0, backoff=0.5)
+    limiter.acquire()
+    limiter.release(0.1, ok=True, cost=0.0)
+    limiter.clock.now = 10.0  # type: ignore[attr-defined]
+    limiter.acquire()
+    limiter.release(5.0, ok=True, cost=0.0)
+    assert limiter.counters["slow"] == 1
+    assert limiter.limit == 4
+
+
+def test_limit_never_drops_below_minimum() -> None:
+    limiter = _limiter(initial_concurrency=2, min_concurrency=2, backoff=0.1)
+    limiter.acquire()
+    limiter.release(0.0, ok=False, cost=0.0)
+    assert limiter.limit == 2
+
+
+def test_limited_tool_charges_calls_and_tokens() -> None:
+    tool = LimitedTool(_Echo(usage=10), LimiterConfig(cost_per_call=1.0, cost_per_token=0.5))
+    results = tool.call_batch([ToolQuery(content="a"), ToolQuery(content="b")])
+    assert [result.content for result in results] == ["a", "b"]
+    assert tool.limiter.counters["cost"] == pytest.approx(2 * 1.0 + 2 * 10 * 0.5)
+    assert tool.limiter.in_flight == 0
+
+
+def test_limited_tool_releases_its_slot_on_errors() -> None:
+    tool = LimitedTool(_Echo(fail=True), LimiterConfig(initial_concurrency=1))
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            tool.call(ToolQuery(content="x"))
+    assert tool.limiter.in_flight == 0
+    assert tool.limiter.counters["errors"] == 2
+
+
+def test_threads_never_exceed_the_limit() -> None:
+    backend = _Echo(delay=0.02)
+    tool = LimitedTool(backend, LimiterConfig(initial_concurrency=2, min_concurrency=2, max_concurrency=2))
+    threads = [threading.Thread(target=tool.call, args=(ToolQuery(content=str(i)),)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert backend.peak == 2
+    assert tool.limiter.counters["calls"] == 8
+
+
+def test_concurrent_calls_cannot_overspend_the_budget() -> None:
+    tool = LimitedTool(_Echo(delay=0.02), LimiterConfig(cost_budget=2.0, cost_per_call=1.0, initial_concurrency=8))
+    succeeded: List[str] = []
+    rejected: List[str] = []
+
+    def run(i: int) -> None:
+        try:
+            succeeded.append(tool.call(ToolQuery(content=str(i))).content)
+        except BudgetExhausted:
+            rejected.append(str(i))
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(succeeded) <= 2.0 / 1.0
+    assert len(succeeded) + len(rejected) == 8
+    assert tool.limiter.metrics()["budget_remaining"] >= 0.0
+
+
+def test_failed_call_gives_its_reservation_back() -> None:
+    tool = LimitedTool(_Echo(fail=True), LimiterConfig(cost_budget=1.0, cost_per_call=1.0))
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            tool.call(ToolQuery(content="x"))
+    assert tool.limiter.metrics()["budget_remaining"] == 1.0
+    assert tool.limiter.counters["cost"] == 0.0
+
+
+def test_find_limiters_walks_wrappers() -> None:
+    class Wrapper:
+        def __init__(self, tool: object) -> None:
+            self.tool = tool
+
+    inner = LimitedTool(_Echo())
+    other = LimitedTool(_Echo())
+    manager = Wrapper(Wrapper(inner))
+    manager.tools = {"a": inner, "b": other}  # type: ignore[attr-defined]
+    found: List[ToolLimiter] = find_limiters(manager)
+    assert {id(limiter) for limiter in found} == {id(inner.limiter), id(other.limiter)}
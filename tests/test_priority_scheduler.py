@@ -0,0 +1,216 @@
+"""Behavior of PriorityScheduler: ordering, bounds, shedding, expiry and waiters."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict
+
+from awareness_core.config import CoreConfig, QueueConfig
+from awareness_core.scheduler import PriorityScheduler
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Proto:
+    """Stands in for ProtoSelf: a settable load and the published gauges."""
+
+    def __init__(self, load: float = 0.0) -> None:
+        self.value = load
+        self.gauges: Dict[str, float] = {}
+
+    def load(self) -> float:
+        return self.value
+
+    def observe(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+
+
+def _scheduler(load: float = 0.0, **queue: object) -> PriorityScheduler:
+    clock = _Clock()
+    return PriorityScheduler(CoreConfig(), QueueConfig(**queue), proto_self=_Proto(load), clock=clock)  # type: ignore[arg-type]
+
+
+def _texts(scheduler: PriorityScheduler) -> list:
+    texts = []
+    while True:
+        item = scheduler.pop()
+        if item is None:
+            return texts
+        texts.append(item.text)
+
+
+def test_pop_serves_most_salient_then_oldest() -> None:
+    scheduler = _scheduler()
+    scheduler.offer("low", salience=0.4)
+    scheduler.offer("high", salience=0.9)
+    scheduler.offer("low-again", salience=0.4)
+    assert _texts(scheduler) == ["high", "low", "low-again"]
+    assert scheduler.counters["dequeued"] == 3
+
+
+def test_waiting_lifts_an_older_input() -> None:
+    scheduler = _scheduler(age_weight=0.1)
+    scheduler.offer("old", salience=0.5)
+    scheduler.clock.now = 10.0  # type: ignore[attr-defined]
+    scheduler.offer("new", salience=0.9)
+    assert _texts(scheduler) == ["old", "new"]
+
+
+def test_source_drive_lifts_a_whole_source() -> None:
+    scheduler = _scheduler(source_drives={"sensor": "curiosity"}, drive_weight=1.0)
+    scheduler.offer("text", source="text", salience=0.8)
+    scheduler.offer("reading", source="sensor", salience=0.2)
+    assert scheduler.pop({"curiosity": 1.0}).text == "reading"  # type: ignore[union-attr]
+
+
+def test_full_source_evicts_the_weakest_low_salience_input() -> None:
+    scheduler = _scheduler(source_capacity=2, shed_salience=0.3)
+    assert scheduler.offer("weak", salience=0.1)
+    assert scheduler.offer("weaker-but-newer", salience=0.2)
+    # A low-salience input never displaces another one.
+    assert not scheduler.offer("also-weak", salience=0.05)
+    assert scheduler.counters["rejected"] == 1
+    assert scheduler.offer("urgent", salience=0.9)
+    assert scheduler.counters["shed"] == 1
+    assert scheduler.depth() == 2
+    assert _texts(scheduler) == ["urgent", "weaker-but-newer"]
+
+
+def test_full_queue_of_salient_inputs_rejects() -> None:
+    scheduler = _scheduler(capacity=2, source_capacity=2)
+    assert scheduler.offer("a", salience=0.9)
+    assert scheduler.offer("b", salience=0.8)
+    assert not scheduler.offer("c", salience=1.0)
+    assert scheduler.counters["rejected"] == 1
+    assert scheduler.depth() == 2
+
+
+def test_capacity_is_shared_across_sources() -> None:
+    scheduler = _scheduler(capacity=2, source_capacity=2)
+    assert scheduler.offer("a", source="one", salience=0.1)
+    assert scheduler.offer("b", source="two", salience=0.9)
+    assert scheduler.offer("c", source="three", salience=0.9)
+    assert scheduler.depth("one") == 0
+    assert _texts(scheduler) == ["b", "c"]
+
+
+def test_admission_sheds_low_salience_under_proto_load() -> None:
+    scheduler = _scheduler(load=0.95, admit_load=0.9, shed_salience=0.3)
+    assert not scheduler.offer("chatter", salience=0.1)
+    assert scheduler.counters["shed"] == 1
+    assert scheduler.counters["rejected"] == 0
+    assert scheduler.offer("important", salience=0.9)
+    assert scheduler.depth() == 1
+
+
+def test_newer_input_supersedes_low_salience_one_with_the_same_key_under_load() -> None:
+    scheduler = _scheduler(load=0.8, load_watermark=0.75, admit_load=0.9)
+    scheduler.offer("temp=20", source="sensor", salience=0.1, key="temp")
+    scheduler.offer("temp=21", source="sensor", salience=0.1, key="temp")
+    scheduler.offer("humidity", source="sensor", salience=0.1, key="humidity")
+    assert scheduler.counters["coalesced"] == 1
+    assert scheduler.depth() == 2
+    assert _texts(scheduler) == ["temp=21", "humidity"]
+
+
+def test_no_coalescing_without_load() -> None:
+    scheduler = _scheduler(load=0.0)
+    scheduler.offer("temp=20", salience=0.1, key="temp")
+    scheduler.offer("temp=21", salience=0.1, key="temp")
+    assert scheduler.counters["coalesced"] == 0
+    assert scheduler.depth() == 2
+
+
+def test_superseded_entries_are_compacted() -> None:
+    scheduler = _scheduler(load=0.8, source_capacity=4)
+    for value in range(100):
+        scheduler.offer(f"temp={value}", salience=0.1, key="temp")
+    assert scheduler.depth() == 1
+    assert len(scheduler._heaps["text"]) <= 2 * 4 + 1
+    assert _texts(scheduler) == ["temp=99"]
+
+
+def test_expired_inputs_are_dropped_not_served() -> None:
+    scheduler = _scheduler(max_age=5.0)
+    scheduler.offer("stale", salience=0.9)
+    scheduler.clock.now = 6.0  # type: ignore[attr-defined]
+    scheduler.offer("fresh", salience=0.1)
+    assert _texts(scheduler) == ["fresh"]
+    assert scheduler.counters["expired"] == 1
+    assert scheduler.depth() == 0
+
+
+def test_full_queue_expires_before_rejecting() -> None:
+    scheduler = _scheduler(capacity=1, source_capacity=1, max_age=5.0)
+    scheduler.offer("stale", salience=0.9)
+    scheduler.clock.now = 6.0  # type: ignore[attr-defined]
+    assert scheduler.offer("fresh", salience=0.9)
+    assert scheduler.counters["expired"] == 1
+    assert _texts(scheduler) == ["fresh"]
+
+
+def test_depth_is_published_as_a_gauge() -> None:
+    scheduler = _scheduler()
+    scheduler.offer("a")
+    scheduler.offer("b")
+    assert scheduler.proto_self.gauges["queue_depth"] == 2  # type: ignore[union-attr]
+    scheduler.pop()
+    assert scheduler.proto_self.gauges["queue_depth"] == 1  # type: ignore[union-attr]
+
+
+def test_put_waits_for_space_and_wakes_when_an_input_is_popped() -> None:
+    async def scenario() -> None:
+        scheduler = _scheduler(capacity=1, source_capacity=1)
+        scheduler.offer("first", salience=0.9)
+        waiting = asyncio.create_task(scheduler.put("second", salience=0.9))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        assert scheduler.pop().text == "first"  # type: ignore[union-attr]
+        assert await asyncio.wait_for(waiting, 1.0)
+        assert scheduler.pop().text == "second"  # type: ignore[union-attr]
+
+    asyncio.run(scenario())
+
+
+def test_put_gives_up_after_timeout() -> None:
+    async def scenario() -> None:
+        scheduler = _scheduler(capacity=1, source_capacity=1)
+        scheduler.offer("first", salience=0.9)
+        assert not await scheduler.put("second", salience=0.9, timeout=0.01)
+        assert scheduler.counters["rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_get_wakes_when_an_input_arrives() -> None:
+    async def scenario() -> None:
+        scheduler = _scheduler()
+        waiting = asyncio.create_task(scheduler.get())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        scheduler.offer("hello")
+        item = await asyncio.wait_for(waiting, 1.0)
+        assert item.text == "hello"
+
+    asyncio.run(scenario())
+
+
+def test_each_freed_slot_wakes_one_writer() -> None:
+    async def scenario() -> None:
+        scheduler = _scheduler(capacity=1, source_capacity=1)
+        scheduler.offer("first", salience=0.9)
+        writers = [asyncio.create_task(scheduler.put(f"w{i}", salience=0.9)) for i in range(2)]
+        await asyncio.sleep(0)
+        scheduler.pop()
+        await asyncio.sleep(0)
+        assert sum(task.done() for task in writers) == 1
+        scheduler.pop()
+        assert all(await asyncio.wait_for(asyncio.gather(*writers), 1.0))
+
+    asyncio.run(scenario())
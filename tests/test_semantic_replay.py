@@ -0,0 +1,73 @@
+"""Replay into SemanticMemory: checkpointing must not change the result."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import pytest
+
+from awareness_core.memory import semantic_memory
+from awareness_core.memory.episodic_memory import EpisodicMemory
+from awareness_core.memory.semantic_memory import SemanticMemory
+
+
+def _episodic(path: Path) -> EpisodicMemory:
+    memory = EpisodicMemory(path / "events.jsonl")
+    # Early chunks favour one set of words and later chunks another, so pruning
+    # part-way through would drop counts that end up among the kept ones.
+    for i in range(64):
+        word = f"early{i % 8}" if i < 32 else f"late{i % 4}"
+        memory.append(question=f"{word} shared", tool="t", answer=f"answer{i % 3}")
+    return memory
+
+
+def _semantic(path: Path) -> SemanticMemory:
+    return SemanticMemory(path / "semantic.json", max_concepts=6, max_pairs=4)
+
+
+def _pairs(semantic: SemanticMemory) -> Dict[Tuple[str, str], Any]:
+    # Timestamps differ between logs written separately; answers and counts must not.
+    return {key: pair[:2] for key, pair in semantic.pairs.items()}
+
+
+def _replay(path: Path, checkpoint_every: int) -> SemanticMemory:
+    episodic = _episodic(path)
+    semantic = _semantic(path)
+    semantic.update_from_replay(episodic, workers=0, chunk_size=4, checkpoint_every=checkpoint_every)
+    episodic.close()
+    return semantic
+
+
+def test_checkpoint_interval_does_not_change_counts(tmp_path: Path) -> None:
+    single = _replay(tmp_path / "single", checkpoint_every=1000)
+    checkpointed = _replay(tmp_path / "checkpointed", checkpoint_every=1)
+    assert checkpointed.concepts == single.concepts
+    assert _pairs(checkpointed) == _pairs(single)
+    assert len(single.concepts) == 6
+    assert len(single.pairs) == 4
+
+
+def test_resumed_replay_matches_a_single_pass(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    single = _replay(tmp_path / "single", checkpoint_every=1000)
+    episodic = _episodic(tmp_path / "resumed")
+    extract = semantic_memory.extract_chunk
+    calls = []
+
+    def crashing(blob: bytes) -> semantic_memory.SemanticDelta:
+        calls.append(blob)
+        if len(calls) > 10:
+            raise RuntimeError("interrupted")
+        return extract(blob)
+
+    monkeypatch.setattr(semantic_memory, "extract_chunk", crashing)
+    with pytest.raises(RuntimeError):
+        _semantic(tmp_path / "resumed").update_from_replay(episodic, workers=0, chunk_size=4, checkpoint_every=1)
+    monkeypatch.setattr(semantic_memory, "extract_chunk", extract)
+
+    resumed = _semantic(tmp_path / "resumed")
+    assert resumed.checkpoint == 40
+    resumed.update_from_replay(episodic, workers=0, chunk_size=4, checkpoint_every=1)
+    episodic.close()
+    assert resumed.concepts == single.concepts
+    assert _pairs(resumed) == _pairs(single)